@@ -0,0 +1,75 @@
+import functools
+from pathlib import Path
+
+import pytest
+
+import cookietemple
+from cookietemple.common.pypi_resolver import PyPIResolver
+from cookietemple.config.config import ConfigCommand
+from cookietemple.create.project_cache import ProjectCache
+
+from benchmarks.synthetic import create_project, synthesize_large_project
+
+"""
+Benchmarks of cookietemple's commands on generated and synthesized projects. They are not part of the test suite; run them with make benchmark.
+"""
+
+
+def pytest_addoption(parser) -> None:
+    group = parser.getgroup('cookietemple', 'size of the synthesized large projects')
+    group.addoption('--synthetic-files', type=int, default=10000, help='Number of additional source files (default: 10000)')
+    group.addoption('--synthetic-changelog-sections', type=int, default=1000, help='Number of changelog sections, about 3 KB each (default: 1000)')
+    group.addoption('--synthetic-bump-files', type=int, default=300, help='Number of additional whitelisted bump-version files (default: 300)')
+
+
+def pytest_benchmark_update_machine_info(config, machine_info) -> None:
+    # saved runs are compared across cookietemple versions
+    machine_info['cookietemple_version'] = cookietemple.__version__
+
+
+def pytest_benchmark_update_json(config, benchmarks, output_json) -> None:
+    output_json['synthetic_project'] = {option: config.getoption(option) for option in
+                                        ('synthetic_files', 'synthetic_changelog_sections', 'synthetic_bump_files')}
+
+
+@pytest.fixture(autouse=True)
+def project_cache_dir(monkeypatch, tmp_path_factory):
+    """
+    Disable the cache of rendered projects, so that every round renders the templates instead of copying the project of the warmup round.
+    Benchmarks of cache hits enable a cache in this directory explicitly.
+
+    :return: An empty directory for a cache
+    """
+    monkeypatch.setattr(ProjectCache, 'from_config', classmethod(lambda cls: None))
+
+    return tmp_path_factory.mktemp('projects')
+
+
+@pytest.fixture(scope='session')
+def make_large_project(request, tmp_path_factory):
+    """
+    Create a cli-python project and grow it by as many files, changelog sections and bump-version files as set by the --synthetic-* options.
+
+    :return: A function creating a new large project of the given name and returning its path
+    """
+    def make(project_name: str) -> Path:
+        project_path = create_project('cli-python', project_name, tmp_path_factory.mktemp(project_name))
+        synthesize_large_project(project_path, files=request.config.getoption('synthetic_files'),
+                                 changelog_sections=request.config.getoption('synthetic_changelog_sections'),
+                                 bump_files=request.config.getoption('synthetic_bump_files'))
+
+        return project_path
+
+    return make
+
+
+@pytest.fixture
+def offline(mocker, tmp_path, stub_server):
+    """
+    Serve the PyPI JSON API from a local stub, which knows every package at version 0.0.1, and use an empty PyPI response cache.
+    Benchmarks therefore never depend on the network or on the caches of earlier runs.
+    """
+    stub = stub_server(lambda request: (200, {'info': {'version': '0.0.1'}}, {}))
+    settings = {'pypi_index_url': f'{stub.url}/pypi'}
+    mocker.patch.object(ConfigCommand, 'load_setting', lambda name, default=None: settings.get(name, default))
+    mocker.patch('cookietemple.lint.domains.cli.PyPIResolver', functools.partial(PyPIResolver, cache_dir=str(tmp_path / 'pypi')))
@@ -0,0 +1,136 @@
+from configparser import ConfigParser
+from pathlib import Path
+
+from packaging import version
+
+from cookietemple.create.batch import answers_of_handle
+from cookietemple.create.create import create_from_answers
+
+"""
+Generates projects of all templates and synthesizes large projects from them, which still pass linting and can be bumped.
+"""
+
+# answers shared by all generated projects
+DEFAULT_ANSWERS = {'full_name': 'Homer Simpson', 'email': 'homer.simpson@posteo.net', 'github_username': 'homer'}
+
+# number of files per synthesized package; keeps single directories small like in real projects
+FILES_PER_PACKAGE = 100
+
+SOURCE_FILE = '''"""
+Synthesized module {index} of a large project.
+"""
+
+
+def compute_{index}(values: list) -> int:
+    """
+    Sum up all values and add the number of this module.
+
+    :param values: The values to sum up
+    :return: The sum
+    """
+    total = {index}
+    for value in values:
+        total += value
+
+    return total
+
+
+class Module{index}:
+    """
+    Holds the values of module {index}.
+    """
+
+    def __init__(self, values: list):
+        self.values = values
+
+    def total(self) -> int:
+        return compute_{index}(self.values)
+'''
+
+CHANGELOG_SECTION = '''{version} (2020-01-01)
+{underline}
+
+**Added**
+
+{entries}
+
+**Fixed**
+
+{entries}
+
+**Dependencies**
+
+{entries}
+
+**Deprecated**
+
+{entries}
+
+'''
+
+CHANGELOG_ENTRY = '* a synthesized change number {number} of this section, which is about as long as a typical changelog entry'
+
+BUMP_FILE = '''# synthesized file {index}, whose versions are bumped by bump-version
+version = {version}
+__version__ = '{version}'
+{filler}
+'''
+
+
+def answers_of(handle: str, project_name: str) -> dict:
+    """
+    The answers to create a project of a template without any prompts.
+
+    :param handle: The full handle of the template
+    :param project_name: Name of the project
+    :return: The answers
+    """
+    return answers_of_handle(dict(DEFAULT_ANSWERS, handle=handle, project_name=project_name))
+
+
+def create_project(handle: str, project_name: str, path: Path) -> Path:
+    """
+    Create a project of a template without any prompts and without linting it.
+
+    :param handle: The full handle of the template
+    :param project_name: Name of the project
+    :param path: Directory the project is created in
+    :return: Path to the created project
+    """
+    return create_from_answers(answers_of(handle, project_name), path, lint=False)
+
+
+def synthesize_large_project(project_dir: Path, files: int, changelog_sections: int, bump_files: int) -> None:
+    """
+    Grow a generated project by additional source files, older changelog sections and whitelisted bump-version files.
+
+    :param project_dir: Path to the generated project
+    :param files: Number of additional source files
+    :param changelog_sections: Number of additional changelog sections, which are older than the current version
+    :param bump_files: Number of additional whitelisted files holding the current version
+    """
+    parser = ConfigParser()
+    parser.read(project_dir / 'cookietemple.cfg')
+    current_version = parser.get('bumpversion', 'current_version')
+
+    for index in range(files):
+        package_dir = project_dir / 'synthetic' / f'package_{index // FILES_PER_PACKAGE:04}'
+        package_dir.mkdir(parents=True, exist_ok=True)
+        (package_dir / f'module_{index:05}.py').write_text(SOURCE_FILE.format(index=index))
+
+    # all older sections are patch releases of 0.0; they must be older than the current version to pass the changelog linting
+    assert version.parse(f'0.0.{changelog_sections}') < version.parse(current_version.replace('-SNAPSHOT', ''))
+    entries = '\n'.join(CHANGELOG_ENTRY.format(number=number) for number in range(8))
+    with open(project_dir / 'CHANGELOG.rst', 'a') as changelog:
+        for patch in range(changelog_sections, 0, -1):
+            header = f'0.0.{patch} (2020-01-01)'
+            changelog.write('\n' + CHANGELOG_SECTION.format(version=f'0.0.{patch}', underline='-' * len(header), entries=entries))
+
+    (project_dir / 'bump').mkdir(exist_ok=True)
+    filler = '\n'.join(f'line {line} does not contain any version' for line in range(40))
+    for index in range(bump_files):
+        path = f'bump/file_{index:04}.txt'
+        (project_dir / path).write_text(BUMP_FILE.format(index=index, version=current_version, filler=filler))
+        parser.set('bumpversion_files_whitelisted', f'synthetic_file_{index:04}', path)
+    with open(project_dir / 'cookietemple.cfg', 'w') as config_file:
+        parser.write(config_file)
@@ -0,0 +1,46 @@
+import itertools
+from configparser import ConfigParser
+
+import pytest
+
+from cookietemple.bump_version.bump_version import VersionBumper
+
+"""
+Benchmarks of bumping the version of a synthesized large project.
+"""
+
+
+@pytest.fixture(scope='module')
+def large_project(make_large_project):
+    return make_large_project('springfield_bump')
+
+
+def test_lint_before_bump(benchmark, large_project) -> None:
+    """
+    Time linting the changelog and the versions of all whitelisted files, which precedes every bump.
+    Linting prompts (and thereby fails the benchmark), if any check fails.
+    """
+    version_bumper = VersionBumper(large_project, downgrade=False)
+
+    benchmark.pedantic(version_bumper.lint_before_bump, rounds=3, warmup_rounds=1)
+
+
+def test_bump_version(benchmark, large_project) -> None:
+    """
+    Time bumping the version of all whitelisted files and adding a changelog section. Every round bumps to the next minor version.
+    """
+    minor_versions = itertools.count(1)
+    new_version = ''
+
+    def setup():
+        nonlocal new_version
+        new_version = f'1.{next(minor_versions)}.0'
+        return (new_version, large_project), {}
+
+    version_bumper = VersionBumper(large_project, downgrade=False)
+    benchmark.pedantic(version_bumper.bump_template_version, setup=setup, rounds=5, warmup_rounds=1)
+    parser = ConfigParser()
+    parser.read(large_project / 'cookietemple.cfg')
+
+    assert parser.get('bumpversion', 'current_version') == new_version
+    assert (large_project / 'bump' / 'file_0000.txt').read_text().count(new_version) == 2
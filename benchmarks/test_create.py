@@ -0,0 +1,46 @@
+import itertools
+
+import pytest
+
+from cookietemple.common.template_registry import TemplateRegistry
+from cookietemple.create.create import create_from_answers
+from cookietemple.create.project_cache import ProjectCache
+
+from benchmarks.synthetic import answers_of
+
+"""
+Benchmarks of creating a project of every template without any prompts.
+"""
+
+
+@pytest.mark.parametrize('handle', sorted(TemplateRegistry.load().templates_by_handle))
+def test_create(benchmark, tmp_path, handle) -> None:
+    """
+    Time creating a project of a template, without linting it. Every round creates the project into a new directory.
+    """
+    rounds = itertools.count()
+
+    def setup():
+        return (answers_of(handle, 'springfield'), tmp_path / f'round_{next(rounds)}'), {'lint': False}
+
+    project_path = benchmark.pedantic(create_from_answers, setup=setup, rounds=5, warmup_rounds=1)
+
+    assert (project_path / '.cookietemple.yml').is_file()
+
+
+@pytest.mark.parametrize('handle', ['cli-python', 'pub-thesis-latex'])
+def test_create_cached(benchmark, mocker, tmp_path, project_cache_dir, handle) -> None:
+    """
+    Time creating a project, which is copied from the cache of rendered projects. The warmup round renders the project and fills the cache.
+    """
+    mocker.patch.object(ProjectCache, 'from_config', return_value=ProjectCache(str(project_cache_dir)))
+    store = mocker.spy(ProjectCache, 'store')
+    rounds = itertools.count()
+
+    def setup():
+        return (answers_of(handle, 'springfield'), tmp_path / f'round_{next(rounds)}'), {'lint': False}
+
+    project_path = benchmark.pedantic(create_from_answers, setup=setup, rounds=5, warmup_rounds=1)
+
+    assert (project_path / '.cookietemple.yml').is_file()
+    assert store.call_count == 1
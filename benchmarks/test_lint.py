@@ -0,0 +1,30 @@
+import pytest
+
+from cookietemple.lint.lint import lint_project
+
+"""
+Benchmarks of linting a synthesized large project.
+"""
+
+
+@pytest.fixture(scope='module')
+def large_project(make_large_project):
+    return make_large_project('springfield_lint')
+
+
+def test_lint_large_project(benchmark, offline, large_project) -> None:
+    """
+    Time linting a large project without the lint cache. Linting fails the benchmark by exiting, if any check fails.
+    """
+    linter = benchmark.pedantic(lint_project, args=(str(large_project),), kwargs={'skip_external': True}, rounds=3, warmup_rounds=1)
+
+    assert not linter.failed
+
+
+def test_lint_large_project_cached(benchmark, offline, large_project) -> None:
+    """
+    Time linting an unchanged large project with the lint cache, which is filled by the warmup round.
+    """
+    linter = benchmark.pedantic(lint_project, args=(str(large_project),), kwargs={'skip_external': True, 'use_cache': True}, rounds=3, warmup_rounds=1)
+
+    assert not linter.failed
@@ -0,0 +1,56 @@
+import git  # type: ignore
+import pytest
+
+from cookietemple.sync.sync import TemplateSync
+
+from benchmarks.synthetic import create_project
+
+"""
+Benchmarks of syncing a project against a local bare git remote.
+"""
+
+
+@pytest.fixture
+def outdated_project(mocker, tmp_path, offline):
+    """
+    A cli-python project, whose TEMPLATE branch is outdated, with a bare git remote. Creating the pull request is skipped.
+
+    :return: The repository of the project and the outdated commit
+    """
+    remote = git.Repo.init(tmp_path / 'remote.git', bare=True)
+    project_path = create_project('cli-python', 'springfield', tmp_path / 'project')
+    repo = git.Repo.init(project_path)
+    with repo.config_writer() as config:
+        config.set_value('user', 'name', 'Homer Simpson')
+        config.set_value('user', 'email', 'homer.simpson@posteo.net')
+    # the template has changed since the last sync
+    with open(project_path / 'README.rst', 'a') as readme:
+        readme.write('\nOutdated by an earlier template version.\n')
+    (project_path / 'Makefile').unlink()
+    repo.git.add(A=True)
+    repo.git.commit(m='Create springfield')
+    repo.git.branch('-M', 'development')
+    repo.create_remote('origin', remote.working_dir)
+    repo.git.push('origin', 'development', 'development:TEMPLATE')
+    mocker.patch.object(TemplateSync, 'make_pull_request')
+
+    return repo, repo.head.commit.hexsha
+
+
+def test_sync(benchmark, outdated_project) -> None:
+    """
+    Time syncing an outdated project and pushing its TEMPLATE branch. Every round starts from the outdated TEMPLATE branch again.
+    """
+    repo, outdated_commit = outdated_project
+
+    def setup():
+        repo.git.branch('-D', 'TEMPLATE') if 'TEMPLATE' in repo.heads else None
+        repo.git.push('origin', f'{outdated_commit}:refs/heads/TEMPLATE', force=True)
+        repo.git.fetch('origin')
+        syncer = TemplateSync(project_dir=repo.working_dir, new_template_version='1.0.0', gh_username='homer', token='benchmark')
+        return (syncer,), {}
+
+    benchmark.pedantic(TemplateSync.sync, setup=setup, rounds=3, warmup_rounds=1)
+
+    assert repo.active_branch.name == 'development'
+    assert repo.git.rev_parse('origin/TEMPLATE') != outdated_commit
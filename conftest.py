@@ -0,0 +1,115 @@
+import json
+import threading
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Tuple
+
+import pytest
+
+from cookietemple.create import project_cache
+
+"""
+Fixtures shared by the tests and the benchmarks.
+"""
+
+# the answers of a cli-python project like in its .cookietemple.yml file, without its project name
+CLI_PYTHON_DOT_COOKIETEMPLE = {'domain': 'cli', 'language': 'python', 'full_name': 'Homer Simpson', 'email': 'homer.simpson@posteo.net',
+                               'github_username': 'homer', 'creator_github_username': 'homer', 'version': '0.1.0', 'license': 'MIT',
+                               'project_short_description': 'Blow it up', 'command_line_interface': 'Click', 'testing_library': 'pytest',
+                               'is_github_repo': False, 'is_repo_private': False, 'is_github_orga': False}
+
+
+@dataclass
+class StubRequest:
+    """
+    A request received by a stub server.
+    """
+    method: str  # the HTTP method
+    path: str  # the path including the query
+    headers: Dict[str, str] = field(default_factory=dict)  # all headers of the request
+
+
+@dataclass
+class StubServer:
+    """
+    A local HTTP server answering all requests by a function.
+    """
+    url: str  # base URL of the server
+    requests: List[StubRequest] = field(default_factory=list)  # all received requests in their order
+
+
+# answers a request by its status, its JSON data (no body, if None) and additional headers
+StubHandler = Callable[[StubRequest], Tuple[int, Any, Dict[str, str]]]
+
+
+@pytest.fixture(autouse=True)
+def project_cache_dir(monkeypatch, tmp_path_factory):
+    """
+    Point the cache of rendered projects at an empty directory, so that nothing reads or fills the cache of the user
+    and the first creation of every project renders its template.
+
+    :return: The directory of the cache
+    """
+    cache_dir = tmp_path_factory.mktemp('projects')
+    monkeypatch.setattr(project_cache, 'PROJECT_CACHE_DIR', str(cache_dir))
+
+    return cache_dir
+
+
+@pytest.fixture
+def cli_python_dot_cookietemple() -> dict:
+    """
+    The answers of a cli-python project like in its .cookietemple.yml file, without its project name.
+
+    :return: A copy of the answers
+    """
+    return dict(CLI_PYTHON_DOT_COOKIETEMPLE)
+
+
+@pytest.fixture
+def stub_server():
+    """
+    Serve HTTP APIs (like PyPI or Github) from local stubs, which are shut down after the test.
+
+    :return: A function starting a stub server, which answers all requests by the given handler
+    """
+    servers = []
+
+    def start(handler: StubHandler) -> StubServer:
+        stub = StubServer('')
+
+        class RequestHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                self.respond('GET')
+
+            def do_POST(self):
+                self.respond('POST')
+
+            def respond(self, method: str) -> None:
+                if self.headers.get('Content-Length'):
+                    self.rfile.read(int(self.headers['Content-Length']))
+                request = StubRequest(method, self.path, dict(self.headers))
+                stub.requests.append(request)
+                status, data, headers = handler(request)
+                body = json.dumps(data).encode('utf-8') if data is not None else b''
+                self.send_response(status)
+                for name, value in dict(headers, **({'Content-Type': 'application/json'} if data is not None else {})).items():
+                    self.send_header(name, value)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer(('127.0.0.1', 0), RequestHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        stub.url = f'http://127.0.0.1:{server.server_port}'
+
+        return stub
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
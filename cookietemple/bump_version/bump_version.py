@@ -14,6 +14,8 @@ from git import Repo  # type: ignore
 from datetime import datetime
 from rich import print
 
+from cookietemple.common.git_objects import commit_paths
+from cookietemple.common.profiling import span
 from cookietemple.create.github_support import is_git_repo
 from cookietemple.lint.template_linter import TemplateLinter
 from cookietemple.custom_cli.questionary import cookietemple_questionary_or_dot_cookietemple
@@ -71,12 +73,13 @@ class VersionBumper:
         # for each section (whitelisted and blacklisted files) bump the version (if allowed)
         for section in sections:
             log.debug(f'Bumping files of section: {section}.')
-            for file, path in self.parser.items(section):
-                not_changed, file_path = VersionBumper.replace(f'{project_dir}/{path}', new_version, section)
-                # only add file if the version(s) in the file were bumped
-                if not not_changed:
-                    path_changed = file_path if file_path.startswith(str(Path.cwd())) else f'{str(Path.cwd())}/{file_path}'
-                    changed_files.append(path_changed)
+            with span('bump_version.replace', section=section):
+                for file, path in self.parser.items(section):
+                    not_changed, file_path = VersionBumper.replace(f'{project_dir}/{path}', new_version, section)
+                    # only add file if the version(s) in the file were bumped
+                    if not not_changed:
+                        path_changed = file_path if file_path.startswith(str(Path.cwd())) else f'{str(Path.cwd())}/{file_path}'
+                        changed_files.append(path_changed)
 
         # update new version in cookietemple.cfg file
         log.debug('Updating version in cookietemple.cfg file.')
@@ -85,19 +88,17 @@ class VersionBumper:
             self.parser.write(configfile)
 
         # add a new changelog section when downgrade mode is disabled
-        self.add_changelog_section(new_version)
+        with span('bump_version.changelog'):
+            self.add_changelog_section(new_version)
 
         # check whether a project is a git repository and if so, commit bumped version changes
         if is_git_repo(project_dir):
             repo = Repo(project_dir)
 
-            # git add
-            print('[bold blue]Staging template')
-            repo.git.add(changed_files)
-
-            # git commit
-            print('[bold blue]Committing changes to local git repository.')
-            repo.index.commit(f'Bump version from {self.CURRENT_VERSION} to {new_version}')
+            with span('bump_version.git_commit'):
+                # git add and git commit in-process
+                print('[bold blue]Committing changes to local git repository.')
+                commit_paths(repo, changed_files, f'Bump version from {self.CURRENT_VERSION} to {new_version}')
 
     @staticmethod
     def replace(file_path: str, subst: str, section: str) -> Tuple[bool, str]:
@@ -247,9 +248,11 @@ class VersionBumper:
             sys.exit(1)
         # lint changelog and check version consistency
         log.debug('Linting changelog')
-        changelog_linter.lint_changelog()
+        with span('bump_version.lint.changelog'):
+            changelog_linter.lint_changelog()
         log.debug('Linting version consistent')
-        changelog_linter.check_version_consistent()
+        with span('bump_version.lint.version_consistent'):
+            changelog_linter.check_version_consistent()
         print()
         changelog_linter.print_results()
         print()
@@ -0,0 +1,29 @@
+import json
+import os
+import threading
+from typing import Any
+
+"""
+Writes the files of cookietemple's caches, which are shared by all concurrently running cookietemple processes and threads.
+"""
+
+
+def write_json_atomically(data: Any, path: str) -> None:
+    """
+    Write data to a JSON file. The data is written to a temporary file next to the destination first, which then replaces the destination atomically.
+    Hence, concurrent readers never read a partially written file. Missing parent directories are created.
+
+    :param data: The data to write
+    :param path: Path to the JSON file
+    :raises OSError: if the file could not be written
+    """
+    tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+    except OSError:
+        if os.path.lexists(tmp_path):
+            os.remove(tmp_path)
+        raise
@@ -0,0 +1,199 @@
+import os
+import stat
+from io import BytesIO
+from subprocess import PIPE, Popen
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import git  # type: ignore
+from git.index.fun import write_tree_from_cache  # type: ignore
+from git.index.typ import BaseIndexEntry  # type: ignore
+from git.objects.fun import traverse_tree_recursive  # type: ignore
+from gitdb import IStream  # type: ignore
+
+"""
+Writes git objects (blobs, trees and commits) directly into the object database of a repository using GitPython's plumbing.
+Commits are thereby created from a set of files without a working tree or an index. Only files of other directories (like a rendered template project)
+are hashed and checked against the ignore rules by single git processes, so that they are treated exactly like git add would treat them.
+"""
+
+# modes of the entries of a git tree
+FILE_MODE = 0o100644
+EXECUTABLE_MODE = 0o100755
+SYMLINK_MODE = 0o120000
+
+# every tree entry by its path (relative to the repository root, with forward slashes) as tuple of its mode and binary blob id
+TreeEntries = Dict[str, Tuple[int, bytes]]
+
+
+def file_mode(file_path: str) -> int:
+    """
+    Determine the mode, which a file would have as an entry of a git tree.
+
+    :param file_path: Path to the file
+    :return: The mode of the file
+    """
+    if os.path.islink(file_path):
+        return SYMLINK_MODE
+    # git only distinguishes files executable by their owner from all others
+    return EXECUTABLE_MODE if os.stat(file_path).st_mode & stat.S_IXUSR else FILE_MODE
+
+
+def write_blob(repo: git.Repo, content: bytes) -> bytes:
+    """
+    Write a blob into the object database of a repository.
+
+    :param repo: The repository
+    :param content: The content of the blob
+    :return: The binary blob id
+    """
+    return repo.odb.store(IStream(git.Blob.type, len(content), BytesIO(content))).binsha
+
+
+def git_on_work_tree(repo: git.Repo, work_tree: str, args: List[str], stdin: str, ok_returncodes: Tuple[int, ...] = (0,)) -> str:
+    """
+    Run a git command of a repository against another directory as its work tree.
+    The command uses the object database, the configuration and the info files (like info/exclude and info/attributes) of the repository,
+    but the files and the .gitignore and .gitattributes files of the work tree.
+
+    :param repo: The repository
+    :param work_tree: The directory used as work tree
+    :param args: The git command and its arguments
+    :param stdin: The input of the command
+    :param ok_returncodes: Return codes of the command, which do not indicate a failure
+    :return: The output of the command
+    :raises git.exc.GitCommandError: if the command fails
+    """
+    env = dict(os.environ, GIT_DIR=repo.git_dir, GIT_WORK_TREE=work_tree)
+    process = Popen([git.Git.GIT_PYTHON_GIT_EXECUTABLE or 'git', *args], cwd=work_tree, env=env, stdin=PIPE, stdout=PIPE, stderr=PIPE)
+    stdout, stderr = process.communicate(stdin.encode('utf-8'))
+    if process.returncode not in ok_returncodes:
+        raise git.exc.GitCommandError(['git', *args], process.returncode, stderr)
+
+    return stdout.decode('utf-8')
+
+
+def hash_work_tree_files(repo: git.Repo, work_tree: str, paths: List[str]) -> TreeEntries:
+    """
+    Write the blobs of files of another directory into the object database of a repository, like git add would write them.
+    All regular files are hashed by a single git hash-object process, so that their content passes the clean filters of the repository
+    (like core.autocrlf and the text and eol attributes). Symlinks are stored as their target.
+
+    :param repo: The repository
+    :param work_tree: The directory holding the files
+    :param paths: Paths to the files (relative to the directory, with forward slashes)
+    :return: The entries of all files
+    :raises git.exc.GitCommandError: if the files could not be hashed
+    """
+    entries: TreeEntries = {}
+    files = []
+    for path in paths:
+        file_path = os.path.join(work_tree, path)
+        if os.path.islink(file_path):
+            entries[path] = (SYMLINK_MODE, write_blob(repo, os.fsencode(os.readlink(file_path))))
+        else:
+            files.append(path)
+    if files:
+        hexshas = git_on_work_tree(repo, work_tree, ['hash-object', '-w', '--stdin-paths'], ''.join(f'{path}\n' for path in files)).split()
+        for path, hexsha in zip(files, hexshas):
+            entries[path] = (file_mode(os.path.join(work_tree, path)), bytes.fromhex(hexsha))
+
+    return entries
+
+
+def ignored_paths(repo: git.Repo, work_tree: str, paths: List[str]) -> Set[str]:
+    """
+    Find the files of another directory, which are ignored by the .gitignore files of the directory, info/exclude or core.excludesFile of a repository.
+
+    :param repo: The repository
+    :param work_tree: The directory holding the files
+    :param paths: Paths to the files (relative to the directory, with forward slashes)
+    :return: The ignored paths
+    """
+    if not paths:
+        return set()
+    # check-ignore exits with 1, if no path is ignored
+    output = git_on_work_tree(repo, work_tree, ['check-ignore', '--no-index', '--stdin', '-z'], ''.join(f'{path}\0' for path in paths), (0, 1))
+
+    return {path for path in output.split('\0') if path}
+
+
+def read_tree(repo: git.Repo, commit: Optional[git.Commit]) -> TreeEntries:
+    """
+    Read all entries of the (recursive) tree of a commit without checking it out.
+
+    :param repo: The repository
+    :param commit: The commit; None for an empty tree
+    :return: The entries of the tree
+    """
+    if commit is None:
+        return {}
+
+    return {path: (mode, binsha) for binsha, mode, path in traverse_tree_recursive(repo.odb, commit.tree.binsha, '')}
+
+
+def write_tree(repo: git.Repo, entries: TreeEntries) -> bytes:
+    """
+    Write a (recursive) tree of all entries into the object database of a repository.
+
+    :param repo: The repository
+    :param entries: The entries of the tree
+    :return: The binary id of the root tree
+    """
+    index_entries = [BaseIndexEntry((mode, binsha, 0, path)) for path, (mode, binsha) in sorted(entries.items())]
+
+    return write_tree_from_cache(index_entries, repo.odb, slice(0, len(index_entries)))[0]
+
+
+def commit_tree(repo: git.Repo, entries: TreeEntries, message: str, parent: Optional[git.Commit], branch: str) -> Optional[git.Commit]:
+    """
+    Commit a tree of entries to a branch without touching the working tree or the index.
+    Author and committer are taken from the git configuration of the repository.
+
+    :param repo: The repository
+    :param entries: The entries of the tree to commit
+    :param message: The commit message
+    :param parent: The parent commit; None for the first commit of the branch
+    :param branch: Name of the branch, which is set to the new commit
+    :return: The new commit or None, if the tree equals the tree of the parent and nothing was committed
+    """
+    tree_binsha = write_tree(repo, entries)
+    if parent is not None and parent.tree.binsha == tree_binsha:
+        return None
+    commit = git.Commit.create_from_tree(repo, git.Tree(repo, tree_binsha), message, parent_commits=[parent] if parent is not None else [])
+    git.Head(repo, f'refs/heads/{branch}').set_commit(commit, logmsg=f'commit: {message.splitlines()[0]}')
+
+    return commit
+
+
+def commit_paths(repo: git.Repo, paths: Iterable[str], message: str) -> git.Commit:
+    """
+    Stage files of the working tree and commit them to the current branch, like git add and git commit, but in-process.
+
+    :param repo: The repository
+    :param paths: Paths to the files to stage (absolute or relative to the repository root)
+    :param message: The commit message
+    :return: The new commit
+    """
+    repo.index.add(list(paths))
+
+    return repo.index.commit(message)
+
+
+def working_tree_files(directory: str) -> List[str]:
+    """
+    Collect all files (and symlinks) of a working tree, excluding the .git directory.
+
+    :param directory: The top level directory of the working tree
+    :return: The paths to all files, relative to the directory and with forward slashes
+    """
+    files = []
+    for root, dirs, names in os.walk(directory):
+        if root == directory and '.git' in dirs:
+            dirs.remove('.git')
+        # symlinked directories are single entries of a tree
+        for name in [name for name in dirs if os.path.islink(os.path.join(root, name))]:
+            dirs.remove(name)
+            names.append(name)
+        files += [os.path.relpath(os.path.join(root, name), directory).replace(os.sep, '/') for name in names]
+
+    return sorted(files)
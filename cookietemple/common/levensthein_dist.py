@@ -1,6 +1,8 @@
-from typing import Tuple
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
 
-from cookietemple.common.suggest_similar_commands import SIMILARITY_SUGGEST_FACTOR, SIMILARITY_USE_FACTOR
+from cookietemple.common.suggest_similar_commands import MAIN_COMMANDS, SIMILARITY_SUGGEST_FACTOR, SIMILARITY_USE_FACTOR
+from cookietemple.common.template_registry import AVAILABLE_TEMPLATES_PATH, TemplateRegistry
 
 
 def levensthein_dist(input_command: str, candidate: str) -> int:
@@ -12,73 +14,190 @@ def levensthein_dist(input_command: str, candidate: str) -> int:
 
     :return: The similarity between the two strings measured by the levensthein distance
     """
+    return bounded_levensthein_dist(input_command, candidate, max(len(input_command), len(candidate)))
 
+
+def bounded_levensthein_dist(input_command: str, candidate: str, max_dist: int) -> int:
+    """
+    Calculate the levensthein distance with Myers' bit-parallel algorithm, which processes a whole column of the DP table per character.
+    Every column is encoded as the vertical differences between its cells, held as bits of two integers (one bit per character of the candidate).
+    The calculation stops as soon as the distance is known to exceed max_dist.
+
+    :param input_command: The command the user gave as input
+    :param candidate: The (possible similar) alternative command
+    :param max_dist: The largest distance of interest
+    :return: The levensthein distance or max_dist + 1, if the distance is larger than max_dist
+    """
+    if abs(len(input_command) - len(candidate)) > max_dist:
+        return max_dist + 1
     if not input_command or not candidate:
         return max(len(input_command), len(candidate))  # at least one string is empty
 
-    dp_table = [[0 for col in range(len(input_command) + 1)] for row in range(len(candidate) + 1)]
+    # bit i of the match mask of a character is set, if the candidate has this character at position i
+    match_masks: Dict[str, int] = {}
+    for i, char in enumerate(candidate):
+        match_masks[char] = match_masks.get(char, 0) | 1 << i
+    mask = (1 << len(candidate)) - 1
+    last_bit = 1 << (len(candidate) - 1)
+    # all cells of the first column increase by one from top to bottom
+    positive_vertical, negative_vertical = mask, 0
+    dist = len(candidate)
+
+    for j, char in enumerate(input_command, start=1):
+        match = match_masks.get(char, 0)
+        x_vertical = match | negative_vertical
+        x_horizontal = (((match & positive_vertical) + positive_vertical) ^ positive_vertical) | match
+        positive_horizontal = negative_vertical | ~(x_horizontal | positive_vertical)
+        negative_horizontal = positive_vertical & x_horizontal
+        # the bottom cell of the column holds the distance of the candidate to the prefix of the input processed so far
+        if positive_horizontal & last_bit:
+            dist += 1
+        elif negative_horizontal & last_bit:
+            dist -= 1
+        # every remaining character of the input decreases the distance by at most one
+        if dist - (len(input_command) - j) > max_dist:
+            return max_dist + 1
+        # the top cell of every column grows by one, since the distance to the empty candidate is the length of the prefix
+        positive_horizontal = (positive_horizontal << 1) | 1
+        negative_horizontal <<= 1
+        positive_vertical = (negative_horizontal | ~(x_vertical | positive_horizontal)) & mask
+        negative_vertical = positive_horizontal & x_vertical & mask
+
+    return dist
+
+
+class FuzzyIndex:
+    """
+    A BK-tree over a set of commands, which finds all commands within a distance without comparing the input to every command.
+    Every child of a node is keyed by its distance to the node. By the triangle inequality only children with a key within max_dist
+    of the input's distance to the node can hold matches.
+
+    :attribute root: The root node as a tuple of its command and its children by distance; None if the index is empty
+    :attribute size: Number of indexed commands
+    """
+
+    def __init__(self, commands: Iterable[str] = ()):
+        self.root: Optional[Tuple[str, Dict[int, tuple]]] = None
+        self.size = 0
+        # a sorted insertion order keeps the shape of the tree (and thereby the order of the matches) independent of the iteration order of sets
+        for command in sorted(set(commands)):
+            self.add(command)
+
+    def add(self, command: str) -> None:
+        """
+        Add a command to the index.
+
+        :param command: The command
+        """
+        if self.root is None:
+            self.root = (command, {})
+            self.size = 1
+            return
+        node = self.root
+        while True:
+            dist = levensthein_dist(command, node[0])
+            if dist == 0:
+                return
+            if dist not in node[1]:
+                node[1][dist] = (command, {})
+                self.size += 1
+                return
+            node = node[1][dist]
+
+    def search(self, command: str, max_dist: int) -> List[Tuple[int, str]]:
+        """
+        Find all indexed commands within a distance of the input.
+
+        :param command: The command the user gave as input
+        :param max_dist: The largest distance of a match
+        :return: The matches as tuples of their distance and command, sorted by both
+        """
+        matches = []
+        nodes = [self.root] if self.root is not None else []
+        while nodes:
+            node_command, children = nodes.pop()
+            # the exact distance is only needed, if it is small enough to reach any child
+            max_child_dist = max(children, default=0)
+            dist = bounded_levensthein_dist(command, node_command, max_dist + max_child_dist)
+            if dist <= max_dist:
+                matches.append((dist, node_command))
+            nodes.extend(child for child_dist, child in children.items() if dist - max_dist <= child_dist <= dist + max_dist)
+
+        return sorted(matches)
+
+    def most_similar(self, command: str) -> Tuple[list, str]:
+        """
+        Determine whether its possible to suggest a similar command, like most_similar_command.
+        The search radius starts small and is doubled until a match is found, since small radii prune most of the tree and most inputs are typos.
+
+        :param command: The command given by the user
+        :return: A list of similar command(s) or the empty string if there's none and a string that indicates the action to be taken
+        """
+        lim_use = int(len(command) * SIMILARITY_USE_FACTOR)
+        lim_suggest = int(len(command) * SIMILARITY_SUGGEST_FACTOR)
+        radius = min(1, lim_suggest)
+        matches = self.search(command, radius)
+        while not matches and radius < lim_suggest:
+            radius = min(2 * radius, lim_suggest)
+            matches = self.search(command, radius)
+        if not matches:
+            return [], ''
+        min_dist = matches[0][0]
+        most_similar = [match for dist, match in matches if dist == min_dist]
+
+        return (most_similar, 'use') if min_dist <= lim_use else (most_similar, 'suggest')
+
+
+@lru_cache(maxsize=32)
+def fuzzy_index(commands: FrozenSet[str]) -> FuzzyIndex:
+    """
+    Build the index of a set of commands once per process.
+
+    :param commands: The commands
+    :return: The index
+    """
+    return FuzzyIndex(commands)
+
 
-    dp_table[0] = list(range(0, len(input_command) + 1))
-    for i in range(1, len(candidate) + 1):
-        dp_table[i][0] = i
+def main_commands_index() -> FuzzyIndex:
+    """
+    The index of cookietemple's main commands.
 
-    # now choose minimum levensthein distance from the three option delete/replace/insert
-    # if chars are the same -> levensthein distance is the same as for those substring without these chars of input_command
-    # and candidate
+    :return: The index
+    """
+    return fuzzy_index(frozenset(MAIN_COMMANDS))
 
-    for i in range(1, len(candidate) + 1):
-        for j in range(1, len(input_command) + 1):
-            # choose minimum edit distance from delete, replace or insert at current substring
-            if input_command[j - 1] == candidate[i - 1]:
-                dp_table[i][j] = dp_table[i - 1][j - 1]
-            else:
-                dp_table[i][j] = min(min(dp_table[i][j - 1], dp_table[i - 1][j - 1]), dp_table[i - 1][j]) + 1
 
-    return dp_table[len(candidate)][len(input_command)]
+def handle_index() -> FuzzyIndex:
+    """
+    The index of all available template handles (and their prefixes).
 
+    :return: The index
+    """
+    return registry_handle_index(TemplateRegistry.load(AVAILABLE_TEMPLATES_PATH))
 
-def most_similar_command(command: str, command_list: set) -> Tuple[list, str]:
+
+@lru_cache(maxsize=4)
+def registry_handle_index(registry: TemplateRegistry) -> FuzzyIndex:
+    """
+    Build the index of all handles (and their prefixes) of a template registry once per registry.
+
+    :param registry: The template registry
+    :return: The index
+    """
+    return FuzzyIndex(registry.all_handles)
+
+
+def most_similar_command(command: str, command_list: Iterable[str]) -> Tuple[list, str]:
     """
     This function determines whether its possible to suggest a similar command.
     The similarity is determined by the levensthein distance and a factor (currently 1/3)
     sets a limit where a similar command is useful to be automatically used. If the difference diff is 1/3 < diff <= 2/3, one
     or more similar commands could be suggested, but not used automatically.
+    The commands are indexed once per distinct list of commands.
     :param command_list: The commands that are available by the users specific action
     :param command: The command given by the user
 
     :return: A list of similar command(s) or the empty string if there's none and a string that indicates the action to be taken
     """
-    min_use = 999999  # some random large integer -> we will never have handles that are larger than 1000 character
-    min_suggest = 999999
-    sim_command_use = []
-    sim_command_suggest = []
-
-    # for each valid handle calculate the levensthein distance and if one is found that is a new minimal distance,
-    # replace it and take this handle as the most similar command.
-    for handle in command_list:
-        dist = levensthein_dist(command, handle)
-
-        # the more restrict condition for automatic use
-        lim_use = int(len(command) * SIMILARITY_USE_FACTOR)
-
-        # the weaker condition for command suggestion
-        lim_suggest = int(len(command) * SIMILARITY_SUGGEST_FACTOR)
-
-        # check if the command is close to the inputted command so it can be automatically used
-        if lim_use >= dist:
-            if min_use > dist:  # and min >= dist:
-                min_use = dist
-                sim_command_use = [handle]
-            elif min_use == dist:
-                sim_command_use.append(handle)
-
-        # the input is not very close to any command, but maybe a similar one can be suggested?
-        elif lim_use < dist <= lim_suggest:
-            if min_suggest > dist:  # and min >= dist:
-                min_suggest = dist
-                sim_command_suggest = [handle]
-            elif min_suggest == dist:
-                sim_command_suggest.append(handle)
-
-    # return the use list, as those are closer, but if its empty, return the list of suggested commands (or if that is empty too, an empty list)
-    return (sim_command_use, 'use') if sim_command_use else (sim_command_suggest, 'suggest') if sim_command_suggest else ([], '')
+    return fuzzy_index(frozenset(command_list)).most_similar(command)
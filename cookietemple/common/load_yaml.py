@@ -12,3 +12,14 @@ def load_yaml_file(yaml_file_path: str) -> dict:
     yaml = YAML()
     yaml.boolean_representation = ['False', 'True']  # type: ignore
     return yaml.load(path)
+
+
+def load_yaml_string(content: str) -> dict:
+    """
+    Loads yaml content (like a file read from git) and returns it as nested dictionary.
+
+    :param content: The yaml content
+    :return: nested dictionary as the content of the yaml string
+    """
+    yaml = YAML()
+    return yaml.load(content)
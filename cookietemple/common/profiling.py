@@ -0,0 +1,258 @@
+import io
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Set
+
+log = logging.getLogger(__name__)
+
+# cProfile, pstats and tracemalloc are only imported when a phase is profiled, since every command imports this module
+
+
+@dataclass
+class Span:
+    """
+    A single timed phase of a command.
+    """
+    name: str  # name of the phase like create.lint
+    start: float  # start in seconds since the profiler was enabled
+    thread_id: int  # identifier of the thread, which ran the phase
+    depth: int  # number of enclosing spans of the same thread
+    duration: float = 0.0  # duration in seconds
+    child_duration: float = 0.0  # summed duration of all directly nested spans of the same thread
+    args: Dict[str, object] = field(default_factory=dict)  # additional information shown in the trace
+
+
+class Profiler:
+    """
+    Records spans of the phases of a command, if profiling has been enabled with --profile.
+    While profiling is disabled, spans do nothing and are cheap enough to stay in place permanently.
+    Phases can additionally be profiled by cProfile or traced by tracemalloc.
+
+    :attribute enabled: Whether spans are recorded
+    :attribute spans: All finished spans
+    :attribute cprofile_phases: Names of the phases, which are profiled by cProfile
+    :attribute memory_phases: Names of the phases, whose peak memory usage is traced by tracemalloc
+    :attribute profiles: The cProfile statistics of every profiled phase
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.spans: List[Span] = []
+        self.cprofile_phases: Set[str] = set()
+        self.memory_phases: Set[str] = set()
+        self.profiles: Dict[str, 'pstats.Stats'] = {}  # type: ignore # noqa: F821
+        self.origin = time.perf_counter()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._active_cprofile: Optional['cProfile.Profile'] = None  # type: ignore # noqa: F821
+        self._memory_span: Optional[Span] = None
+
+    def enable(self, cprofile_phases: Optional[Set[str]] = None, memory_phases: Optional[Set[str]] = None) -> None:
+        """
+        Start recording spans.
+
+        :param cprofile_phases: Names of the phases to profile with cProfile
+        :param memory_phases: Names of the phases to trace with tracemalloc
+        """
+        self.enabled = True
+        self.spans = []
+        self.profiles = {}
+        self.cprofile_phases = set(cprofile_phases or ())
+        self.memory_phases = set(memory_phases or ())
+        self.origin = time.perf_counter()
+
+    @contextmanager
+    def span(self, name: str, **args) -> Iterator[None]:
+        """
+        Time a phase. Spans may be nested and used by several threads at once.
+
+        :param name: Name of the phase
+        :param args: Additional information shown in the trace
+        """
+        if not self.enabled:
+            yield
+            return
+        stack = self._local.__dict__.setdefault('stack', [])
+        current = Span(name, time.perf_counter() - self.origin, threading.get_ident(), len(stack), args=dict(args))
+        stack.append(current)
+        profile = self._start_cprofile(name)
+        trace_memory = self._start_tracemalloc(current)
+        try:
+            yield
+        finally:
+            if trace_memory:
+                self._stop_tracemalloc(current)
+            if profile is not None:
+                self._stop_cprofile(name, profile)
+            current.duration = time.perf_counter() - self.origin - current.start
+            stack.pop()
+            if stack:
+                stack[-1].child_duration += current.duration
+            with self._lock:
+                self.spans.append(current)
+
+    def _start_cprofile(self, name: str) -> Optional['cProfile.Profile']:  # type: ignore # noqa: F821
+        """
+        Start profiling a phase with cProfile. Only a single phase is profiled at once; nested or concurrent ones are skipped.
+
+        :param name: Name of the phase
+        :return: The running profile or None, if the phase is not profiled
+        """
+        if name not in self.cprofile_phases:
+            return None
+        import cProfile
+
+        with self._lock:
+            if self._active_cprofile is not None:
+                log.debug(f'Skipping cProfile of {name}, since another phase is already profiled.')
+                return None
+            self._active_cprofile = cProfile.Profile()
+        self._active_cprofile.enable()
+
+        return self._active_cprofile
+
+    def _stop_cprofile(self, name: str, profile: 'cProfile.Profile') -> None:  # type: ignore # noqa: F821
+        """
+        Stop profiling a phase and add its statistics to the statistics of all earlier runs of the same phase.
+
+        :param name: Name of the phase
+        :param profile: The running profile
+        """
+        import pstats
+
+        profile.disable()
+        with self._lock:
+            self._active_cprofile = None
+            if name in self.profiles:
+                self.profiles[name].add(profile)
+            else:
+                self.profiles[name] = pstats.Stats(profile, stream=io.StringIO())
+
+    def _start_tracemalloc(self, current: Span) -> bool:
+        """
+        Start tracing the memory allocations of a phase with tracemalloc, which traces the whole process.
+        Hence, only a single phase is traced at once; nested or concurrent ones are skipped (nested ones are covered by their enclosing phase).
+
+        :param current: The span of the phase
+        :return: Whether the phase is traced
+        """
+        if current.name not in self.memory_phases:
+            return False
+        import tracemalloc
+
+        with self._lock:
+            if self._memory_span is not None or tracemalloc.is_tracing():
+                log.debug(f'Skipping tracemalloc of {current.name}, since memory allocations are already traced.')
+                return False
+            self._memory_span = current
+            tracemalloc.start()
+
+        return True
+
+    def _stop_tracemalloc(self, current: Span) -> None:
+        """
+        Stop tracing the memory allocations of a phase and record its peak memory usage.
+
+        :param current: The span of the traced phase
+        """
+        import tracemalloc
+
+        with self._lock:
+            current.args['peak_memory_kb'] = tracemalloc.get_traced_memory()[1] // 1024
+            tracemalloc.stop()
+            self._memory_span = None
+
+    def chrome_trace(self) -> dict:
+        """
+        Convert all spans into the Chrome trace event format, which can be viewed with chrome://tracing or https://ui.perfetto.dev.
+
+        :return: The trace
+        """
+        pid = os.getpid()
+        events = [{'name': span.name, 'cat': span.name.split('.')[0], 'ph': 'X', 'ts': round(span.start * 1e6), 'dur': round(span.duration * 1e6),
+                   'pid': pid, 'tid': span.thread_id, 'args': {key: str(value) for key, value in span.args.items()}}
+                  for span in sorted(self.spans, key=lambda span: span.start)]
+
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def write_trace(self, trace_path: str) -> None:
+        """
+        Write the Chrome trace and the cProfile statistics of all profiled phases (next to the trace as <trace>.<phase>.prof).
+
+        :param trace_path: Path to the trace file
+        """
+        with open(trace_path, 'w') as f:
+            json.dump(self.chrome_trace(), f)
+        for name, stats in self.profiles.items():
+            stats.dump_stats(f'{os.path.splitext(trace_path)[0]}.{name}.prof')
+
+    def summary(self) -> List[dict]:
+        """
+        Aggregate all spans of the same phase, ordered by their first start.
+
+        :return: One row per phase with its number of calls, total, self and maximum duration in seconds and its nesting depth
+        """
+        rows: Dict[str, dict] = {}
+        for span in sorted(self.spans, key=lambda span: span.start):
+            row = rows.setdefault(span.name, {'name': span.name, 'depth': span.depth, 'calls': 0, 'total': 0.0, 'self': 0.0, 'max': 0.0,
+                                              'peak_memory_kb': None})
+            row['calls'] += 1
+            row['total'] += span.duration
+            row['self'] += span.duration - span.child_duration
+            row['max'] = max(row['max'], span.duration)
+            if 'peak_memory_kb' in span.args:
+                row['peak_memory_kb'] = max(row['peak_memory_kb'] or 0, span.args['peak_memory_kb'])  # type: ignore
+
+        return list(rows.values())
+
+    def print_summary(self, trace_path: Optional[str] = None) -> None:
+        """
+        Print a table of the time spent in every phase, followed by the most expensive functions of all phases profiled by cProfile.
+
+        :param trace_path: Path the trace was written to (if any)
+        """
+        from rich.box import HEAVY_HEAD
+        from rich.console import Console
+        from rich.style import Style
+        from rich.table import Table
+
+        console = Console()
+        wall_time = max((span.start + span.duration for span in self.spans), default=0.0)
+        table = Table(title='[bold]Time spent per phase', title_style='blue', header_style=Style(color='blue', bold=True), box=HEAVY_HEAD)
+        # the timings never wrap; overly long phase names are shortened instead on narrow terminals (the trace holds the full names)
+        table.add_column('Phase', justify='left', style='green', overflow='ellipsis')
+        for column in ('Calls', 'Total', 'Self', 'Max', '% wall', 'Peak mem'):
+            table.add_column(column, justify='right', no_wrap=True, min_width=6)
+        for row in self.summary():
+            table.add_row(f'{"  " * row["depth"]}{row["name"]}', str(row['calls']), f'{row["total"]:.3f}s', f'{row["self"]:.3f}s', f'{row["max"]:.3f}s',
+                          f'{100 * row["total"] / wall_time:.1f}%' if wall_time else '-',
+                          f'{row["peak_memory_kb"]} KiB' if row['peak_memory_kb'] is not None else '')
+        console.print(table)
+        for name, stats in self.profiles.items():
+            output = io.StringIO()
+            stats.stream = output  # type: ignore
+            stats.sort_stats('cumulative').print_stats(15)
+            console.print(f'[bold blue]Most expensive functions of {name}:')
+            console.print(output.getvalue(), markup=False, highlight=False, soft_wrap=True)
+        if trace_path:
+            console.print(f'[bold blue]Trace written to {trace_path}. Open it with chrome://tracing or https://ui.perfetto.dev')
+
+
+# the profiler of this process; shared by all commands
+PROFILER = Profiler()
+
+
+def span(name: str, **args):
+    """
+    Time a phase of a command with the profiler of this process. Does nothing, unless profiling has been enabled.
+
+    :param name: Name of the phase like create.lint
+    :param args: Additional information shown in the trace
+    :return: A context manager timing the phase
+    """
+    return PROFILER.span(name, **args)
@@ -0,0 +1,227 @@
+import configparser
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
+
+import appdirs  # type: ignore
+import requests
+from requests.adapters import HTTPAdapter
+from packaging.requirements import InvalidRequirement, Requirement
+
+from cookietemple.common.atomic_file import write_json_atomically
+
+log = logging.getLogger(__name__)
+
+# base URL of a PyPI style JSON API; package information is requested from <index_url>/<package>/json
+DEFAULT_INDEX_URL = 'https://pypi.org/pypi'
+# directory holding one cached JSON API response per package and index
+PYPI_CACHE_DIR = os.path.join(appdirs.user_cache_dir(appname='cookietemple'), 'pypi')
+# seconds a cached response is used without asking the index whether it changed
+PYPI_CACHE_TTL = 3600
+
+
+@dataclass
+class PackageInfo:
+    """
+    The resolved information of a single package.
+
+    :attribute name: Name of the package as it was requested
+    :attribute url: The JSON API URL the package was requested from
+    :attribute status: One of 'ok', 'not_found', 'timeout' or 'connection_error'
+    :attribute latest_version: Latest version of the package, if it was found
+    """
+    name: str
+    url: str
+    status: str
+    latest_version: Optional[str] = None
+
+
+class PyPIResolver:
+    """
+    Resolves the latest versions of many packages at once.
+    Requests are sent concurrently over a single pooled session. Responses are cached on disk and revalidated using their ETag after the TTL expired.
+
+    :attribute index_url: Base URL of the PyPI style JSON API
+    :attribute cache_dir: Directory of the response cache; None disables the cache
+    :attribute ttl: Seconds a cached response is used without revalidation
+    :attribute max_workers: Maximum number of concurrent requests
+    :attribute timeout: Timeout of a single request in seconds
+    """
+
+    def __init__(self,
+                 index_url: str = DEFAULT_INDEX_URL,
+                 cache_dir: Optional[str] = PYPI_CACHE_DIR,
+                 ttl: int = PYPI_CACHE_TTL,
+                 max_workers: int = 8,
+                 timeout: int = 10):
+        self.index_url = index_url.rstrip('/')
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.max_workers = max_workers
+        self.timeout = timeout
+
+    def resolve(self, names: Iterable[str]) -> Dict[str, PackageInfo]:
+        """
+        Resolve the latest versions of all given packages. Every distinct package is only requested once.
+
+        :param names: Names of the packages
+        :return: A dictionary mapping each package name to its resolved information
+        """
+        unique_names = list(dict.fromkeys(names))
+        if not unique_names:
+            return {}
+        with requests.Session() as session:
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_workers)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(unique_names))) as executor:
+                resolved = list(executor.map(lambda name: self.resolve_package(session, name), unique_names))
+
+        return dict(zip(unique_names, resolved))
+
+    def resolve_package(self, session: requests.Session, name: str) -> PackageInfo:
+        """
+        Resolve a single package. A cached response younger than the TTL is used as is, older ones are revalidated with their ETag.
+
+        :param session: The session to send the request with
+        :param name: Name of the package
+        :return: The resolved information of the package
+        """
+        url = f'{self.index_url}/{name}/json'
+        cached = self.load_cached_response(name)
+        if cached is not None and time.time() - cached['fetched_at'] < self.ttl:
+            return PackageInfo(name, url, cached['status'], cached['latest_version'])
+
+        headers = {'Accept': 'application/json'}
+        if cached is not None and cached.get('etag'):
+            headers['If-None-Match'] = cached['etag']
+        try:
+            response = session.get(url, headers=headers, timeout=self.timeout)
+        except requests.exceptions.Timeout:
+            return PackageInfo(name, url, 'timeout')
+        except requests.exceptions.ConnectionError:
+            return PackageInfo(name, url, 'connection_error')
+
+        if response.status_code == 304 and cached is not None:
+            log.debug(f'Cached PyPI response of {name} is still valid.')
+            status, latest_version = cached['status'], cached['latest_version']
+        elif response.status_code == 200:
+            try:
+                status, latest_version = 'ok', response.json()['info']['version']
+            except (ValueError, KeyError, TypeError):
+                log.debug(f'Received a malformed PyPI response for {name}.')
+                return PackageInfo(name, url, 'not_found')
+        else:
+            status, latest_version = 'not_found', None
+        self.store_cached_response(name, {'fetched_at': time.time(), 'etag': response.headers.get('ETag'),
+                                          'status': status, 'latest_version': latest_version})
+
+        return PackageInfo(name, url, status, latest_version)
+
+    def cache_path(self, name: str) -> str:
+        """
+        Path of the cached response of a package. Responses of different indices never share a cache file.
+
+        :param name: Name of the package
+        :return: Path to the cache file
+        """
+        index_digest = hashlib.sha256(self.index_url.encode('utf-8')).hexdigest()[:16]
+
+        return os.path.join(self.cache_dir, index_digest, f'{canonicalize_name(name)}.json')  # type: ignore
+
+    def load_cached_response(self, name: str) -> Optional[dict]:
+        """
+        Load the cached response of a package.
+
+        :param name: Name of the package
+        :return: The cached response or None, if the package was not cached (or the cache is disabled)
+        """
+        if self.cache_dir is None:
+            return None
+        try:
+            with open(self.cache_path(name)) as f:
+                cached = json.load(f)
+            if not all(key in cached for key in ('fetched_at', 'status', 'latest_version')):
+                return None
+            return cached
+        except (OSError, ValueError):
+            return None
+
+    def store_cached_response(self, name: str, response: dict) -> None:
+        """
+        Cache a response of a package.
+
+        :param name: Name of the package
+        :param response: The response to cache
+        """
+        if self.cache_dir is None:
+            return
+        try:
+            write_json_atomically(response, self.cache_path(name))
+        except OSError as e:
+            log.debug(f'Unable to cache PyPI response of {name}: {e}')
+
+
+def canonicalize_name(name: str) -> str:
+    """
+    Normalize a package name as defined by PEP 503, so differently spelled names of the same package share their cache entry.
+
+    :param name: Name of the package
+    :return: The normalized name
+    """
+    return re.sub(r'[-_.]+', '-', name).lower()
+
+
+def parse_requirements(lines: Iterable[str]) -> List[Requirement]:
+    """
+    Parse requirement specifiers as used by requirements.txt, requirements.in and install_requires.
+    Comments, empty lines and pip options (like -r requirements.txt) are skipped.
+
+    :param lines: The lines to parse
+    :return: The parsed requirements in the order of the lines
+    """
+    requirements = []
+    for line in lines:
+        line = line.split(' #', 1)[0].strip()
+        if not line or line.startswith(('#', '-')):
+            continue
+        try:
+            requirements.append(Requirement(line))
+        except InvalidRequirement:
+            log.debug(f'Skipping unparsable requirement {line}')
+
+    return requirements
+
+
+def parse_requirements_file(path: str) -> List[Requirement]:
+    """
+    Parse a requirements.txt or requirements.in file.
+
+    :param path: Path to the requirements file
+    :return: The parsed requirements
+    """
+    with open(path) as f:
+        return parse_requirements(f)
+
+
+def parse_setup_cfg_requirements(path: str) -> List[Requirement]:
+    """
+    Parse the install_requires of the options section of a setup.cfg file.
+
+    :param path: Path to the setup.cfg file
+    :return: The parsed requirements; empty if the setup.cfg does not declare any
+    """
+    parser = configparser.ConfigParser(interpolation=None)
+    try:
+        parser.read(path)
+    except configparser.Error as e:
+        log.debug(f'Unable to parse {path}: {e}')
+        return []
+
+    return parse_requirements(parser.get('options', 'install_requires', fallback='').splitlines())
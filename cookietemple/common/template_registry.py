@@ -0,0 +1,202 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+from typing import Dict, List, Optional, Set, Tuple
+
+import appdirs  # type: ignore
+
+from cookietemple.common.atomic_file import write_json_atomically
+
+log = logging.getLogger(__name__)
+
+AVAILABLE_TEMPLATES_PATH = os.path.normpath(f'{os.path.dirname(__file__)}/../create/templates/available_templates.yml')
+
+# directory holding the compiled snapshots of template registries; other compiled template data (like search indices) is stored here as well
+REGISTRY_CACHE_DIR = os.path.join(appdirs.user_cache_dir(appname='cookietemple'), 'registry')
+
+# increase whenever the layout of the snapshot changes to invalidate all existing snapshots
+REGISTRY_SNAPSHOT_FORMAT = 1
+
+
+class TemplateRegistry:
+    """
+    Compiled view of an available_templates.yml file, which is loaded only once per process.
+    The parsed templates are additionally stored as a JSON snapshot keyed by the mtime and hash of the YAML file, so that following cookietemple
+    invocations do not need to parse YAML at all.
+    Every registry is shared by all callers and must therefore never be modified.
+
+    :attribute path: Path to the available_templates.yml file
+    :attribute digest: sha256 hex digest of the YAML file
+    :attribute available_templates: The templates as nested dictionary exactly like they are specified in the YAML file
+    :attribute templates_by_handle: Every template by its full handle (like cli-python)
+    :attribute handles_by_domain: The handles of all templates of a domain
+    :attribute handles_by_language: The handles of all templates of a language
+    :attribute all_handles: All full handles and all of their prefixes (like cli or web-website)
+    """
+    _registries: Dict[str, Tuple[Tuple[int, int], 'TemplateRegistry']] = {}
+    _lock = threading.Lock()
+
+    def __init__(self, path: str, digest: str, available_templates: dict):
+        self.path = path
+        self.digest = digest
+        self.available_templates = available_templates
+        self.templates_by_handle: Dict[str, dict] = {}
+        self.handles_by_domain: Dict[str, List[str]] = {}
+        self.handles_by_language: Dict[str, List[str]] = {}
+        self.all_handles: Set[str] = set()
+        self.index(available_templates)
+
+    @classmethod
+    def load(cls, path: str = AVAILABLE_TEMPLATES_PATH) -> 'TemplateRegistry':
+        """
+        Load the registry of an available_templates.yml file. The registry is memoized and only loaded again, if the file changed.
+
+        :param path: Path to the available_templates.yml file
+        :return: The registry
+        """
+        path = os.path.realpath(path)
+        stat = os.stat(path)
+        file_state = (stat.st_mtime_ns, stat.st_size)
+        with cls._lock:
+            memoized = cls._registries.get(path)
+            if memoized is not None and memoized[0] == file_state:
+                return memoized[1]
+            registry = cls.load_snapshot(path, file_state) or cls.compile(path, file_state)
+            cls._registries[path] = (file_state, registry)
+
+        return registry
+
+    @classmethod
+    def compile(cls, path: str, file_state: Tuple[int, int], data: Optional[bytes] = None) -> 'TemplateRegistry':
+        """
+        Parse the YAML file and store the snapshot of the resulting registry.
+
+        :param path: Path to the available_templates.yml file
+        :param file_state: The mtime and size of the file
+        :param data: The content of the file, if it has already been read
+        :return: The registry
+        """
+        from cookietemple.common.load_yaml import load_yaml_file
+
+        if data is None:
+            with open(path, 'rb') as f:
+                data = f.read()
+        log.debug(f'Compiling template registry of {path}.')
+        # round trip through JSON to get rid of ruamel's comment preserving types, exactly like a loaded snapshot
+        available_templates = json.loads(json.dumps(load_yaml_file(path)))
+        registry = cls(path, hashlib.sha256(data).hexdigest(), available_templates)
+        registry.store_snapshot(file_state)
+
+        return registry
+
+    @classmethod
+    def snapshot_path(cls, path: str) -> str:
+        """
+        Path to the snapshot of the registry of an available_templates.yml file.
+
+        :param path: Path to the available_templates.yml file
+        :return: Path to the snapshot
+        """
+        path_digest = hashlib.sha256(path.encode('utf-8')).hexdigest()[:16]
+
+        return os.path.join(REGISTRY_CACHE_DIR, f'available_templates-{path_digest}.json')
+
+    @classmethod
+    def load_snapshot(cls, path: str, file_state: Tuple[int, int]) -> Optional['TemplateRegistry']:
+        """
+        Load the registry from its snapshot. The snapshot is used if the mtime and size of the YAML file did not change or, if they changed,
+        the hash of its content still matches.
+
+        :param path: Path to the available_templates.yml file
+        :param file_state: The current mtime and size of the file
+        :return: The registry or None if there is no valid snapshot
+        """
+        try:
+            with open(cls.snapshot_path(path)) as f:
+                snapshot = json.load(f)
+            if snapshot['format'] != REGISTRY_SNAPSHOT_FORMAT:
+                return None
+            if tuple(snapshot['file_state']) != file_state:
+                with open(path, 'rb') as f:
+                    data = f.read()
+                if hashlib.sha256(data).hexdigest() != snapshot['digest']:
+                    return cls.compile(path, file_state, data)
+                registry = cls(path, snapshot['digest'], snapshot['available_templates'])
+                registry.store_snapshot(file_state)
+                return registry
+            log.debug(f'Loading template registry snapshot of {path}.')
+            return cls(path, snapshot['digest'], snapshot['available_templates'])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def store_snapshot(self, file_state: Tuple[int, int]) -> None:
+        """
+        Store the snapshot of the registry.
+
+        :param file_state: The mtime and size of the YAML file the registry was compiled from
+        """
+        snapshot_path = TemplateRegistry.snapshot_path(self.path)
+        try:
+            write_json_atomically({'format': REGISTRY_SNAPSHOT_FORMAT, 'file_state': list(file_state), 'digest': self.digest,
+                                   'available_templates': self.available_templates}, snapshot_path)
+        except OSError as e:
+            log.debug(f'Unable to store template registry snapshot at {snapshot_path}: {e}')
+
+    def index(self, templates: dict) -> None:
+        """
+        Index all templates of a (nested) template dictionary by their handle, domain and language.
+
+        :param templates: The (nested) template dictionary
+        """
+        for value in templates.values():
+            if not isinstance(value, dict):
+                continue
+            if 'handle' not in value:
+                self.index(value)
+                continue
+            handle = value['handle']
+            parts = handle.split('-')
+            self.templates_by_handle[handle] = value
+            self.handles_by_domain.setdefault(parts[0], []).append(handle)
+            self.handles_by_language.setdefault(parts[-1], []).append(handle)
+            self.all_handles.update('-'.join(parts[:end]) for end in range(1, len(parts) + 1))
+
+    def template(self, handle: str) -> dict:
+        """
+        Get a single template by its full handle.
+
+        :param handle: The full handle of the template (like cli-python)
+        :return: The template as specified in the YAML file
+        :raises KeyError: if no template with this handle exists
+        """
+        return self.templates_by_handle[handle]
+
+    def version(self, handle: str) -> str:
+        """
+        Get the version of a template.
+
+        :param handle: The full handle of the template
+        :return: The version of the template
+        :raises KeyError: if no template with this handle exists
+        """
+        return self.templates_by_handle[handle]['version']
+
+    def templates_of_domain(self, domain: str) -> List[dict]:
+        """
+        Get all templates of a domain.
+
+        :param domain: The domain (like cli)
+        :return: The templates of the domain; empty if the domain does not exist
+        """
+        return [self.templates_by_handle[handle] for handle in self.handles_by_domain.get(domain, [])]
+
+    def templates_of_language(self, language: str) -> List[dict]:
+        """
+        Get all templates of a language.
+
+        :param language: The language (like python)
+        :return: The templates of the language; empty if the language does not exist
+        """
+        return [self.templates_by_handle[handle] for handle in self.handles_by_language.get(language, [])]
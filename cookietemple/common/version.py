@@ -4,7 +4,8 @@ from typing import Tuple
 
 from rich import print
 
-from cookietemple.common.load_yaml import load_yaml_file
+from cookietemple.common.load_yaml import load_yaml_file, load_yaml_string
+from cookietemple.common.template_registry import TemplateRegistry
 
 
 def load_ct_template_version(handle: str, yaml_path: str) -> str:
@@ -15,13 +16,8 @@ def load_ct_template_version(handle: str, yaml_path: str) -> str:
     :param yaml_path: Path to the yaml file
     :return: The version number to the given handles template
     """
-    available_templates = load_yaml_file(yaml_path)
-    parts = handle.split('-')
-    if len(parts) == 2:
-        return available_templates[parts[0]][parts[1]]['version']
-    elif len(parts) == 3:
-
-        return available_templates[parts[0]][parts[1]][parts[2]]['version']
+    if len(handle.split('-')) in (2, 3):
+        return TemplateRegistry.load(yaml_path).version(handle)
 
     return ''
 
@@ -42,3 +38,29 @@ def load_project_template_version_and_handle(project_dir: Path) -> Tuple[str, st
     except FileNotFoundError:
         print(f'[bold red]No .cookietemple.yml found at {project_dir.__str__()}. Is this a cookietemple project?')
         sys.exit(1)
+
+
+def load_branch_template_version_and_handle(project_dir: Path, branch: str) -> Tuple[str, str]:
+    """
+    Load the template version and handle like load_project_template_version_and_handle, but from the .cookietemple.yml file of a branch.
+    The file is read directly from git (like git show development:.cookietemple.yml), so the branch does not need to be checked out.
+    A branch, which only exists at origin (like every branch except the default branch of a fresh clone), is read from its remote-tracking branch.
+
+    :param project_dir: Top level directory of the users project.
+    :param branch: The branch to read the .cookietemple.yml file from
+    :return: The version number of the cookietemple template of the branch and the projects template handle.
+    :raises git.exc.GitCommandError: if neither the branch nor its remote-tracking branch or their .cookietemple.yml file exist
+    """
+    import git  # type: ignore
+
+    repo = git.Repo(project_dir)
+    try:
+        dot_cookietemple = repo.git.show(f'{branch}:.cookietemple.yml')
+    except git.exc.GitCommandError:
+        if not any(head.name == branch for head in repo.heads) and 'origin' in repo.remotes:
+            dot_cookietemple = repo.git.show(f'origin/{branch}:.cookietemple.yml')
+        else:
+            raise
+    ct_meta = load_yaml_string(dot_cookietemple)
+    # split the template version at first space to omit the cookietemple bump-version tag and return it and the handle
+    return ct_meta['template_version'].split(" ", 1)[0], ct_meta['template_handle']
@@ -3,7 +3,6 @@ import os
 import sys
 import appdirs  # type: ignore
 from pathlib import Path
-from cryptography.fernet import Fernet
 from ruamel.yaml import YAML
 from rich.box import HEAVY_HEAD
 from rich.style import Style
@@ -12,7 +11,6 @@ from rich.table import Table
 from rich.console import Console
 
 from cookietemple.common.levensthein_dist import most_similar_command
-from cookietemple.custom_cli.questionary import cookietemple_questionary_or_dot_cookietemple
 from cookietemple.common.load_yaml import load_yaml_file
 
 
@@ -41,6 +39,8 @@ class ConfigCommand:
         """
         Set full_name and email for reuse in any project created further on.
         """
+        from cookietemple.custom_cli.questionary import cookietemple_questionary_or_dot_cookietemple
+
         ConfigCommand.check_ct_config_dir_exists()
         full_name = cookietemple_questionary_or_dot_cookietemple(function='text',
                                                                  question='Full name',
@@ -77,6 +77,10 @@ class ConfigCommand:
         """
         Set the personal access token (PAT) for automatic Github repo creation.
         """
+        # prompting and encryption are only required here; importing them lazily keeps reading settings cheap
+        from cryptography.fernet import Fernet
+        from cookietemple.custom_cli.questionary import cookietemple_questionary_or_dot_cookietemple
+
         ConfigCommand.check_ct_config_dir_exists()
         try:
             path = Path(ConfigCommand.CONF_FILE_PATH)
@@ -160,6 +164,22 @@ class ConfigCommand:
             print('[bold red]Did not found a cookietemple config file!\n'
                   'If this is your first time running cookietemple you can set them using [green]cookietemple config general')
 
+    @staticmethod
+    def load_setting(name: str, default=None):
+        """
+        Load a single, optional setting from the cookietemple config file.
+
+        :param name: Name of the setting
+        :param default: Value returned, if the setting or the config file does not exist
+        :return: The value of the setting
+        """
+        try:
+            settings = load_yaml_file(ConfigCommand.CONF_FILE_PATH)
+        except FileNotFoundError:
+            return default
+
+        return settings.get(name, default) if settings else default
+
     @staticmethod
     def similar_handle(section: str) -> None:
         """
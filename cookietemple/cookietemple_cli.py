@@ -7,28 +7,22 @@ import sys
 import click
 
 from pathlib import Path
-from rich import traceback
+from typing import Optional, Tuple
 from rich import print
-import rich.logging
-
-from cookietemple.bump_version.bump_version import VersionBumper
-from cookietemple.create.create import choose_domain
-from cookietemple.info.info import TemplateInfo
-from cookietemple.lint.lint import lint_project
-from cookietemple.list.list import TemplateLister
-from cookietemple.upgrade.upgrade import UpgradeCommand
-from cookietemple.warp.warp import warp_project
+
 from cookietemple.custom_cli.click import HelpErrorHandling, print_project_version, CustomHelpSubcommand, CustomArg, print_cookietemple_version
-from cookietemple.config.config import ConfigCommand
-from cookietemple.custom_cli.questionary import cookietemple_questionary_or_dot_cookietemple
-from cookietemple.sync.sync import TemplateSync
-from cookietemple.common.load_yaml import load_yaml_file
+
+# the modules implementing the commands and their (heavy) dependencies like GitPython, PyGithub or cookiecutter are imported by the
+# commands themselves. This keeps the startup time of every cookietemple invocation low, since only the invoked command is ever loaded
 
 WD = os.path.dirname(__file__)
 log = logging.getLogger()
 
 
 def main():
+    from rich import traceback
+    from cookietemple.upgrade.upgrade import UpgradeCommand
+
     traceback.install(width=200, word_wrap=True)
     print(rf"""[bold blue]
      ██████  ██████   ██████  ██   ██ ██ ███████ ████████ ███████ ███    ███ ██████  ██      ███████ 
@@ -40,9 +34,8 @@ def main():
 
     print('[bold blue]Run [green]cookietemple --help [blue]for an overview of all commands\n')
 
-    # Is the latest cookietemple version installed? Upgrade if not!
-    if not UpgradeCommand.check_cookietemple_latest():
-        print('[bold blue]Run [green]cookietemple upgrade [blue]to get the latest version.')
+    # Is the latest cookietemple version installed? Notify the user at exit if not, without delaying the command
+    UpgradeCommand.start_upgrade_check()
     cookietemple_cli()
 
 
@@ -51,11 +44,22 @@ def main():
               help='Output the current version of cookietemple installed.')
 @click.option('-v', '--verbose', is_flag=True, default=False, help='Enable verbose output (print debug statements).')
 @click.option("-l", "--log-file", help="Save a verbose log to a file.")
+@click.option('--profile', is_flag=True, help='Time all phases of the command, print a summary and write a Chrome trace.')
+@click.option('--profile-trace', type=click.Path(dir_okay=False), default='cookietemple_trace.json', show_default=True,
+              help='Path to write the trace to (only with --profile).')
+@click.option('--profile-cprofile', multiple=True, metavar='PHASE', help='Profile a phase (like create.lint) with cProfile (only with --profile).')
+@click.option('--profile-memory', multiple=True, metavar='PHASE', help='Trace the peak memory usage of a phase (only with --profile).')
 @click.pass_context
-def cookietemple_cli(ctx, verbose, log_file):
+def cookietemple_cli(ctx, verbose, log_file, profile, profile_trace, profile_cprofile, profile_memory):
     """
     Create state of the art projects from production ready templates.
     """
+    import rich.console
+    import rich.logging
+
+    if profile:
+        start_profiling(ctx.invoked_subcommand, profile_trace, set(profile_cprofile), set(profile_memory))
+
     # Set the base logger to output DEBUG
     log.setLevel(logging.DEBUG)
 
@@ -77,11 +81,44 @@ def cookietemple_cli(ctx, verbose, log_file):
         log.addHandler(log_fh)
 
 
+def start_profiling(command: Optional[str], trace_path: str, cprofile_phases: set, memory_phases: set) -> None:
+    """
+    Record the time spent in all phases of the invoked command. The trace and the summary are written when cookietemple exits,
+    since most commands end by calling sys.exit.
+
+    :param command: Name of the invoked command
+    :param trace_path: Path to write the Chrome trace to
+    :param cprofile_phases: Names of the phases to profile with cProfile
+    :param memory_phases: Names of the phases to trace with tracemalloc
+    """
+    import atexit
+    from cookietemple.common.profiling import PROFILER
+
+    PROFILER.enable(cprofile_phases, memory_phases)
+    command_span = PROFILER.span(f'cookietemple {command}')
+    command_span.__enter__()
+
+    def finish_profiling() -> None:
+        command_span.__exit__(None, None, None)
+        PROFILER.write_trace(trace_path)
+        PROFILER.print_summary(trace_path)
+
+    atexit.register(finish_profiling)
+
+
 @cookietemple_cli.command(short_help='Create a new project using one of our templates.', cls=CustomHelpSubcommand)
 @click.argument('path', type=click.Path(), default=Path.cwd(), helpmsg='Path where the project should be created at.', cls=CustomArg)  # type: ignore
 @click.option('--domain', type=click.Choice(['cli', 'lib', 'gui', 'web', 'pub']),
               help='The projects domain with currently cli, lib, gui, web and pub supported.')
-def create(path: Path, domain: str) -> None:
+@click.option('--jobs', '-j', type=click.IntRange(min=1), default=1, help='Number of template files to render concurrently. With --batch the number of projects to create concurrently instead.')
+@click.option('--answers', type=click.Path(exists=True, dir_okay=False), help='YAML file with all answers to create the project without any prompts.')
+@click.option('--batch', type=click.Path(exists=True, dir_okay=False),
+              help='YAML manifest with the answers of many projects to create without any prompts. --jobs projects are created concurrently.')
+@click.option('--overwrite', is_flag=True, help='Replace an existing project directory and remove all of its content (only with --answers or --batch).')
+@click.option('--use-config', is_flag=True, help='Use name, email and Github username of the cookietemple config file (only with --answers or --batch).')
+@click.option('--check-names', is_flag=True, help='Look up the project name at PyPI and readthedocs.io (only with --answers or --batch).')
+@click.option('--github', is_flag=True, help='Create a Github repository, if the answers ask for one (only with --answers or --batch).')
+def create(path: Path, domain: str, jobs: int, answers: str, batch: str, overwrite: bool, use_config: bool, check_names: bool, github: bool) -> None:
     """
     Create a new project using one of our templates.
 
@@ -90,14 +127,61 @@ def create(path: Path, domain: str) -> None:
     Template specific prompts follow. If you do not yet have a cookietemple config file you may be asked to create one first.
     Next, you will be asked whether you want to use cookietemple's Github support create a repository, push your template and enable a few settings.
     After the project has been created it will be linted and you will be notified of any TODOs.
+    With an answers file the project is created without any prompts. A batch manifest creates many projects without any prompts at once.
     """
-    choose_domain(path, domain, None)
+    if not answers and not batch:
+        if overwrite or use_config or check_names or github:
+            print('[bold red]The options --overwrite, --use-config, --check-names and --github can only be used together with --answers or --batch!')
+            sys.exit(1)
+        from cookietemple.create.create import choose_domain
+
+        choose_domain(path, domain, None, jobs=jobs)
+        return
+    if answers and batch:
+        print('[bold red]The options --answers and --batch cannot be used together!')
+        sys.exit(1)
+
+    from cookietemple.create.create import create_from_answers, load_answers
+    from cookietemple.custom_cli.questionary import InvalidAnswerError
+    from cookietemple.config.config import ConfigCommand
+
+    if use_config and not os.path.exists(ConfigCommand.CONF_FILE_PATH):
+        print('[bold red]Cannot find a cookietemple config file! Run cookietemple config all to create one.')
+        sys.exit(1)
+    if batch:
+        import time
+        from cookietemple.create.batch import create_batch, load_manifest, print_batch_report
+
+        try:
+            projects = load_manifest(batch)
+        except InvalidAnswerError as e:
+            print(f'[bold red]{e}')
+            sys.exit(1)
+        start = time.perf_counter()
+        results = create_batch(projects, Path(path), workers=jobs, overwrite=overwrite, use_config=use_config, check_names=check_names,
+                               create_github_repo=github)
+        print_batch_report(results, time.perf_counter() - start)
+        sys.exit(0 if all(result.created for result in results) else 1)
+    try:
+        answers_dict = load_answers(answers)
+        if domain:
+            answers_dict['domain'] = domain
+        create_from_answers(answers_dict, Path(path), jobs=jobs, overwrite=overwrite, use_config=use_config, check_names=check_names,
+                            create_github_repo=github)
+    except InvalidAnswerError as e:
+        print(f'[bold red]Invalid answers file {answers}:\n{e}')
+        sys.exit(1)
+    except FileExistsError as e:
+        print(f'[bold red]{e}! Use --overwrite to overwrite it.')
+        sys.exit(1)
 
 
 @cookietemple_cli.command(short_help='Lint your existing cookietemple project.', cls=CustomHelpSubcommand)
 @click.argument('project_dir', type=click.Path(), default=Path(str(Path.cwd())), helpmsg='Path to projects directory.', cls=CustomArg)  # type: ignore
 @click.option('--skip-external', is_flag=True, help='Only run cookietemple linting and not external linters.')
-def lint(project_dir, skip_external) -> None:
+@click.option('--jobs', '-j', type=click.IntRange(min=1), default=1, help='Number of linting functions to run concurrently.')
+@click.option('--no-cache', is_flag=True, help='Lint all files again instead of reusing the results of unchanged files.')
+def lint(project_dir, skip_external, jobs, no_cache) -> None:
     """
     Lint your existing cookietemple project.
 
@@ -107,7 +191,9 @@ def lint(project_dir, skip_external) -> None:
     Afterwards, template specific linting is invoked. cli-python for example may check for the existence of a setup.py file.
     Both results are collected and displayed.
     """
-    lint_project(project_dir, skip_external)
+    from cookietemple.lint.lint import lint_project
+
+    lint_project(project_dir, skip_external, jobs=jobs, use_cache=not no_cache)
 
 
 @cookietemple_cli.command(short_help='List all available cookietemple templates.', cls=CustomHelpSubcommand)
@@ -119,6 +205,8 @@ def list() -> None:
     The output only consists of a short description for all templates.
     To get a detailed overview of a specific subset of templates use info.
     """
+    from cookietemple.list.list import TemplateLister
+
     template_lister = TemplateLister()
     template_lister.list_available_templates()
 
@@ -137,10 +225,32 @@ def info(ctx, handle: str) -> None:
     if not handle:
         HelpErrorHandling.args_not_provided(ctx, 'info')
     else:
+        from cookietemple.info.info import TemplateInfo
+
         template_info = TemplateInfo()
         template_info.show_info(handle.lower())
 
 
+@cookietemple_cli.command(short_help='Search all available cookietemple templates by keywords.', cls=CustomHelpSubcommand)
+@click.argument('terms', type=str, nargs=-1, helpmsg='Keywords like python or click, which are matched against names, handles, descriptions and libraries.',
+                cls=CustomArg)  # type: ignore
+@click.pass_context
+def search(ctx, terms: Tuple[str, ...]) -> None:
+    """
+    Search all available cookietemple templates by keywords.
+
+    Every keyword is matched against the name, handle, descriptions and available libraries of all templates.
+    Keywords may also be prefixes (e.g. pyth). Templates matching most keywords are listed first.
+    """
+    if not terms:
+        HelpErrorHandling.args_not_provided(ctx, 'search')
+    else:
+        from cookietemple.search.search import TemplateSearcher
+
+        template_searcher = TemplateSearcher()
+        template_searcher.show_results(' '.join(terms))
+
+
 @cookietemple_cli.command(short_help='Sync your project with the latest template release.', cls=CustomHelpSubcommand)
 @click.argument('project_dir', type=str, default=Path(f'{Path.cwd()}'),
                 helpmsg='The projects top level directory you would like to sync. Default is current working directory.', cls=CustomArg)  # type: ignore
@@ -148,14 +258,42 @@ def info(ctx, handle: str) -> None:
 @click.argument('pat', type=str, required=False, helpmsg='Personal access token. Not needed for manual, local syncing!', cls=CustomArg)  # type: ignore
 @click.argument('username', type=str, required=False, helpmsg='Github username. Not needed for manual, local syncing!', cls=CustomArg)  # type: ignore
 @click.option('--check-update', '-ch', is_flag=True, help='Check whether a new template version is available for your project.')
-def sync(project_dir, set_token, pat, username, check_update) -> None:
+@click.option('--jobs', '-j', type=click.IntRange(min=1), default=1,
+              help='Number of template files to render concurrently when recreating the template. With --fleet the number of projects synced concurrently.')
+@click.option('--fleet', type=click.Path(exists=True),
+              help='YAML manifest listing many projects or a directory to search for projects, which are all synced at once.')
+def sync(project_dir, set_token, pat, username, check_update, jobs, fleet) -> None:
     """
     Sync your project with the latest template release.
 
     cookietemple regularly updates its templates.
     To ensure that you have the latest changes you can invoke sync, which submits a pull request to your Github repository (if existing).
     If no repository exists the TEMPLATE branch will be updated and you can merge manually.
+    A fleet syncs many projects at once and summarizes the results.
     """
+    from cookietemple.common.load_yaml import load_yaml_file
+    from cookietemple.sync.sync import TemplateSync
+
+    if fleet:
+        if set_token or check_update:
+            print('[bold red]The options --set-token and --check-update cannot be used together with --fleet!')
+            sys.exit(1)
+        import time
+        from cookietemple.create.github_support import decrypt_pat, load_github_username
+        from cookietemple.custom_cli.questionary import InvalidAnswerError
+        from cookietemple.sync.fleet import load_fleet, print_fleet_report, sync_fleet
+
+        try:
+            project_dirs = load_fleet(fleet)
+        except InvalidAnswerError as e:
+            print(f'[bold red]{e}')
+            sys.exit(1)
+        # the credentials are shared by all projects and therefore only loaded once
+        start = time.perf_counter()
+        results = sync_fleet(project_dirs, gh_username=username or load_github_username(), token=pat or decrypt_pat(), workers=jobs)
+        print_fleet_report(results, time.perf_counter() - start)
+        sys.exit(0 if all(result.status != 'failed' for result in results) else 1)
+
     project_dir_path = Path(f'{Path.cwd()}/{project_dir}') if not str(project_dir).startswith(str(Path.cwd())) else Path(project_dir)
     log.debug(f'Set project top level path to given path argument {project_dir_path}')
     # if set_token flag is set, update the sync token value and exit
@@ -183,6 +321,7 @@ def sync(project_dir, set_token, pat, username, check_update) -> None:
 
     log.debug(f'Initializing syncer object.')
     syncer = TemplateSync(new_template_version='', project_dir=project_dir_path, gh_username=username, token=pat)
+    syncer.jobs = jobs
     # check for template version updates
     log.debug(f'Checking for major/minor or patch version changes in cookietemple templates.')
     major_change, minor_change, patch_change, proj_template_version, ct_template_version = TemplateSync.has_template_version_changed(project_dir_path)
@@ -245,6 +384,9 @@ def bump_version(ctx, new_version, project_dir, downgrade) -> None:
         if str(project_dir).endswith('/'):
             project_dir = Path(str(project_dir).replace(str(project_dir)[len(str(project_dir)) - 1:], ''))
 
+        from cookietemple.bump_version.bump_version import VersionBumper
+        from cookietemple.custom_cli.questionary import cookietemple_questionary_or_dot_cookietemple
+
         version_bumper = VersionBumper(project_dir, downgrade)
         # lint before run bump-version
         version_bumper.lint_before_bump()
@@ -278,6 +420,8 @@ def warp(input_dir: str, exec: str, output: str) -> None:
     cookietemple bundles Warp (https://github.com/dgiagio/warp), which can be used to create self contained, native executables.
     Currently, cookietemple does not ship any templates, where this may be required.
     """
+    from cookietemple.warp.warp import warp_project
+
     warp_project(input_dir, exec, output)
 
 
@@ -295,6 +439,8 @@ def config(ctx, view: bool, section: str) -> None:
     - pat: set your Github personal access token for Github repository creation
     - all: calls general and pat
     """
+    from cookietemple.config.config import ConfigCommand
+
     if view:
         ConfigCommand.view_current_config()
         sys.exit(0)
@@ -321,6 +467,8 @@ def upgrade() -> None:
     Checks whether the locally installed version of cookietemple is the latest.
     If not pip will be invoked to upgrade cookietemple to the latest version.
     """
+    from cookietemple.upgrade.upgrade import UpgradeCommand
+
     UpgradeCommand.check_upgrade_cookietemple()
 
 
@@ -0,0 +1,255 @@
+import io
+import logging
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, TextIO
+
+from rich import print
+from rich.box import HEAVY_HEAD
+from rich.console import Console
+from rich.style import Style
+from rich.table import Table
+
+from cookietemple.common.load_yaml import load_yaml_file
+from cookietemple.common.template_registry import TemplateRegistry
+from cookietemple.create.create import SUBDOMAIN_ANSWERS, create_from_answers
+from cookietemple.create.render_engine import RenderEngine
+from cookietemple.custom_cli.questionary import InvalidAnswerError
+from cookietemple.lint.lint import lint_project
+
+log = logging.getLogger(__name__)
+
+
+@dataclass
+class BatchResult:
+    """
+    The outcome of creating a single project of a batch.
+    """
+    index: int  # position of the project in the manifest
+    handle: str  # handle of the template (if known)
+    project_name: str  # name of the project
+    project_path: Optional[Path] = None  # path of the created project; None if the creation failed
+    create_seconds: float = 0.0  # time spent on creating the project
+    lint_seconds: float = 0.0  # time spent on linting the project
+    lint_status: str = 'skipped'  # either passed, warnings, failed or skipped
+    lint_summary: str = ''  # numbers of passed, warned and failed lint checks
+    error: str = ''  # reason of a failed creation
+    output: str = ''  # everything the creation and linting printed
+
+    @property
+    def created(self) -> bool:
+        return self.project_path is not None
+
+
+class ThreadOutput(io.TextIOBase):
+    """
+    Replacement of sys.stdout, which routes everything printed by a registered thread to its own buffer.
+    Output of all other threads is passed on unchanged.
+    """
+
+    def __init__(self, stdout: TextIO):
+        self.stdout = stdout
+        self.buffers: Dict[int, io.StringIO] = {}
+
+    def write(self, text: str) -> int:
+        return self.buffers.get(threading.get_ident(), self.stdout).write(text)
+
+    def flush(self) -> None:
+        self.buffers.get(threading.get_ident(), self.stdout).flush()
+
+    def isatty(self) -> bool:
+        # helper threads (like the refresh thread of a progress bar) must not draw to the terminal, while any output is captured
+        return not self.buffers and self.stdout.isatty()
+
+    def capture(self) -> io.StringIO:
+        """
+        Capture all output of the calling thread from now on.
+
+        :return: The buffer holding the output
+        """
+        buffer = io.StringIO()
+        self.buffers[threading.get_ident()] = buffer
+
+        return buffer
+
+    def release(self) -> None:
+        """
+        Stop capturing the output of the calling thread.
+        """
+        self.buffers.pop(threading.get_ident(), None)
+
+
+def load_manifest(manifest_file: str) -> List[dict]:
+    """
+    Load the answers of all projects of a batch manifest.
+    The manifest contains a list of answers below projects and optionally defaults, which apply to all projects.
+    Instead of its domain, subdomain and language a project may name its template by its handle (like web-website-python).
+
+    :param manifest_file: Path to the manifest
+    :return: The answers of all projects
+    :raises InvalidAnswerError: if the manifest does not contain a list of projects
+    """
+    manifest = load_yaml_file(manifest_file)
+    if not isinstance(manifest, dict) or not isinstance(manifest.get('projects'), list) or not manifest['projects']:
+        raise InvalidAnswerError(f'The manifest {manifest_file} must contain a list of projects.')
+    defaults = dict(manifest.get('defaults') or {})
+
+    return [dict(defaults, **answers_of_handle(dict(project) if isinstance(project, dict) else {})) for project in manifest['projects']]
+
+
+def answers_of_handle(answers: dict) -> dict:
+    """
+    Replace the handle of answers by the domain, subdomain and language it consists of.
+
+    :param answers: The answers of a project
+    :return: The answers without handle
+    """
+    handle = answers.pop('handle', None)
+    if handle is None:
+        return answers
+    parts = str(handle).split('-')
+    answers['domain'] = parts[0]
+    answers['language'] = parts[-1]
+    if len(parts) == 3 and parts[0] in SUBDOMAIN_ANSWERS:
+        answers[SUBDOMAIN_ANSWERS[parts[0]]] = parts[1]
+
+    return answers
+
+
+def create_batch(projects: List[dict], path: Path, workers: int = 1, overwrite: bool = False, use_config: bool = False, check_names: bool = False,
+                 create_github_repo: bool = False) -> List[BatchResult]:
+    """
+    Create all projects of a batch without any prompts by a pool of workers. A failing project does not stop the others.
+    The template registry and the compiled templates are loaded once and shared by all projects.
+    The output of every project is captured, so that the projects do not garble each other's output.
+
+    :param projects: The answers of all projects
+    :param path: Directory the projects are created in
+    :param workers: Number of projects created concurrently
+    :param overwrite: Whether already existing project directories are overwritten
+    :param use_config: Whether the full name, email and Github username default to the values of the cookietemple config file
+    :param check_names: Whether the project names are looked up at PyPI and readthedocs.io
+    :param create_github_repo: Whether Github repositories are created for projects, whose answers ask for one
+    :return: The results of all projects in the order of the manifest
+    """
+    # load everything shared by all projects up front, instead of by all workers at once
+    TemplateRegistry.load()
+    RenderEngine.get()
+    output = ThreadOutput(sys.stdout)
+    project_dirs = [project_directory_name(answers).casefold() for answers in projects]
+
+    def create_project(index: int, answers: dict) -> BatchResult:
+        result = BatchResult(index=index, handle=handle_of_answers(answers), project_name=str(answers.get('project_name', '')))
+        # projects created in the same directory would overwrite each other; directories differing in case only are the same on many file systems
+        project_dir = project_dirs[index - 1]
+        if project_dir and project_dirs.index(project_dir) != index - 1:
+            result.error = f'Duplicate of project {project_dirs.index(project_dir) + 1}'
+            return result
+        buffer = output.capture()
+        start = time.perf_counter()
+        try:
+            result.project_path = create_from_answers(answers, path, overwrite=overwrite, use_config=use_config, check_names=check_names,
+                                                      create_github_repo=create_github_repo, lint=False)
+            result.create_seconds = time.perf_counter() - start
+            lint_created_project(result)
+        except (Exception, SystemExit) as e:
+            result.create_seconds = time.perf_counter() - start
+            result.error = f'Aborted with exit code {e.code}' if isinstance(e, SystemExit) else str(e) or e.__class__.__name__
+            log.debug(f'Creating project {index} of the batch failed: {e}')
+        finally:
+            output.release()
+            result.output = buffer.getvalue()
+
+        return result
+
+    sys.stdout = output  # type: ignore
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(create_project, range(1, len(projects) + 1), projects))
+    finally:
+        sys.stdout = output.stdout
+
+
+def lint_created_project(result: BatchResult) -> None:
+    """
+    Lint a created project of a batch and record the outcome in its result.
+
+    :param result: The result of the created project
+    """
+    start = time.perf_counter()
+    try:
+        linter = lint_project(str(result.project_path), is_create=True, skip_external=False)
+        result.lint_summary = f'{len(linter.passed)} {len(linter.warned)} {len(linter.failed)}'  # type: ignore
+        result.lint_status = 'failed' if linter.failed else 'warnings' if linter.warned else 'passed'  # type: ignore
+    except SystemExit:
+        result.lint_status = 'failed'
+    finally:
+        result.lint_seconds = time.perf_counter() - start
+
+
+def project_directory_name(answers: dict) -> str:
+    """
+    Build the name of the directory a project is created in from its name like the creators do.
+
+    :param answers: The answers of a project
+    :return: The name of the project directory
+    """
+    project_slug = str(answers.get('project_name', '')).replace(' ', '_')
+    # python and pub projects have no hyphens in their directory name
+    if str(answers.get('language', '')).lower() == 'python' or str(answers.get('domain', '')).lower() == 'pub':
+        project_slug = project_slug.replace('-', '_')
+
+    return project_slug
+
+
+def handle_of_answers(answers: dict) -> str:
+    """
+    Build the template handle from the answers of a project, as far as they are known.
+
+    :param answers: The answers of a project
+    :return: The handle
+    """
+    domain = str(answers.get('domain', '')).lower()
+    subdomain = answers.get(SUBDOMAIN_ANSWERS.get(domain, ''), '')
+    language = answers.get('language', 'latex' if domain == 'pub' else '')
+
+    return '-'.join(str(part).lower() for part in (domain, subdomain, language) if part)
+
+
+def print_batch_report(results: List[BatchResult], seconds: float) -> None:
+    """
+    Print a table of all projects of a batch with their timings and lint status, followed by the output of all failed projects.
+
+    :param results: The results of all projects
+    :param seconds: Wall time of the whole batch
+    """
+    table = Table(title='[bold]Batch create results', title_style='blue', header_style=Style(color='blue', bold=True), box=HEAVY_HEAD)
+    table.add_column('#', justify='right')
+    table.add_column('Project', justify='left', style='green', no_wrap=True)
+    table.add_column('Handle', justify='left', no_wrap=True)
+    table.add_column('Status', justify='left')
+    table.add_column('Create', justify='right')
+    table.add_column('Lint', justify='right')
+    table.add_column('Lint status', justify='left')
+    table.add_column('Checks ✔ ! ✗', justify='left', no_wrap=True)
+    lint_colors = {'passed': 'green', 'warnings': 'yellow', 'failed': 'red', 'skipped': 'white'}
+    for result in results:
+        status = '[bold green]created' if result.created else '[bold red]failed'
+        table.add_row(str(result.index), result.project_name, result.handle, status, f'{result.create_seconds:.2f}s', f'{result.lint_seconds:.2f}s',
+                      f'[{lint_colors[result.lint_status]}]{result.lint_status}', result.lint_summary)
+    Console().print(table)
+
+    for result in results:
+        if not result.created:
+            print(f'\n[bold red]Project {result.index} ({result.project_name or "unnamed"}) failed: {result.error}')
+            if result.output.strip():
+                sys.stdout.write(f'{result.output.rstrip()}\n')
+
+    created = sum(result.created for result in results)
+    lint_failed = sum(result.lint_status == 'failed' for result in results)
+    print(f'\n[bold blue]Created {created} of {len(results)} projects in {seconds:.2f}s. '
+          f'{len(results) - created} failed, {lint_failed} failed linting.')
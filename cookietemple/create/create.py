@@ -1,42 +1,173 @@
 import logging
-from typing import Union, Optional
+import re
+from dataclasses import fields
+from typing import Union, Optional, List
 from pathlib import Path
 
-from cookietemple.create.domains.cli_creator import CliCreator
-from cookietemple.create.domains.web_creator import WebCreator
-from cookietemple.create.domains.gui_creator import GuiCreator
-from cookietemple.create.domains.lib_creator import LibCreator
-from cookietemple.create.domains.pub_creator import PubCreator
-from cookietemple.custom_cli.questionary import cookietemple_questionary_or_dot_cookietemple
+from cookietemple.create.domains.cli_creator import CliCreator, TemplateStructCli
+from cookietemple.create.domains.web_creator import WebCreator, TemplateStructWeb
+from cookietemple.create.domains.gui_creator import GuiCreator, TemplateStructGui
+from cookietemple.create.domains.lib_creator import LibCreator, TemplateStructLib
+from cookietemple.create.domains.pub_creator import PubCreator, TemplateStructPub
+from cookietemple.custom_cli.questionary import cookietemple_questionary_or_dot_cookietemple, InvalidAnswerError, PromptFreeAnswers
+from cookietemple.common.load_yaml import load_yaml_file
+from cookietemple.common.template_registry import TemplateRegistry
+from cookietemple.config.config import ConfigCommand
+from cookietemple.common.profiling import span
 
 
 log = logging.getLogger(__name__)
 
+DOMAIN_CREATORS = {
+    'cli': (CliCreator, TemplateStructCli),
+    'web': (WebCreator, TemplateStructWeb),
+    'gui': (GuiCreator, TemplateStructGui),
+    'lib': (LibCreator, TemplateStructLib),
+    'pub': (PubCreator, TemplateStructPub)
+}
 
-def choose_domain(path: Path, domain: Union[str, bool], dot_cookietemple: Optional[dict]):
+# answers, which are required for prompt-free project creation per domain; all other answers default to the defaults of their prompts
+REQUIRED_ANSWERS = {
+    'cli': ['project_name', 'full_name', 'email', 'github_username'],
+    'web': ['project_name', 'full_name', 'email', 'github_username'],
+    'gui': ['project_name', 'full_name', 'email', 'github_username'],
+    'lib': ['project_name', 'full_name', 'email', 'github_username'],
+    'pub': ['project_name', 'github_username']
+}
+
+# keys of the subdomain answers, which are part of the template handle
+SUBDOMAIN_ANSWERS = {'web': 'webtype', 'pub': 'pubtype'}
+
+# answers, which are set by cookietemple itself when creating the project; they are ignored, so that .cookietemple.yml files can be used as answers
+COMPUTED_ANSWERS = {'cookietemple_version', 'template_version', 'template_handle', 'project_slug', 'project_slug_no_hyphen'}
+
+
+def choose_domain(path: Path, domain: Union[str, bool], dot_cookietemple: Optional[dict], jobs: int = 1, lint: bool = True):
     """
     Prompts the user for the template domain.
     Creates the .cookietemple file.
     Prompts the user whether or not to create a Github repository
+    The working directory is never changed, so that several projects can be created concurrently by different threads.
 
+    :param path: Directory the project is created in
     :param domain: Template domain
     :param dot_cookietemple: Dictionary created from the .cookietemple.yml file. None if no .cookietemple.yml file was used.
+    :param jobs: Number of template files rendered concurrently
+    :param lint: Whether the created project is linted
     """
     if not domain:
-        domain = cookietemple_questionary_or_dot_cookietemple(function='select',
-                                                              question='Choose the project\'s domain',
-                                                              choices=['cli', 'lib', 'gui', 'web', 'pub'],
-                                                              default='cli',
-                                                              dot_cookietemple=dot_cookietemple,
-                                                              to_get_property='domain')
-
-    switcher = {
-        'cli': CliCreator,
-        'web': WebCreator,
-        'gui': GuiCreator,
-        'lib': LibCreator,
-        'pub': PubCreator
-    }
-
-    creator_obj: Union[CliCreator, WebCreator, GuiCreator, LibCreator, PubCreator] = switcher.get(domain.lower())()  # type: ignore
-    creator_obj.create_template(path, dot_cookietemple)
+        with span('create.prompt'):
+            domain = cookietemple_questionary_or_dot_cookietemple(function='select',
+                                                                  question='Choose the project\'s domain',
+                                                                  choices=['cli', 'lib', 'gui', 'web', 'pub'],
+                                                                  default='cli',
+                                                                  dot_cookietemple=dot_cookietemple,
+                                                                  to_get_property='domain')
+
+    creator_obj: Union[CliCreator, WebCreator, GuiCreator, LibCreator, PubCreator] = DOMAIN_CREATORS[domain.lower()][0](output_root=path)  # type: ignore
+    creator_obj.jobs = jobs
+    creator_obj.lint = lint
+    with span('create', domain=domain.lower()):  # type: ignore
+        creator_obj.create_template(path, dot_cookietemple)
+
+
+def create_from_answers(answers: dict, path: Path, jobs: int = 1, overwrite: bool = False, use_config: bool = False, check_names: bool = False,
+                        create_github_repo: bool = False, lint: bool = True) -> Path:
+    """
+    Creates a project without any prompts. All answers are validated against the template struct of the domain before anything is created.
+    Answers that are not required and missing are set to the default of their prompt.
+    Reading the cookietemple config file, looking up the project name at PyPI and readthedocs.io and creating a Github repository are opt-in.
+
+    :param answers: All answers, like the content of a .cookietemple.yml file
+    :param path: Directory the project is created in
+    :param jobs: Number of template files rendered concurrently
+    :param overwrite: Whether an already existing project directory is overwritten
+    :param use_config: Whether the full name, email and Github username default to the values of the cookietemple config file
+    :param check_names: Whether the project name is looked up at PyPI and readthedocs.io
+    :param create_github_repo: Whether a Github repository is created, if the answers ask for one
+    :param lint: Whether the created project is linted
+    :return: Path to the created project
+    :raises InvalidAnswerError: if the answers are invalid
+    :raises FileExistsError: if the project directory already exists and must not be overwritten
+    :raises FileNotFoundError: if the cookietemple config file should be used, but does not exist
+    """
+    answers = dict(answers)
+    if use_config:
+        config = load_yaml_file(ConfigCommand.CONF_FILE_PATH)
+        for key in ('full_name', 'email', 'github_username'):
+            if config.get(key):
+                answers.setdefault(key, config[key])
+    answers = validate_answers(answers)
+
+    creator_obj = DOMAIN_CREATORS[answers['domain']][0](output_root=path)
+    creator_obj.jobs = jobs
+    creator_obj.overwrite = overwrite
+    creator_obj.check_name_availability = check_names
+    creator_obj.create_github_repo = create_github_repo
+    creator_obj.lint = lint
+    with span('create', domain=answers['domain'], project_name=answers.get('project_name')):
+        creator_obj.create_template(path, answers)
+
+    return creator_obj.project_path  # type: ignore
+
+
+def load_answers(answers_file: str) -> dict:
+    """
+    Load the answers of a prompt-free project creation from a YAML file.
+
+    :param answers_file: Path to the answers file
+    :return: The answers
+    :raises InvalidAnswerError: if the file does not contain a mapping of answers
+    """
+    answers = load_yaml_file(answers_file)
+    if not isinstance(answers, dict):
+        raise InvalidAnswerError(f'The answers file {answers_file} must contain a mapping of answers.')
+
+    return dict(answers)
+
+
+def validate_answers(answers: dict) -> PromptFreeAnswers:
+    """
+    Validate the answers of a prompt-free project creation against the template struct of their domain and the available templates.
+    All problems are reported at once.
+
+    :param answers: The answers
+    :return: The answers completed by the Github defaults, which are never prompted for, and without the answers set by cookietemple
+    :raises InvalidAnswerError: if any answer is missing or invalid
+    """
+    domain = str(answers.get('domain', '')).lower()
+    if domain not in DOMAIN_CREATORS:
+        raise InvalidAnswerError(f'Invalid or missing domain {answers.get("domain")}. Choose one of {", ".join(DOMAIN_CREATORS)}.')
+    answers = PromptFreeAnswers({key: value for key, value in answers.items() if key not in COMPUTED_ANSWERS}, domain=domain)
+    if 'github_username' in answers:
+        answers.setdefault('creator_github_username', answers['github_username'])
+    answers.setdefault('is_github_repo', False)
+    answers.setdefault('is_repo_private', False)
+    answers.setdefault('is_github_orga', False)
+    if domain == 'pub':
+        answers.setdefault('language', 'latex')
+    errors: List[str] = [f'Missing answer {key}.' for key in REQUIRED_ANSWERS[domain] if not answers.get(key)]
+
+    struct_fields = {field.name: field.type for field in fields(DOMAIN_CREATORS[domain][1])}
+    for key, value in answers.items():
+        if key not in struct_fields:
+            errors.append(f'Unknown answer {key} for {domain} projects.')
+        elif struct_fields[key] is bool and not isinstance(value, bool):
+            errors.append(f'The answer {key} must be either true or false.')
+        elif struct_fields[key] is not bool and not isinstance(value, (str, bool)):
+            errors.append(f'The answer {key} must be a string. Put it in quotes.')
+
+    if answers.get('is_github_orga') and not answers.get('github_orga'):
+        errors.append('Missing answer github_orga for an organization repository.')
+    if isinstance(answers.get('version'), str) and not re.match(r'(?<!.)\d+(?:\.\d+){2}(?:-SNAPSHOT)?(?!.)', answers['version']):
+        errors.append(f'The version {answers["version"]} does not match semantic versioning.')
+
+    subdomain = answers.get(SUBDOMAIN_ANSWERS.get(domain, ''), '')
+    handle = '-'.join(str(part).lower() for part in (domain, subdomain, answers.get('language', '')) if part)
+    if 'language' in answers and handle not in TemplateRegistry.load().templates_by_handle:
+        errors.append(f'There is no template {handle}.')
+
+    if errors:
+        raise InvalidAnswerError('\n'.join(errors))
+
+    return answers
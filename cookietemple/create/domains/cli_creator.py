@@ -8,6 +8,7 @@ from cookietemple.create.template_creator import TemplateCreator
 from cookietemple.create.domains.cookietemple_template_struct import CookietempleTemplateStruct
 from cookietemple.custom_cli.questionary import cookietemple_questionary_or_dot_cookietemple
 from cookietemple.common.version import load_ct_template_version
+from cookietemple.common.profiling import span
 
 
 @dataclass
@@ -28,9 +29,9 @@ class TemplateStructCli(CookietempleTemplateStruct):
 
 class CliCreator(TemplateCreator):
 
-    def __init__(self):
+    def __init__(self, output_root: Optional[Path] = None):
         self.cli_struct = TemplateStructCli(domain='cli')
-        super().__init__(self.cli_struct)
+        super().__init__(self.cli_struct, output_root)
         self.WD_Path = Path(os.path.dirname(__file__))
         self.TEMPLATES_CLI_PATH = f'{self.WD_Path.parent}/templates/cli'
 
@@ -42,31 +43,32 @@ class CliCreator(TemplateCreator):
         """
         Handles the CLI domain. Prompts the user for the language, general and domain specific options.
         """
-        self.cli_struct.language = cookietemple_questionary_or_dot_cookietemple(function='select',
-                                                                                question='Choose the project\'s primary language',
-                                                                                choices=['python', 'java'],
-                                                                                default='python',
-                                                                                dot_cookietemple=dot_cookietemple,
-                                                                                to_get_property='language')
-
-        # prompt the user to fetch general template configurations
-        super().prompt_general_template_configuration(dot_cookietemple)
-
-        # switch case statement to prompt the user to fetch template specific configurations
-        switcher: Dict[str, Any] = {
-            'python': self.cli_python_options,
-            'java': self.cli_java_options,
-        }
-        switcher.get(self.cli_struct.language)(dot_cookietemple)  # type: ignore
-
-        self.cli_struct.is_github_repo, \
-            self.cli_struct.is_repo_private, \
-            self.cli_struct.is_github_orga, \
-            self.cli_struct.github_orga \
-            = prompt_github_repo(dot_cookietemple)
-
-        if self.cli_struct.is_github_orga:
-            self.cli_struct.github_username = self.cli_struct.github_orga
+        with span('create.prompt'):
+            self.cli_struct.language = cookietemple_questionary_or_dot_cookietemple(function='select',
+                                                                                    question='Choose the project\'s primary language',
+                                                                                    choices=['python', 'java'],
+                                                                                    default='python',
+                                                                                    dot_cookietemple=dot_cookietemple,
+                                                                                    to_get_property='language')
+
+            # prompt the user to fetch general template configurations
+            super().prompt_general_template_configuration(dot_cookietemple)
+
+            # switch case statement to prompt the user to fetch template specific configurations
+            switcher: Dict[str, Any] = {
+                'python': self.cli_python_options,
+                'java': self.cli_java_options,
+            }
+            switcher.get(self.cli_struct.language)(dot_cookietemple)  # type: ignore
+
+            self.cli_struct.is_github_repo, \
+                self.cli_struct.is_repo_private, \
+                self.cli_struct.is_github_orga, \
+                self.cli_struct.github_orga \
+                = prompt_github_repo(dot_cookietemple)
+
+            if self.cli_struct.is_github_orga:
+                self.cli_struct.github_username = self.cli_struct.github_orga
         # create the chosen and configured template
         super().create_template_without_subdomain(self.TEMPLATES_CLI_PATH)
 
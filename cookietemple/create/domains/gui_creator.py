@@ -8,6 +8,7 @@ from cookietemple.create.template_creator import TemplateCreator
 from cookietemple.create.domains.cookietemple_template_struct import CookietempleTemplateStruct
 from cookietemple.custom_cli.questionary import cookietemple_questionary_or_dot_cookietemple
 from cookietemple.common.version import load_ct_template_version
+from cookietemple.common.profiling import span
 
 
 @dataclass
@@ -21,9 +22,9 @@ class TemplateStructGui(CookietempleTemplateStruct):
 
 class GuiCreator(TemplateCreator):
 
-    def __init__(self):
+    def __init__(self, output_root: Optional[Path] = None):
         self.gui_struct = TemplateStructGui(domain='gui')
-        super().__init__(self.gui_struct)
+        super().__init__(self.gui_struct, output_root)
         self.WD_Path = Path(os.path.dirname(__file__))
         self.TEMPLATES_GUI_PATH = f'{self.WD_Path.parent}/templates/gui'
 
@@ -31,26 +32,27 @@ class GuiCreator(TemplateCreator):
         self.GUI_JAVA_TEMPLATE_VERSION = load_ct_template_version('gui-java', self.AVAILABLE_TEMPLATES_PATH)
 
     def create_template(self, path: Path, dot_cookietemple: Optional[Dict]):
-        self.gui_struct.language = cookietemple_questionary_or_dot_cookietemple(function='select',
-                                                                                question='Choose between the following languages',
-                                                                                choices=['java'],
-                                                                                dot_cookietemple=dot_cookietemple,
-                                                                                to_get_property='language')
-
-        # prompt the user to fetch general template configurations
-        super().prompt_general_template_configuration(dot_cookietemple)
-
-        # switch case statement to prompt the user to fetch template specific configurations
-        switcher: Dict[str, Any] = {
-            'java': self.gui_java_options,
-        }
-        switcher.get(self.gui_struct.language.lower())(dot_cookietemple)  # type: ignore
+        with span('create.prompt'):
+            self.gui_struct.language = cookietemple_questionary_or_dot_cookietemple(function='select',
+                                                                                    question='Choose between the following languages',
+                                                                                    choices=['java'],
+                                                                                    dot_cookietemple=dot_cookietemple,
+                                                                                    to_get_property='language')
+
+            # prompt the user to fetch general template configurations
+            super().prompt_general_template_configuration(dot_cookietemple)
+
+            # switch case statement to prompt the user to fetch template specific configurations
+            switcher: Dict[str, Any] = {
+                'java': self.gui_java_options,
+            }
+            switcher.get(self.gui_struct.language.lower())(dot_cookietemple)  # type: ignore
 
-        self.gui_struct.is_github_repo, self.gui_struct.is_repo_private, self.gui_struct.is_github_orga, self.gui_struct.github_orga \
-            = prompt_github_repo(dot_cookietemple)
+            self.gui_struct.is_github_repo, self.gui_struct.is_repo_private, self.gui_struct.is_github_orga, self.gui_struct.github_orga \
+                = prompt_github_repo(dot_cookietemple)
 
-        if self.gui_struct.is_github_orga:
-            self.gui_struct.github_username = self.gui_struct.github_orga
+            if self.gui_struct.is_github_orga:
+                self.gui_struct.github_username = self.gui_struct.github_orga
         # create the gui template
         super().create_template_without_subdomain(self.TEMPLATES_GUI_PATH)
 
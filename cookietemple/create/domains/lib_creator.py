@@ -8,6 +8,7 @@ from cookietemple.create.template_creator import TemplateCreator
 from cookietemple.create.domains.cookietemple_template_struct import CookietempleTemplateStruct
 from cookietemple.custom_cli.questionary import cookietemple_questionary_or_dot_cookietemple
 from cookietemple.common.version import load_ct_template_version
+from cookietemple.common.profiling import span
 
 
 @dataclass
@@ -19,9 +20,9 @@ class TemplateStructLib(CookietempleTemplateStruct):
 
 class LibCreator(TemplateCreator):
 
-    def __init__(self):
+    def __init__(self, output_root: Optional[Path] = None):
         self.lib_struct = TemplateStructLib(domain='lib')
-        super().__init__(self.lib_struct)
+        super().__init__(self.lib_struct, output_root)
         self.WD_Path = Path(os.path.dirname(__file__))
         self.TEMPLATES_LIB_PATH = f'{self.WD_Path.parent}/templates/lib'
 
@@ -32,31 +33,31 @@ class LibCreator(TemplateCreator):
         """
         Handles the LIB domain. Prompts the user for the language, general and domain specific options.
         """
-
-        self.lib_struct.language = cookietemple_questionary_or_dot_cookietemple(function='select',
-                                                                                question='Choose the project\'s primary language',
-                                                                                choices=['cpp'],
-                                                                                default='cpp',
-                                                                                dot_cookietemple=dot_cookietemple,
-                                                                                to_get_property='language')
-
-        # prompt the user to fetch general template configurations
-        super().prompt_general_template_configuration(dot_cookietemple)
-
-        # switch case statement to prompt the user to fetch template specific configurations
-        switcher: Dict[str, Any] = {
-            'cpp': self.lib_cpp_options,
-        }
-        switcher.get(self.lib_struct.language)(dot_cookietemple)  # type: ignore
-
-        self.lib_struct.is_github_repo, \
-            self.lib_struct.is_repo_private, \
-            self.lib_struct.is_github_orga, \
-            self.lib_struct.github_orga \
-            = prompt_github_repo(dot_cookietemple)
-
-        if self.lib_struct.is_github_orga:
-            self.lib_struct.github_username = self.lib_struct.github_orga
+        with span('create.prompt'):
+            self.lib_struct.language = cookietemple_questionary_or_dot_cookietemple(function='select',
+                                                                                    question='Choose the project\'s primary language',
+                                                                                    choices=['cpp'],
+                                                                                    default='cpp',
+                                                                                    dot_cookietemple=dot_cookietemple,
+                                                                                    to_get_property='language')
+
+            # prompt the user to fetch general template configurations
+            super().prompt_general_template_configuration(dot_cookietemple)
+
+            # switch case statement to prompt the user to fetch template specific configurations
+            switcher: Dict[str, Any] = {
+                'cpp': self.lib_cpp_options,
+            }
+            switcher.get(self.lib_struct.language)(dot_cookietemple)  # type: ignore
+
+            self.lib_struct.is_github_repo, \
+                self.lib_struct.is_repo_private, \
+                self.lib_struct.is_github_orga, \
+                self.lib_struct.github_orga \
+                = prompt_github_repo(dot_cookietemple)
+
+            if self.lib_struct.is_github_orga:
+                self.lib_struct.github_username = self.lib_struct.github_orga
         # create the chosen and configured template
         super().create_template_without_subdomain(self.TEMPLATES_LIB_PATH)
 
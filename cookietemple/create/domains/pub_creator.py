@@ -10,6 +10,7 @@ from cookietemple.create.domains.cookietemple_template_struct import Cookietempl
 from cookietemple.custom_cli.questionary import cookietemple_questionary_or_dot_cookietemple
 from cookietemple.config.config import ConfigCommand
 from cookietemple.common.version import load_ct_template_version
+from cookietemple.common.profiling import span
 
 
 @dataclass
@@ -31,12 +32,11 @@ class TemplateStructPub(CookietempleTemplateStruct):
 
 class PubCreator(TemplateCreator):
 
-    def __init__(self):
+    def __init__(self, output_root: Optional[Path] = None):
         self.pub_struct = TemplateStructPub(domain='pub', language='latex')
-        super().__init__(self.pub_struct)
+        super().__init__(self.pub_struct, output_root)
         self.WD_Path = Path(os.path.dirname(__file__))
         self.TEMPLATES_PUB_PATH = f'{self.WD_Path.parent}/templates/pub'
-        self.CWD = os.getcwd()
 
         '"" TEMPLATE VERSIONS ""'
         self.PUB_LATEX_TEMPLATE_VERSION = load_ct_template_version('pub-thesis-latex', self.AVAILABLE_TEMPLATES_PATH)
@@ -46,32 +46,33 @@ class PubCreator(TemplateCreator):
         Prompts the user for the publication type and forwards to subsequent prompts.
         Creates the pub template.
         """
-        # latex is default language
-
-        self.pub_struct.pubtype = cookietemple_questionary_or_dot_cookietemple(function='select',
-                                                                               question='Choose between the following publication types',
-                                                                               choices=['thesis'],
-                                                                               dot_cookietemple=dot_cookietemple,
-                                                                               to_get_property='pubtype')
-
-        if not os.path.exists(ConfigCommand.CONF_FILE_PATH):
-            print('[bold red]Cannot find a Cookietemple config file! Is this your first time with Cookietemple?\n')
-            print('[bold blue]Lets set your configs for Cookietemple and you are ready to go!\n')
-            ConfigCommand.all_settings()
-
-        # switch case statement to prompt the user to fetch template specific configurations
-        switcher: Dict[str, Any] = {
-            'latex': self.common_latex_options,
-        }
-        switcher.get(self.pub_struct.language.lower(), lambda: 'Invalid language!')(dot_cookietemple)  # type: ignore
+        with span('create.prompt'):
+            # latex is default language
+
+            self.pub_struct.pubtype = cookietemple_questionary_or_dot_cookietemple(function='select',
+                                                                                   question='Choose between the following publication types',
+                                                                                   choices=['thesis'],
+                                                                                   dot_cookietemple=dot_cookietemple,
+                                                                                   to_get_property='pubtype')
+
+            if not dot_cookietemple and not os.path.exists(ConfigCommand.CONF_FILE_PATH):
+                print('[bold red]Cannot find a Cookietemple config file! Is this your first time with Cookietemple?\n')
+                print('[bold blue]Lets set your configs for Cookietemple and you are ready to go!\n')
+                ConfigCommand.all_settings()
+
+            # switch case statement to prompt the user to fetch template specific configurations
+            switcher: Dict[str, Any] = {
+                'latex': self.common_latex_options,
+            }
+            switcher.get(self.pub_struct.language.lower(), lambda: 'Invalid language!')(dot_cookietemple)  # type: ignore
 
-        self.handle_pub_type(dot_cookietemple)
+            self.handle_pub_type(dot_cookietemple)
 
-        self.pub_struct.is_github_repo, self.pub_struct.is_repo_private, self.pub_struct.is_github_orga, self.pub_struct.github_orga \
-            = prompt_github_repo(dot_cookietemple)
+            self.pub_struct.is_github_repo, self.pub_struct.is_repo_private, self.pub_struct.is_github_orga, self.pub_struct.github_orga \
+                = prompt_github_repo(dot_cookietemple)
 
-        if self.pub_struct.is_github_orga:
-            self.pub_struct.github_username = self.pub_struct.github_orga
+            if self.pub_struct.is_github_orga:
+                self.pub_struct.github_username = self.pub_struct.github_orga
         # create the pub template
         super().create_template_with_subdomain(self.TEMPLATES_PUB_PATH, self.pub_struct.pubtype)  # type: ignore
 
@@ -136,4 +137,5 @@ class PubCreator(TemplateCreator):
                                                                                   default='Department of Nuclear Physics',
                                                                                   dot_cookietemple=dot_cookietemple,
                                                                                   to_get_property='department')
-        self.pub_struct.github_username = load_github_username()  # Required for Github support
+        # Required for Github support
+        self.pub_struct.github_username = dot_cookietemple['github_username'] if dot_cookietemple else load_github_username()
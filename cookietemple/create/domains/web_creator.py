@@ -1,17 +1,41 @@
 import os
 from pathlib import Path
 from dataclasses import dataclass
-from distutils.dir_util import copy_tree
-from shutil import copy
 from typing import Optional, Any, Dict
 from rich import print
 
+from cookietemple.create.render_engine import RenderPlan, RenderRule
 from cookietemple.create.template_creator import TemplateCreator
 from cookietemple.custom_cli.questionary import cookietemple_questionary_or_dot_cookietemple
-from cookietemple.util.dir_util import delete_dir_tree
 from cookietemple.create.domains.cookietemple_template_struct import CookietempleTemplateStruct
 from cookietemple.create.github_support import prompt_github_repo
 from cookietemple.common.version import load_ct_template_version
+from cookietemple.common.profiling import span
+
+# the package of the Flask website relative to the project directory
+FLASK_PACKAGE = '{{ cookiecutter.project_slug_no_hyphen }}'
+
+FLASK_RENDER_PLAN = RenderPlan([
+    # the basic setup has neither database, mail, translation nor login support
+    RenderRule(when={'setup_type': 'basic'},
+               exclude=['babel.cfg', f'{FLASK_PACKAGE}/translations', f'{FLASK_PACKAGE}/auth', f'{FLASK_PACKAGE}/main', f'{FLASK_PACKAGE}/models',
+                        f'{FLASK_PACKAGE}/services', f'{FLASK_PACKAGE}/templates/auth', f'{FLASK_PACKAGE}/templates/index.html',
+                        f'{FLASK_PACKAGE}/templates/base.html', f'{FLASK_PACKAGE}/static/mail_stub.conf']),
+    # the basic index using a full featured frontend template or the minimal one
+    RenderRule(when={'setup_type': 'basic', 'frontend': ('', 'none')}, exclude=[f'{FLASK_PACKAGE}/templates/basic_index_f.html']),
+    RenderRule(when={'setup_type': 'basic'}, unless={'frontend': ('', 'none')}, exclude=[f'{FLASK_PACKAGE}/templates/basic_index.html']),
+    RenderRule(when={'setup_type': 'advanced'},
+               exclude=[f'{FLASK_PACKAGE}/basic', f'{FLASK_PACKAGE}/templates/basic_index.html', f'{FLASK_PACKAGE}/templates/basic_index_f.html']),
+    # the chosen frontend template is added to the static files and templates of the website
+    RenderRule(unless={'frontend': ('', 'none')}, move={'frontend_templates/{{ cookiecutter.frontend }}/assets': f'{FLASK_PACKAGE}/static/assets',
+                                                        'frontend_templates/{{ cookiecutter.frontend }}/index.html': f'{FLASK_PACKAGE}/templates/index.html'}),
+    RenderRule(exclude=['frontend_templates'])
+])
+
+# render plans of all web frameworks by their name
+WEB_RENDER_PLANS = {
+    'flask': FLASK_RENDER_PLAN
+}
 
 
 @dataclass
@@ -45,9 +69,9 @@ class TemplateStructWeb(CookietempleTemplateStruct):
 
 class WebCreator(TemplateCreator):
 
-    def __init__(self):
+    def __init__(self, output_root: Optional[Path] = None):
         self.web_struct = TemplateStructWeb(domain='web')
-        super().__init__(self.web_struct)
+        super().__init__(self.web_struct, output_root)
         self.WD_Path = Path(os.path.dirname(__file__))
         self.TEMPLATES_WEB_PATH = f'{self.WD_Path.parent}/templates/web'
 
@@ -58,39 +82,40 @@ class WebCreator(TemplateCreator):
         """
         Handles the Web domain. Prompts the user for the language, general and domain specific options.
         """
-        self.web_struct.language = cookietemple_questionary_or_dot_cookietemple(function='select',
-                                                                                question='Choose between the following languages',
-                                                                                choices=['python'],
-                                                                                default='python',
-                                                                                dot_cookietemple=dot_cookietemple,
-                                                                                to_get_property='language')
-
-        # prompt the user to fetch general template configurations
-        super().prompt_general_template_configuration(dot_cookietemple)
-
-        # switch case statement to prompt the user to fetch template specific configurations
-        switcher: Dict[str, Any] = {
-            'python': self.web_python_options,
-        }
-        switcher.get(self.web_struct.language)(dot_cookietemple)  # type: ignore
-        # call handle function for specified language
-        self.__getattribute__(f'handle_web_project_type_{self.web_struct.language}')(dot_cookietemple)
-        # call handle function for specified webtype according to the chosen language
-        self.__getattribute__(f'handle_{self.web_struct.webtype.lower()}_{self.web_struct.language}')(dot_cookietemple)
-        # call option function for specified framework (if any)
-        framework = self.web_struct.web_framework.lower()
-        if framework:
-            self.__getattribute__(f'{self.web_struct.webtype.lower()}_{framework}_options')(dot_cookietemple)
-
-        self.web_struct.is_github_repo, self.web_struct.is_repo_private, self.web_struct.is_github_orga, self.web_struct.github_orga = \
-            prompt_github_repo(dot_cookietemple)
-        # if repo owner is a github orga, update username
-        if self.web_struct.is_github_orga:
-            self.web_struct.github_username = self.web_struct.github_orga
+        with span('create.prompt'):
+            self.web_struct.language = cookietemple_questionary_or_dot_cookietemple(function='select',
+                                                                                    question='Choose between the following languages',
+                                                                                    choices=['python'],
+                                                                                    default='python',
+                                                                                    dot_cookietemple=dot_cookietemple,
+                                                                                    to_get_property='language')
+
+            # prompt the user to fetch general template configurations
+            super().prompt_general_template_configuration(dot_cookietemple)
+
+            # switch case statement to prompt the user to fetch template specific configurations
+            switcher: Dict[str, Any] = {
+                'python': self.web_python_options,
+            }
+            switcher.get(self.web_struct.language)(dot_cookietemple)  # type: ignore
+            # call handle function for specified language
+            self.__getattribute__(f'handle_web_project_type_{self.web_struct.language}')(dot_cookietemple)
+            # call handle function for specified webtype according to the chosen language
+            self.__getattribute__(f'handle_{self.web_struct.webtype.lower()}_{self.web_struct.language}')(dot_cookietemple)
+            # call option function for specified framework (if any)
+            framework = self.web_struct.web_framework.lower()
+            if framework:
+                self.__getattribute__(f'{self.web_struct.webtype.lower()}_{framework}_options')(dot_cookietemple)
+
+            self.web_struct.is_github_repo, self.web_struct.is_repo_private, self.web_struct.is_github_orga, self.web_struct.github_orga = \
+                prompt_github_repo(dot_cookietemple)
+            # if repo owner is a github orga, update username
+            if self.web_struct.is_github_orga:
+                self.web_struct.github_username = self.web_struct.github_orga
+        # only render the files of the chosen setup type and frontend template
+        self.render_plan = WEB_RENDER_PLANS.get(framework)
         # create the project (TODO COOKIETEMPLE: As for now (only Flask) this works. Might need to change this in future.
         super().create_template_with_subdomain_framework(self.TEMPLATES_WEB_PATH, self.web_struct.webtype, self.web_struct.web_framework.lower())
-        # clean project for advanced or basic setup
-        self.basic_or_advanced_files_with_frontend(self.web_struct.setup_type, self.web_struct.frontend.lower())
 
         # switch case statement to fetch the template version
         switcher_version = {
@@ -173,63 +198,6 @@ class WebCreator(TemplateCreator):
                                                                                   dot_cookietemple=dot_cookietemple,
                                                                                   to_get_property='vmusername')
 
-    def basic_or_advanced_files_with_frontend(self, setup_type: str, template_name: str) -> None:
-        """
-        Remove the dir/files that do not belong in a basic/advanced template and add a full featured frontend template
-        if the user wants so.
-
-        :param setup_type: Shows whether the user sets up a basic or advanced website setup
-        :param template_name: the name of the frontend template (if any)
-        """
-        cwd = os.getcwd()
-        os.chdir(f'{cwd}/{self.web_struct.project_slug_no_hyphen}/{self.web_struct.project_slug_no_hyphen}')
-
-        # remove all stuff, that is not necessary for the basic setup
-        if setup_type == 'basic':
-            delete_dir_tree(Path('translations'))
-            delete_dir_tree(Path('auth'))
-            delete_dir_tree(Path('main'))
-            delete_dir_tree(Path('models'))
-            delete_dir_tree(Path('services'))
-            delete_dir_tree(Path('templates/auth'))
-            os.remove('templates/index.html')
-            os.remove('templates/base.html')
-            os.remove('static/mail_stub.conf')
-            os.remove('../babel.cfg')
-
-            # the user wants only minimal frontend, so remove the index html file for this
-            if not template_name or template_name == 'none':
-                os.remove('templates/basic_index_f.html')
-
-        # remove basic stuff in advanced setup
-        elif setup_type == 'advanced':
-            delete_dir_tree(Path('basic'))
-
-        # the user wants to init its project with a full frontend
-        if template_name and template_name != 'none':
-            copy_tree(f'../frontend_templates/{template_name}/assets', 'static/assets')
-            copy(f'../frontend_templates/{template_name}/index.html', 'templates')
-
-            # remove unnecessary files for basic frontend setup
-            if setup_type == 'basic':
-                os.remove('templates/basic_index.html')
-                os.remove('templates/index.html')
-            # remove unnecessary files for advanced frontend setup
-            else:
-                os.remove('templates/basic_index_f.html')
-                os.remove('templates/basic_index.html')
-
-        else:
-            # remove basic html files if advanced setup
-            if setup_type == 'advanced':
-                os.remove('templates/basic_index.html')
-                os.remove('templates/basic_index_f.html')
-
-        # remove all frontend stuff
-        delete_dir_tree(Path('../frontend_templates'))
-
-        os.chdir(cwd)
-
     def web_python_options(self, dot_cookietemple: Optional[dict]):
         """ Prompts for web-python specific options and saves them into the CookietempleTemplateStruct """
         self.web_struct.command_line_interface = cookietemple_questionary_or_dot_cookietemple(function='select',
@@ -0,0 +1,108 @@
+import hashlib
+import json
+import logging
+import os
+import time
+from typing import Optional
+
+import appdirs  # type: ignore
+import requests
+
+from cookietemple.common.atomic_file import write_json_atomically
+from cookietemple.config.config import ConfigCommand
+
+log = logging.getLogger(__name__)
+
+# URLs, which exist if a project name is already taken at a host; configurable by the settings below, e.g. to use a local stub
+DEFAULT_LOOKUP_URLS = {'PyPi': 'https://pypi.org/project/{name}', 'readthedocs.io': 'https://{name}.readthedocs.io'}
+LOOKUP_URL_SETTINGS = {'PyPi': 'pypi_lookup_url', 'readthedocs.io': 'readthedocs_lookup_url'}
+# directory holding one cached lookup per URL
+NAME_LOOKUP_CACHE_DIR = os.path.join(appdirs.user_cache_dir(appname='cookietemple'), 'names')
+# seconds a cached lookup is used without asking the host again
+NAME_LOOKUP_TTL = 3600
+# seconds to wait for a host to connect and to answer
+NAME_LOOKUP_TIMEOUT = 3
+
+
+def lookup_url(host: str, project_name: str) -> str:
+    """
+    The URL, which exists if the project name is already taken at the host.
+
+    :param host: The host (either PyPi or readthedocs.io)
+    :param project_name: Name of the project
+    :return: The URL
+    """
+    url_template = ConfigCommand.load_setting(LOOKUP_URL_SETTINGS[host], DEFAULT_LOOKUP_URLS[host])
+
+    return str(url_template).format(name=project_name.replace(' ', ''))
+
+
+def is_name_taken(host: str, project_name: str) -> Optional[bool]:
+    """
+    Check whether a project name is already taken at a host. The name is taken, if the host answers 200, and free, if it answers 404.
+    Only these answers are cached for NAME_LOOKUP_TTL seconds; any other answer (like a rate limit or a server error) tells nothing about the name.
+
+    :param host: The host (either PyPi or readthedocs.io)
+    :param project_name: Name of the project
+    :return: Whether the name is taken or None, if the host could not be contacted in time or did not answer 200 or 404
+    """
+    url = lookup_url(host, project_name)
+    cached = load_cached_lookup(url)
+    if cached is not None:
+        log.debug(f'Using cached lookup of {url}')
+        return cached
+    log.debug(f'Looking up {url}')
+    try:
+        status_code = requests.get(url, timeout=NAME_LOOKUP_TIMEOUT).status_code
+    except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+        log.debug(f'Unable to contact {host}')
+        log.debug(f'Error was: {e}')
+        return None
+    if status_code not in (200, 404):
+        log.debug(f'Unable to look up {url}: {host} answered {status_code}')
+        return None
+    taken = status_code == 200
+    store_cached_lookup(url, taken)
+
+    return taken
+
+
+def cache_path(url: str) -> str:
+    """
+    Path of the cached lookup of a URL.
+
+    :param url: The looked up URL
+    :return: Path to the cache file
+    """
+    return os.path.join(NAME_LOOKUP_CACHE_DIR, f'{hashlib.sha256(url.encode("utf-8")).hexdigest()[:32]}.json')
+
+
+def load_cached_lookup(url: str) -> Optional[bool]:
+    """
+    Load the cached lookup of a URL, if it is younger than the TTL.
+
+    :param url: The looked up URL
+    :return: Whether the name is taken or None, if there is no recent lookup
+    """
+    try:
+        with open(cache_path(url)) as f:
+            cached = json.load(f)
+        if cached['url'] == url and time.time() - cached['checked_at'] < NAME_LOOKUP_TTL:
+            return bool(cached['taken'])
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+
+    return None
+
+
+def store_cached_lookup(url: str, taken: bool) -> None:
+    """
+    Cache the lookup of a URL.
+
+    :param url: The looked up URL
+    :param taken: Whether the name is taken
+    """
+    try:
+        write_json_atomically({'url': url, 'checked_at': time.time(), 'taken': taken}, cache_path(url))
+    except OSError as e:
+        log.debug(f'Unable to cache the lookup of {url}: {e}')
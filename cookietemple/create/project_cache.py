@@ -0,0 +1,239 @@
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+import appdirs  # type: ignore
+import arrow
+
+import cookietemple
+from cookietemple.common.atomic_file import write_json_atomically
+from cookietemple.config.config import ConfigCommand
+from cookietemple.create.render_engine import RenderEngine, StagedTree
+from cookietemple.util.dir_util import copy_dir_tree
+
+log = logging.getLogger(__name__)
+
+# directory holding all rendered projects, one directory and one metadata file per key
+PROJECT_CACHE_DIR = os.path.join(appdirs.user_cache_dir(appname='cookietemple'), 'projects')
+# default of the project_cache_size setting; megabytes all rendered projects may take up together
+DEFAULT_PROJECT_CACHE_SIZE = 256
+# seconds after which leftovers of interrupted stores are removed
+STALE_STORE_AGE = 3600
+# the templates render the current date (by {% now 'local' %}, which reads the clock of arrow like below),
+# hence rendered projects are only reused on the day they were rendered
+RENDER_DATE_FORMAT = '%Y-%m-%d'
+
+
+class ProjectCache:
+    """
+    Persistent, content-addressed cache of rendered projects, which is shared by all cookietemple processes.
+    Every rendered project is keyed by its template handle, template version, the cookietemple version, the date it is rendered on
+    and a canonical hash of its context.
+    The context hash covers the contexts of all staged files (the answers merged into the cookiecutter.json), all in-memory contents and
+    the modification times of the templated files, so that editing a template without bumping its version never serves a stale project.
+    The least recently used projects are evicted, once all projects take up more than the size limit.
+
+    :attribute cache_dir: Directory holding all rendered projects
+    :attribute max_size: Bytes all rendered projects may take up together
+    """
+
+    def __init__(self, cache_dir: str = PROJECT_CACHE_DIR, max_size: int = DEFAULT_PROJECT_CACHE_SIZE * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+
+    @classmethod
+    def from_config(cls) -> Optional['ProjectCache']:
+        """
+        Create the cache with the size limit of the project_cache_size setting (in megabytes).
+
+        :return: The cache or None, if it is disabled by a size limit of 0
+        """
+        try:
+            max_size = float(ConfigCommand.load_setting('project_cache_size', DEFAULT_PROJECT_CACHE_SIZE))
+        except (TypeError, ValueError):
+            log.debug('Invalid project_cache_size setting. Using the default size limit.')
+            max_size = DEFAULT_PROJECT_CACHE_SIZE
+        if max_size <= 0:
+            return None
+
+        return cls(PROJECT_CACHE_DIR, int(max_size * 1024 * 1024))
+
+    @staticmethod
+    def key(tree: StagedTree, handle: str, template_version: str) -> str:
+        """
+        Build the key of a rendered project.
+
+        :param tree: The staged project
+        :param handle: The handle of the project's template
+        :param template_version: The version of the project's template
+        :return: The key
+        """
+        render_date = arrow.now('local').strftime(RENDER_DATE_FORMAT)
+        key = f'{handle}\0{template_version}\0{cookietemple.__version__}\0{render_date}\0{ProjectCache.context_hash(tree)}'
+
+        return hashlib.sha256(key.encode('utf-8')).hexdigest()[:32]
+
+    @staticmethod
+    def context_hash(tree: StagedTree) -> str:
+        """
+        Hash everything a staged project is rendered from in a canonical form, which does not depend on the order of any dictionary.
+
+        :param tree: The staged project
+        :return: The hash
+        """
+        # files of the same template share their context; every distinct context is hashed once
+        contexts: Dict[int, int] = {}
+        canonical_contexts: List[str] = []
+        files: List[Tuple] = []
+        for path, staged_file in sorted(tree.files.items()):
+            if staged_file.context is not None and id(staged_file.context) not in contexts:
+                contexts[id(staged_file.context)] = len(canonical_contexts)
+                canonical_contexts.append(json.dumps(staged_file.context, sort_keys=True, separators=(',', ':'), default=str))
+            source: Tuple = ()
+            if staged_file.infile is not None:
+                stat = os.stat(staged_file.infile)
+                source = (staged_file.infile, stat.st_mtime_ns, stat.st_size)
+            content = hashlib.sha256(staged_file.content.encode('utf-8')).hexdigest() if staged_file.content is not None else None
+            files.append((path, source, contexts.get(id(staged_file.context)), staged_file.copy_only, content,
+                          [f'{transform.__module__}.{transform.__qualname__}' for transform in staged_file.transforms]))
+        canonical = json.dumps({'name': tree.name, 'dirs': sorted(tree.dirs), 'contexts': canonical_contexts, 'files': files}, separators=(',', ':'))
+
+        return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+    def entry_path(self, key: str) -> str:
+        """
+        Path of the directory holding the rendered project of a key.
+
+        :param key: The key
+        :return: Path to the directory
+        """
+        return os.path.join(self.cache_dir, key)
+
+    def materialize(self, tree: StagedTree, key: str, output_dir: str, jobs: int = 1) -> str:
+        """
+        Write a staged project into the output directory like the render engine, but copy it from the cache, if it was rendered before.
+        Projects, which are not cached yet, are rendered and then stored.
+
+        :param tree: The staged project
+        :param key: The key of the project
+        :param output_dir: Directory the project should be created in
+        :param jobs: Number of files that are rendered and written concurrently
+        :return: Path to the created project
+        """
+        project_dir = self.load(key, tree.name, output_dir)
+        if project_dir is not None:
+            return project_dir
+        project_dir = RenderEngine.get().materialize(tree, output_dir=output_dir, jobs=jobs)
+        self.store(key, project_dir)
+
+        return project_dir
+
+    def load(self, key: str, name: str, output_dir: str) -> Optional[str]:
+        """
+        Copy a cached project into the output directory and mark it as recently used.
+
+        :param key: The key of the project
+        :param name: Name of the project directory
+        :param output_dir: Directory the project should be created in
+        :return: Path to the created project or None, if the project is not cached
+        """
+        metadata_path = f'{self.entry_path(key)}.json'
+        if not os.path.isfile(metadata_path):
+            return None
+        try:
+            project_dir = RenderEngine.get().copy_project(self.entry_path(key), name, output_dir)
+            os.utime(metadata_path)
+        except OSError as e:
+            # the project was evicted by another process while it was copied
+            log.debug(f'Unable to use the cached project {key}: {e}')
+            return None
+        log.debug(f'Using the cached project {key}.')
+
+        return project_dir
+
+    def store(self, key: str, project_dir: str) -> None:
+        """
+        Store a rendered project and evict the least recently used projects, if the size limit is exceeded.
+        The project is copied next to its entry first and renamed afterwards; its metadata file, which marks the entry as complete, is written last.
+
+        :param key: The key of the project
+        :param project_dir: The top level directory of the rendered project
+        """
+        entry_path = self.entry_path(key)
+        tmp_path = f'{entry_path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            copy_dir_tree(project_dir, tmp_path, symlinks=True)
+            size = directory_size(tmp_path)
+            try:
+                os.rename(tmp_path, entry_path)
+            except OSError:
+                # another process stored the same project in the meantime
+                shutil.rmtree(tmp_path, ignore_errors=True)
+                return
+            write_json_atomically({'key': key, 'name': os.path.basename(project_dir), 'size': size, 'cookietemple_version': cookietemple.__version__},
+                                  f'{entry_path}.json')
+            log.debug(f'Stored the rendered project {key} ({size} bytes).')
+        except OSError as e:
+            log.debug(f'Unable to store the rendered project {key}: {e}')
+            shutil.rmtree(tmp_path, ignore_errors=True)
+            return
+        self.evict()
+
+    def evict(self) -> None:
+        """
+        Remove the least recently used projects, until all projects fit into the size limit, and the leftovers of interrupted stores.
+        """
+        entries = []
+        try:
+            names = os.listdir(self.cache_dir)
+        except OSError:
+            return
+        for name in names:
+            path = os.path.join(self.cache_dir, name)
+            try:
+                if name.endswith('.tmp'):
+                    if time.time() - os.path.getmtime(path) > STALE_STORE_AGE:
+                        remove_path(path)
+                elif name.endswith('.json'):
+                    with open(path) as f:
+                        entries.append((os.path.getmtime(path), int(json.load(f)['size']), path[:-len('.json')]))
+            except (OSError, ValueError, KeyError, TypeError):
+                continue
+
+        total_size = sum(size for _, size, _ in entries)
+        for _, size, entry_path in sorted(entries):
+            if total_size <= self.max_size:
+                break
+            log.debug(f'Evicting the rendered project {os.path.basename(entry_path)}.')
+            # without its metadata file an entry is never used again, even if removing its directory fails
+            remove_path(f'{entry_path}.json')
+            remove_path(entry_path)
+            total_size -= size
+
+
+def directory_size(directory: str) -> int:
+    """
+    Sum up the sizes of all files of a directory (symlinks are not followed).
+
+    :param directory: The directory
+    :return: The size in bytes
+    """
+    return sum(os.lstat(os.path.join(root, name)).st_size for root, _, names in os.walk(directory) for name in names)
+
+
+def remove_path(path: str) -> None:
+    """
+    Remove a file or a directory, if it exists.
+
+    :param path: Path to the file or directory
+    """
+    if os.path.isdir(path) and not os.path.islink(path):
+        shutil.rmtree(path, ignore_errors=True)
+    elif os.path.lexists(path):
+        os.remove(path)
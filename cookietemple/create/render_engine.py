@@ -0,0 +1,544 @@
+import copy
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from fnmatch import fnmatch
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import appdirs  # type: ignore
+from binaryornot.check import is_binary  # type: ignore
+from cookiecutter.environment import StrictEnvironment  # type: ignore
+from cookiecutter.exceptions import NonTemplatedInputDirException, OutputDirExistsException, UndefinedVariableInTemplate  # type: ignore
+from cookiecutter.generate import apply_overwrites_to_context, is_copy_only_path  # type: ignore
+from cookiecutter.prompt import prompt_for_config  # type: ignore
+from jinja2 import BaseLoader, FileSystemBytecodeCache, Template, TemplateNotFound, UndefinedError
+
+from cookietemple.util.dir_util import copy_dir_tree, copy_file
+
+log = logging.getLogger(__name__)
+
+# directory of the persistent Jinja2 bytecode cache, which is shared by all cookietemple processes
+TEMPLATE_BYTECODE_CACHE_DIR = os.path.join(appdirs.user_cache_dir(appname='cookietemple'), 'jinja')
+
+
+class TemplateFileLoader(BaseLoader):
+    """
+    Loads templates by their absolute path, so that a single environment can render files of all templates.
+    """
+
+    def get_source(self, environment, template: str) -> Tuple[str, str, Any]:
+        try:
+            mtime = os.path.getmtime(template)
+            with open(template, encoding='utf-8') as f:
+                source = f.read()
+        except OSError as e:
+            raise TemplateNotFound(template) from e
+
+        def uptodate() -> bool:
+            try:
+                return os.path.getmtime(template) == mtime
+            except OSError:
+                return False
+
+        return source, template, uptodate
+
+
+@dataclass
+class RenderRule:
+    """
+    A rule of a render plan. It applies, if all values of when and none of the values of unless match the context of the template.
+    A value matches, if it equals the value of the context or, if it is a list or tuple, contains it.
+    All paths are relative to the project directory and may contain Jinja syntax (like {{ cookiecutter.project_slug }}), which is rendered first.
+    """
+    when: Dict[str, Any] = field(default_factory=dict)  # context values all of which must match
+    unless: Dict[str, Any] = field(default_factory=dict)  # context values none of which may match
+    exclude: List[str] = field(default_factory=list)  # glob patterns of files and directories, which are neither rendered nor written
+    move: Dict[str, str] = field(default_factory=dict)  # files and directories, which are written to another path instead
+
+    def applies(self, context: dict) -> bool:
+        """
+        Check whether the rule applies to the context of a template.
+
+        :param context: The context of the template
+        :return: Whether the rule applies
+        """
+        def matches(key: str, value: Any) -> bool:
+            actual = context['cookiecutter'].get(key)
+            return actual in value if isinstance(value, (list, tuple)) else actual == value
+
+        return all(matches(key, value) for key, value in self.when.items()) and not any(matches(key, value) for key, value in self.unless.items())
+
+
+class RenderPlan:
+    """
+    Declarative plan of which files of a template are rendered and where they are written to, depending on the context of the template.
+    Since the plan is evaluated before anything is rendered, excluded files are never rendered or written.
+    Exclusions apply to the final path of a file, so that moved files can be excluded as well. A moved file replaces a file of the template,
+    which would be written to the same path.
+    """
+
+    def __init__(self, rules: List[RenderRule]):
+        self.rules = rules
+
+    def resolve(self, context: dict, render_path: Callable[[str, dict], str]) -> 'PlannedPaths':
+        """
+        Evaluate all rules against the context of a template.
+
+        :param context: The context of the template
+        :param render_path: Function rendering a (templated) path with a context
+        :return: The rendered exclusions and moves of all rules, which apply
+        """
+        exclude: List[str] = []
+        move: List[Tuple[str, str]] = []
+        for rule in self.rules:
+            if rule.applies(context):
+                exclude.extend(os.path.normpath(render_path(pattern, context)) for pattern in rule.exclude)
+                move.extend((os.path.normpath(render_path(source, context)), os.path.normpath(render_path(destination, context)))
+                            for source, destination in rule.move.items())
+
+        return PlannedPaths(exclude, move)
+
+
+class PlannedPaths:
+    """
+    The rendered exclusions and moves of a render plan for a single context.
+    """
+
+    def __init__(self, exclude: List[str], move: List[Tuple[str, str]]):
+        self.exclude = exclude
+        self.move = move
+
+    def destination(self, path: str) -> Optional[Tuple[str, bool]]:
+        """
+        Get the path a file or directory is written to.
+
+        :param path: The rendered path relative to the project directory
+        :return: The path the file is written to and whether it was moved or None, if it is excluded
+        """
+        path = os.path.normpath(path)
+        moved = False
+        for source, destination in self.move:
+            if path == source or path.startswith(source + os.sep):
+                path, moved = destination + path[len(source):], True
+                break
+        if self.is_excluded(path):
+            return None
+
+        return path, moved
+
+    def is_excluded(self, path: str) -> bool:
+        """
+        Check whether a path or any of its parent directories is excluded.
+
+        :param path: The normalized path relative to the project directory
+        :return: Whether the path is excluded
+        """
+        parts = path.split(os.sep)
+        return any(fnmatch(os.sep.join(parts[:end]), pattern) for pattern in self.exclude for end in range(1, len(parts) + 1))
+
+    def is_move_source_below(self, directory: str) -> bool:
+        """
+        Check whether any file or directory inside a directory is moved.
+
+        :param directory: The normalized path of the directory relative to the project directory
+        :return: Whether anything inside the directory is moved
+        """
+        return any(source.startswith(directory + os.sep) for source, _ in self.move)
+
+
+@dataclass
+class StagedFile:
+    """
+    A file of a staged tree, which is either rendered from (or copied) a templated file or written from an in-memory content.
+    """
+    infile: Optional[str]  # path to the templated file; None for in-memory contents
+    relative_file: str  # path of the templated file relative to the templated project directory (or the staged path for in-memory contents)
+    context: Optional[dict]  # the context the templated file is rendered with
+    copy_only: bool = False  # whether the file is copied without rendering (_copy_without_render)
+    content: Optional[str] = None  # in-memory content of the file
+    transforms: List[Callable[[str], str]] = field(default_factory=list)  # functions applied to the content before it is written
+
+
+class StagedTree:
+    """
+    Virtual tree of a project, which is created from one or several templates and in-memory contents.
+    Nothing is rendered or written until the tree is materialized by the render engine, which writes every file exactly once.
+
+    :attribute name: Name of the project directory
+    :attribute dirs: All directories relative to the project directory (as ordered set)
+    :attribute files: All files by their path relative to the project directory
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.dirs: Dict[str, None] = {}
+        self.files: Dict[str, StagedFile] = {}
+
+    def add_content(self, path: str, content: str) -> None:
+        """
+        Stage a file with an in-memory content. A file already staged at this path is replaced.
+
+        :param path: Path of the file relative to the project directory
+        :param content: Content of the file
+        """
+        path = os.path.normpath(path)
+        parent = os.path.dirname(path)
+        while parent:
+            self.dirs.setdefault(parent, None)
+            parent = os.path.dirname(parent)
+        self.files[path] = StagedFile(None, path, None, content=content)
+
+    def transform(self, path: str, transform: Callable[[str], str]) -> bool:
+        """
+        Register a function, which modifies the content of a staged file before it is written.
+
+        :param path: Path of the file relative to the project directory
+        :param transform: Function returning the modified content
+        :return: Whether the file is staged
+        """
+        staged_file = self.files.get(os.path.normpath(path))
+        if staged_file is None:
+            return False
+        staged_file.transforms.append(transform)
+
+        return True
+
+
+class RenderEngine:
+    """
+    cookietemple's own implementation of cookiecutter's project generation.
+    All templates are rendered by a single Jinja2 environment, which is shared by the whole process and persists the bytecode of compiled
+    templates in the user cache directory. Hence, repeated creates neither parse the cookiecutter.json again nor compile any template file again.
+    Contexts, path templating, _copy_without_render, newline handling and file permissions behave exactly like cookiecutter's (no hooks and replays).
+    Templates are first staged into a virtual tree, which is then written at once and atomically renamed to the project directory.
+
+    :attribute env: The Jinja2 environment rendering all templates
+    """
+    _engine: Optional['RenderEngine'] = None
+    _engine_lock = threading.Lock()
+
+    def __init__(self, bytecode_cache_dir: Optional[str] = TEMPLATE_BYTECODE_CACHE_DIR):
+        bytecode_cache = None
+        if bytecode_cache_dir is not None:
+            try:
+                os.makedirs(bytecode_cache_dir, exist_ok=True)
+                bytecode_cache = FileSystemBytecodeCache(bytecode_cache_dir)
+            except OSError as e:
+                log.debug(f'Unable to use the template bytecode cache at {bytecode_cache_dir}: {e}')
+        self.env = StrictEnvironment(context={}, keep_trailing_newline=True, loader=TemplateFileLoader(), bytecode_cache=bytecode_cache,
+                                     cache_size=1000)
+        self.cookiecutter_jsons: Dict[str, Tuple[float, dict]] = {}
+        self.path_templates: Dict[str, Template] = {}
+        self.lock = threading.Lock()
+
+    @classmethod
+    def get(cls) -> 'RenderEngine':
+        """
+        Get the render engine shared by the whole process.
+
+        :return: The render engine
+        """
+        with cls._engine_lock:
+            if cls._engine is None:
+                cls._engine = cls()
+
+        return cls._engine
+
+    def render_template(self, template_dir: str, output_dir: str = '.', extra_context: Optional[dict] = None, overwrite_if_exists: bool = True,
+                        jobs: int = 1, plan: Optional[RenderPlan] = None) -> str:
+        """
+        Render a cookiecutter template into the output directory without any prompts.
+
+        :param template_dir: Path to the template (the directory containing the cookiecutter.json)
+        :param output_dir: Directory the project should be created in
+        :param extra_context: Values overriding the defaults of the cookiecutter.json
+        :param overwrite_if_exists: Whether an already existing project directory may be replaced
+        :param jobs: Number of files that are rendered and written concurrently
+        :param plan: Render plan selecting the files to render and their destinations; all files are rendered to their own path if None
+        :return: Path to the created project
+        """
+        return self.materialize(self.stage_template(template_dir, extra_context, plan), output_dir, jobs, overwrite_if_exists)
+
+    def template_context(self, template_dir: str, extra_context: dict) -> dict:
+        """
+        Build the context of a template exactly like cookiecutter does when called with no_input.
+
+        :param template_dir: Path to the template
+        :param extra_context: Values overriding the defaults of the cookiecutter.json
+        :return: The context to render the template with
+        """
+        context = {'cookiecutter': copy.deepcopy(self.load_cookiecutter_json(template_dir))}
+        apply_overwrites_to_context(context['cookiecutter'], extra_context)
+        with self.lock:
+            for extension in context['cookiecutter'].get('_extensions', []):
+                if extension not in self.env.extensions:
+                    self.env.add_extension(extension)
+        context['cookiecutter'] = prompt_for_config(context, no_input=True)
+        context['cookiecutter']['_template'] = template_dir
+
+        return context
+
+    def load_cookiecutter_json(self, template_dir: str) -> dict:
+        """
+        Load the cookiecutter.json of a template. The parsed file is memoized until it is modified.
+
+        :param template_dir: Path to the template
+        :return: The parsed cookiecutter.json (must not be modified)
+        """
+        context_file = os.path.join(template_dir, 'cookiecutter.json')
+        mtime = os.path.getmtime(context_file)
+        with self.lock:
+            memoized = self.cookiecutter_jsons.get(context_file)
+        if memoized is not None and memoized[0] == mtime:
+            return memoized[1]
+        with open(context_file, encoding='utf-8') as f:
+            cookiecutter_json = json.load(f)
+        with self.lock:
+            self.cookiecutter_jsons[context_file] = (mtime, cookiecutter_json)
+
+        return cookiecutter_json
+
+    def render_path(self, path: str, context: dict) -> str:
+        """
+        Render a templated file or directory name. Compiled names are memoized, names without any Jinja syntax are returned unchanged.
+
+        :param path: The (relative) path to render
+        :param context: The context of the template
+        :return: The rendered path
+        """
+        if '{' not in path:
+            return path
+        with self.lock:
+            path_template = self.path_templates.get(path)
+        if path_template is None:
+            path_template = self.env.from_string(path)
+            with self.lock:
+                self.path_templates[path] = path_template
+
+        return path_template.render(**context)
+
+    def stage_template(self, template_dir: str, extra_context: Optional[dict] = None, plan: Optional[RenderPlan] = None,
+                       tree: Optional['StagedTree'] = None) -> 'StagedTree':
+        """
+        Stage all files of the templated project directory of a template without rendering or writing anything yet.
+        If a tree is passed, the files are merged into it (regardless of the name of the templates project directory) and replace already staged ones.
+
+        :param template_dir: Path to the template
+        :param extra_context: Values overriding the defaults of the cookiecutter.json
+        :param plan: Render plan selecting the files to render and their destinations; all files are rendered to their own path if None
+        :param tree: The tree to merge the files into; a new tree is created if None
+        :return: The tree containing the staged files
+        """
+        template_dir = os.path.abspath(template_dir)
+        context = self.template_context(template_dir, extra_context or {})
+        project_template_dir = RenderEngine.find_project_template(template_dir)
+        try:
+            project_name = self.render_path(os.path.basename(project_template_dir), context)
+            planned_paths = (plan or RenderPlan([])).resolve(context, self.render_path)
+        except UndefinedError as e:
+            raise UndefinedVariableInTemplate(f'Unable to create project directory \'{os.path.basename(project_template_dir)}\'', e, context) from e
+        if tree is None:
+            tree = StagedTree(project_name)
+        log.debug(f'Staging {template_dir} into {tree.name}.')
+
+        # files moved by the plan replace the files of the template with the same destination
+        moved_files = set()
+        # templated directories, which are copied without rendering (including their subdirectories), mapped to their destination
+        copy_only_dirs: Dict[str, str] = {}
+        for root, dirs, files in os.walk(project_template_dir):
+            relative_root = os.path.relpath(root, project_template_dir)
+            copied_root = copy_only_dirs.get(relative_root)
+            render_dirs = []
+            for d in sorted(dirs):
+                relative_dir = os.path.normpath(os.path.join(relative_root, d))
+                if copied_root is not None:
+                    copy_only_dirs[relative_dir] = os.path.join(copied_root, d)
+                    tree.dirs[copy_only_dirs[relative_dir]] = None
+                    render_dirs.append(d)
+                    continue
+                try:
+                    rendered_dir = os.path.normpath(self.render_path(relative_dir, context))
+                except UndefinedError as e:
+                    raise UndefinedVariableInTemplate(f'Unable to create directory \'{relative_dir}\'', e, context) from e
+                destination = planned_paths.destination(rendered_dir)
+                if destination is not None:
+                    tree.dirs[destination[0]] = None
+                    render_dirs.append(d)
+                    if is_copy_only_path(relative_dir, context):
+                        copy_only_dirs[relative_dir] = destination[0]
+                # excluded directories are only entered to pick up files, which are moved out of them
+                elif planned_paths.is_move_source_below(rendered_dir) and not is_copy_only_path(relative_dir, context):
+                    render_dirs.append(d)
+            # only descend into the directories that need to be rendered
+            dirs[:] = render_dirs
+            for f in sorted(files):
+                relative_file = os.path.normpath(os.path.join(relative_root, f))
+                if copied_root is not None:
+                    outfile, moved = os.path.join(copied_root, f), False
+                else:
+                    try:
+                        destination = planned_paths.destination(self.render_path(relative_file, context))
+                    except UndefinedError as e:
+                        raise UndefinedVariableInTemplate(f'Unable to create file \'{relative_file}\'', e, context) from e
+                    # templated file names, which render to an empty name, are skipped
+                    if destination is None or destination[0] == '.' or destination[0] in tree.dirs:
+                        continue
+                    outfile, moved = destination
+                if moved or outfile not in moved_files:
+                    tree.files[outfile] = StagedFile(os.path.join(root, f), relative_file, context,
+                                                     copy_only=copied_root is not None or is_copy_only_path(relative_file, context))
+                if moved:
+                    moved_files.add(outfile)
+
+        return tree
+
+    def materialize(self, tree: 'StagedTree', output_dir: str, jobs: int = 1, overwrite_if_exists: bool = True) -> str:
+        """
+        Write a staged tree into the output directory. The project is first written into a scratch directory next to its destination,
+        which is then atomically renamed to the project directory. An already existing project directory is replaced as a whole.
+        If anything fails, the scratch directory is removed again and an existing project directory is left untouched.
+
+        :param tree: The staged tree
+        :param output_dir: Directory the project should be created in
+        :param jobs: Number of files that are rendered and written concurrently
+        :param overwrite_if_exists: Whether an already existing project directory may be replaced
+        :return: Path to the created project
+        """
+        log.debug(f'Writing {tree.name} into {output_dir} using {jobs} job(s).')
+
+        return self.replace_project(tree.name, output_dir, lambda staged_project_dir: self.write_tree(tree, staged_project_dir, jobs),
+                                    overwrite_if_exists)
+
+    def copy_project(self, source_dir: str, name: str, output_dir: str, overwrite_if_exists: bool = True) -> str:
+        """
+        Copy an already rendered project into the output directory. It replaces an existing project directory exactly like a materialized tree.
+        Files are reflinked or copied by the kernel (see copy_file), so that large assets are copied fast.
+
+        :param source_dir: The top level directory of the rendered project
+        :param name: Name of the project directory
+        :param output_dir: Directory the project should be created in
+        :param overwrite_if_exists: Whether an already existing project directory may be replaced
+        :return: Path to the created project
+        """
+        log.debug(f'Copying {source_dir} into {output_dir}.')
+
+        return self.replace_project(name, output_dir, lambda staged_project_dir: copy_dir_tree(source_dir, staged_project_dir, symlinks=True),
+                                    overwrite_if_exists)
+
+    @staticmethod
+    def replace_project(name: str, output_dir: str, write: Callable[[str], Any], overwrite_if_exists: bool = True) -> str:
+        """
+        Write a project into a scratch directory next to its destination and atomically rename it to the project directory afterwards.
+
+        :param name: Name of the project directory
+        :param output_dir: Directory the project should be created in
+        :param write: Function writing the complete project into the (not yet existing) directory it is passed
+        :param overwrite_if_exists: Whether an already existing project directory may be replaced
+        :return: Path to the created project
+        """
+        output_dir = os.path.abspath(output_dir)
+        project_dir = os.path.join(output_dir, name)
+        if os.path.lexists(project_dir) and not overwrite_if_exists:
+            raise OutputDirExistsException(f'Error: "{project_dir}" directory already exists')
+        os.makedirs(output_dir, exist_ok=True)
+        scratch_dir = tempfile.mkdtemp(prefix=f'.{name}.', dir=output_dir)
+        try:
+            staged_project_dir = os.path.join(scratch_dir, name)
+            write(staged_project_dir)
+
+            # swap the complete project in; the replaced project is moved into the scratch directory and removed with it
+            replaced_project_dir = os.path.join(scratch_dir, f'{name}.replaced')
+            if os.path.lexists(project_dir):
+                os.rename(project_dir, replaced_project_dir)
+            try:
+                os.rename(staged_project_dir, project_dir)
+            except OSError:
+                if os.path.lexists(replaced_project_dir):
+                    os.rename(replaced_project_dir, project_dir)
+                raise
+        finally:
+            shutil.rmtree(scratch_dir, ignore_errors=True)
+
+        return project_dir
+
+    def write_tree(self, tree: 'StagedTree', staged_project_dir: str, jobs: int = 1) -> None:
+        """
+        Render and write all files of a staged tree into a new directory.
+
+        :param tree: The staged tree
+        :param staged_project_dir: The directory to write the project into; must not exist yet
+        :param jobs: Number of files that are rendered and written concurrently
+        """
+        os.mkdir(staged_project_dir)
+        for directory in tree.dirs:
+            os.makedirs(os.path.join(staged_project_dir, directory), exist_ok=True)
+        file_tasks = [(staged_file, os.path.join(staged_project_dir, outfile)) for outfile, staged_file in tree.files.items()]
+        if jobs > 1 and len(file_tasks) > 1:
+            with ThreadPoolExecutor(max_workers=min(jobs, len(file_tasks))) as executor:
+                futures = [executor.submit(self.write_file, staged_file, outfile) for staged_file, outfile in file_tasks]
+            # raise the error of the first failed file (in template order), exactly like a sequential run would
+            for future, (staged_file, _) in zip(futures, file_tasks):
+                try:
+                    future.result()
+                except UndefinedError as e:
+                    raise UndefinedVariableInTemplate(f'Unable to create file \'{staged_file.relative_file}\'', e, staged_file.context) from e
+        else:
+            for staged_file, outfile in file_tasks:
+                try:
+                    self.write_file(staged_file, outfile)
+                except UndefinedError as e:
+                    raise UndefinedVariableInTemplate(f'Unable to create file \'{staged_file.relative_file}\'', e, staged_file.context) from e
+
+    def write_file(self, staged_file: 'StagedFile', outfile: str) -> None:
+        """
+        Write a single staged file. Templated files are rendered or copied, if they are binary or must not be rendered.
+
+        :param staged_file: The staged file
+        :param outfile: Path of the file to write
+        """
+        if staged_file.content is not None:
+            content = staged_file.content
+            newline = '\n'
+        else:
+            infile = staged_file.infile
+            # binary files are never rendered
+            if staged_file.copy_only or is_binary(infile):
+                if not staged_file.transforms:
+                    copy_file(infile, outfile)
+                    return
+                with open(infile, encoding='utf-8') as f:
+                    content = f.read()
+            else:
+                content = self.env.get_template(infile).render(**staged_file.context)
+            if staged_file.context['cookiecutter'].get('_new_lines', False):
+                newline = staged_file.context['cookiecutter']['_new_lines']
+            else:
+                # use the newline of the templated files first line
+                with open(infile, encoding='utf-8') as rd:
+                    rd.readline()
+                newline = rd.newlines[0] if isinstance(rd.newlines, tuple) else rd.newlines
+        for transform in staged_file.transforms:
+            content = transform(content)
+        with open(outfile, 'w', encoding='utf-8', newline=newline) as f:
+            f.write(content)
+        if staged_file.infile is not None:
+            shutil.copymode(staged_file.infile, outfile)
+
+    @staticmethod
+    def find_project_template(template_dir: str) -> str:
+        """
+        Find the templated project directory (like {{cookiecutter.project_slug}}) of a template.
+
+        :param template_dir: Path to the template
+        :return: Path to the templated project directory
+        """
+        for name in sorted(os.listdir(template_dir)):
+            if 'cookiecutter' in name and '{{' in name and '}}' in name and os.path.isdir(os.path.join(template_dir, name)):
+                return os.path.join(template_dir, name)
+
+        raise NonTemplatedInputDirException(f'No templated project directory found in {template_dir}')
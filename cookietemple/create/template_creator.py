@@ -3,24 +3,26 @@ import os
 import sys
 import shutil
 import re
-import tempfile
-from typing import Optional, Union
+from typing import List, Optional, Union
+from concurrent.futures import ThreadPoolExecutor
 import cookietemple
-import requests
-from distutils.dir_util import copy_tree
+from io import StringIO
 from pathlib import Path
 from dataclasses import asdict
 from ruamel.yaml import YAML
-from cookiecutter.main import cookiecutter  # type: ignore
 
 from cookietemple.custom_cli.questionary import cookietemple_questionary_or_dot_cookietemple
-from cookietemple.util.dir_util import delete_dir_tree
+from cookietemple.create.render_engine import RenderEngine, RenderPlan, StagedTree
+from cookietemple.create.project_cache import ProjectCache
 from cookietemple.create.github_support import create_push_github_repository, load_github_username, is_git_repo
+from cookietemple.create.name_lookup import is_name_taken
 from cookietemple.lint.lint import lint_project
-from cookietemple.util.docs_util import fix_short_title_underline
+from cookietemple.util.docs_util import fix_short_title_underline_of_content
 from cookietemple.create.domains.cookietemple_template_struct import CookietempleTemplateStruct
 from cookietemple.config.config import ConfigCommand
 from cookietemple.common.load_yaml import load_yaml_file
+from cookietemple.common.template_registry import TemplateRegistry
+from cookietemple.common.profiling import span
 from rich import print
 
 log = logging.getLogger(__name__)
@@ -33,14 +35,32 @@ class TemplateCreator:
     Furthermore it defines methods that are basic for the template creation process.
     """
 
-    def __init__(self, creator_ctx: CookietempleTemplateStruct):
+    def __init__(self, creator_ctx: CookietempleTemplateStruct, output_root: Optional[Path] = None):
         self.WD = os.path.dirname(__file__)
         self.TEMPLATES_PATH = f'{self.WD}/templates'
         self.COMMON_FILES_PATH = f'{self.TEMPLATES_PATH}/common_files'
         self.AVAILABLE_TEMPLATES_PATH = f'{self.TEMPLATES_PATH}/available_templates.yml'
-        self.AVAILABLE_TEMPLATES = load_yaml_file(self.AVAILABLE_TEMPLATES_PATH)
-        self.CWD = os.getcwd()
+        self.AVAILABLE_TEMPLATES = TemplateRegistry.load(self.AVAILABLE_TEMPLATES_PATH).available_templates
+        # the directory the project is created in; creators never change the working directory, so that projects can be created concurrently
+        self.output_root = Path(output_root).resolve() if output_root else Path.cwd()
         self.creator_ctx = creator_ctx
+        # number of template files rendered concurrently
+        self.jobs = 1
+        # render plan of the chosen template (if any), which excludes or moves files depending on the chosen options
+        self.render_plan: Optional[RenderPlan] = None
+        # the project to create; all files are staged first and written at once, after the project is complete
+        self.staged_project: Optional[StagedTree] = None
+        # path of the created project
+        self.project_path: Optional[Path] = None
+        # whether an already existing project directory is overwritten; None asks the user
+        self.overwrite: Optional[bool] = None
+        # projects created without prompts (like by sync) are only looked up at PyPI and readthedocs.io and pushed to Github, if enabled explicitly
+        self.check_name_availability = False
+        self.create_github_repo = False
+        # whether the created project is linted
+        self.lint = True
+        # persistent cache of rendered projects; None renders every project
+        self.project_cache: Optional[ProjectCache] = ProjectCache.from_config()
 
     def process_common_operations(self, path: Path, skip_common_files=False, skip_fix_underline=False,
                                   domain: Optional[str] = None, subdomain: Union[str, bool] = None, language: Union[str, bool] = None,
@@ -49,30 +69,41 @@ class TemplateCreator:
         Create all stuff that is common for cookietemples template creation process; in detail those things are:
         create and copy common files, fix docs style, lint the project and ask whether the user wants to create a github repo.
         """
-        # create the common files and copy them into the templates directory (skip if flag is set)
-
+        # stage the common files into the project (skip if flag is set)
         if not skip_common_files:
-            self.create_common_files()
-
-        self.create_dot_cookietemple(template_version=self.creator_ctx.template_version)
+            with span('create.common_files'):
+                self.create_common_files()
 
-        if self.creator_ctx.language == 'python':
-            project_path = f'{self.CWD}/{self.creator_ctx.project_slug.replace("-", "_")}'
-        else:
-            project_path = f'{self.CWD}/{self.creator_ctx.project_slug}'
+        with span('create.dot_cookietemple'):
+            self.create_dot_cookietemple(template_version=self.creator_ctx.template_version)
 
         # Ensure that docs are looking good (skip if flag is set)
         if not skip_fix_underline:
-            fix_short_title_underline(f'{project_path}/docs/index.rst')
+            print('[bold blue]Fixing too short underlines of *.rst file (usually index.rst)')
+            with span('create.fix_underline'):
+                if not self.staged_project.transform('docs/index.rst', fix_short_title_underline_of_content):  # type: ignore
+                    print('[bold yellow]Unable to find rst file: docs/index.rst')
+
+        # write the complete project at once; nothing is left behind, if this fails. Projects rendered before are copied from the cache
+        with span('create.materialize', jobs=self.jobs):
+            if self.project_cache is not None:
+                key = ProjectCache.key(self.staged_project, self.creator_ctx.template_handle, self.creator_ctx.template_version)  # type: ignore
+                project_path = self.project_cache.materialize(self.staged_project, key, output_dir=str(path), jobs=self.jobs)  # type: ignore
+            else:
+                project_path = RenderEngine.get().materialize(self.staged_project, output_dir=str(path), jobs=self.jobs)  # type: ignore
+        self.project_path = Path(project_path)
 
         # Lint the project to verify that the new template adheres to all standards
-        lint_project(project_path, is_create=True, skip_external=False)
+        if self.lint:
+            with span('create.lint'):
+                lint_project(project_path, is_create=True, skip_external=False)
 
-        if self.creator_ctx.is_github_repo and not dot_cookietemple:
+        if self.creator_ctx.is_github_repo and (not dot_cookietemple or self.create_github_repo):
             # rename the currently created template to a temporary name, create Github repo, push, remove temporary template
             tmp_project_path = f'{project_path}_cookietemple_tmp'
             os.mkdir(tmp_project_path)
-            create_push_github_repository(project_path, self.creator_ctx, tmp_project_path)
+            with span('create.github'):
+                create_push_github_repository(project_path, self.creator_ctx, tmp_project_path)
             shutil.rmtree(tmp_project_path, ignore_errors=True)
 
         if subdomain:
@@ -84,93 +115,70 @@ class TemplateCreator:
             print('[bold blue]Please visit: https://cookietemple.readthedocs.io/en/latest/available_templates/available_templates.html'
                   f'#{domain}-{language} for more information about how to use your chosen template.')
 
-        if path != Path.cwd():
-            shutil.move(f'{Path.cwd()}/{self.creator_ctx.project_slug_no_hyphen}', f'{path}/{self.creator_ctx.project_slug_no_hyphen}')
-
     def create_template_without_subdomain(self, domain_path: str) -> None:
         """
         Creates a chosen template that does **not** have a subdomain.
-        Calls cookiecutter on the main chosen template.
+        Renders the main chosen template.
 
         :param domain_path: Path to the template, which is still in cookiecutter format
         """
-        # Target directory is already occupied -> overwrite?
-        occupied = os.path.isdir(f'{os.getcwd()}/{self.creator_ctx.project_slug}')
-        if occupied:
-            self.directory_exists_warning()
-
-            # Confirm proceeding with overwriting existing directory
-            if cookietemple_questionary_or_dot_cookietemple('confirm', 'Do you really want to continue?', default='No'):
-                cookiecutter(f'{domain_path}/{self.creator_ctx.domain}_{self.creator_ctx.language.lower()}',
-                             no_input=True,
-                             overwrite_if_exists=True,
-                             extra_context=self.creator_ctx_to_dict())
-            else:
-                print('[bold red]Aborted! Canceled template creation!')
-                sys.exit(0)
-        else:
-            cookiecutter(f'{domain_path}/{self.creator_ctx.domain}_{self.creator_ctx.language.lower()}',
-                         no_input=True,
-                         overwrite_if_exists=True,
-                         extra_context=self.creator_ctx_to_dict())
+        self.stage_main_template(f'{domain_path}/{self.creator_ctx.domain}_{self.creator_ctx.language.lower()}', overwrite_default='No')
 
     def create_template_with_subdomain(self, domain_path: str, subdomain: str) -> None:
         """
         Creates a chosen template that **does** have a subdomain.
-        Calls cookiecutter on the main chosen template.
+        Renders the main chosen template.
 
         :param domain_path: Path to the template, which is still in cookiecutter format
         :param subdomain: Subdomain of the chosen template
         """
-        occupied = os.path.isdir(f'{os.getcwd()}/{self.creator_ctx.project_slug}')
-        if occupied:
-            self.directory_exists_warning()
-
-            # Confirm proceeding with overwriting existing directory
-            if cookietemple_questionary_or_dot_cookietemple('confirm', 'Do you really want to continue?', default='Yes'):
-                delete_dir_tree(Path(f'{os.getcwd()}/{self.creator_ctx.project_slug}'))
-                cookiecutter(f'{domain_path}/{subdomain}_{self.creator_ctx.language.lower()}',
-                             no_input=True,
-                             overwrite_if_exists=True,
-                             extra_context=self.creator_ctx_to_dict())
-
-            else:
-                print('[bold red]Aborted! Canceled template creation!')
-                sys.exit(0)
-        else:
-            cookiecutter(f'{domain_path}/{subdomain}_{self.creator_ctx.language.lower()}',
-                         no_input=True,
-                         overwrite_if_exists=True,
-                         extra_context=self.creator_ctx_to_dict())
+        self.stage_main_template(f'{domain_path}/{subdomain}_{self.creator_ctx.language.lower()}', overwrite_default='Yes')
 
     def create_template_with_subdomain_framework(self, domain_path: str, subdomain: str, framework: str) -> None:
         """
         Creates a chosen template that **does** have a subdomain.
-        Calls cookiecutter on the main chosen template.
+        Renders the main chosen template.
 
         :param domain_path: Path to the template, which is still in cookiecutter format
         :param subdomain: Subdomain of the chosen template
         :param framework: Chosen framework
         """
-        occupied = os.path.isdir(f'{os.getcwd()}/{self.creator_ctx.project_slug}')
-        if occupied:
+        self.stage_main_template(f'{domain_path}/{subdomain}_{self.creator_ctx.language.lower()}/{framework}', overwrite_default='Yes')
+
+    def stage_main_template(self, template_path: str, overwrite_default: str) -> None:
+        """
+        Stage the main chosen template and confirm overwriting the project directory, if it is already occupied.
+
+        :param template_path: Path to the template, which is still in cookiecutter format
+        :param overwrite_default: Default answer of the prompt whether to overwrite an occupied project directory
+        """
+        with span('create.stage_template', template=os.path.basename(template_path)):
+            self.staged_project = RenderEngine.get().stage_template(template_path, extra_context=self.creator_ctx_to_dict(), plan=self.render_plan)
+
+        # Target directory is already occupied -> overwrite?
+        if os.path.isdir(self.output_root / self.staged_project.name):
             self.directory_exists_warning()
 
             # Confirm proceeding with overwriting existing directory
-            if cookietemple_questionary_or_dot_cookietemple('confirm', 'Do you really want to continue?', default='Yes'):
-                cookiecutter(f'{domain_path}/{subdomain}_{self.creator_ctx.language.lower()}/{framework}',
-                             no_input=True,
-                             overwrite_if_exists=True,
-                             extra_context=self.creator_ctx_to_dict())
-
-            else:
+            if not self.confirm_overwrite(default=overwrite_default):
                 print('[bold red]Aborted! Canceled template creation!')
                 sys.exit(0)
-        else:
-            cookiecutter(f'{domain_path}/{subdomain}_{self.creator_ctx.language.lower()}/{framework}',
-                         no_input=True,
-                         overwrite_if_exists=True,
-                         extra_context=self.creator_ctx_to_dict())
+
+    def confirm_overwrite(self, default: str) -> bool:
+        """
+        Ask whether an already existing project directory should be overwritten, unless this has been decided beforehand.
+
+        :param default: The default answer of the prompt
+        :return: Whether the directory should be overwritten
+        :raises FileExistsError: if overwriting has been forbidden beforehand
+        """
+        if self.overwrite is None:
+            question = 'Do you really want to replace the directory and remove all of its content?'
+            return cookietemple_questionary_or_dot_cookietemple('confirm', question, default=default)  # type: ignore
+        if not self.overwrite:
+            raise FileExistsError(f'A directory named {self.staged_project.name} already exists at {self.output_root}')  # type: ignore
+
+        return True
 
     def prompt_general_template_configuration(self, dot_cookietemple: Optional[dict]):
         """
@@ -210,9 +218,7 @@ class TemplateCreator:
                                                                                      default='Exploding Springfield',
                                                                                      dot_cookietemple=dot_cookietemple,
                                                                                      to_get_property='project_name')
-        if self.creator_ctx.language == 'python':
-            self.check_name_available("PyPi", dot_cookietemple)
-        self.check_name_available("readthedocs.io", dot_cookietemple)
+        self.check_name_available(['PyPi', 'readthedocs.io'] if self.creator_ctx.language == 'python' else ['readthedocs.io'], dot_cookietemple)
         self.creator_ctx.project_slug = self.creator_ctx.project_name.replace(' ', '_')  # type: ignore
         self.creator_ctx.project_slug_no_hyphen = self.creator_ctx.project_slug.replace('-', '_')
         self.creator_ctx.project_short_description = cookietemple_questionary_or_dot_cookietemple(function='text',
@@ -253,55 +259,52 @@ class TemplateCreator:
 
     def create_common_files(self) -> None:
         """
-        This function creates a temporary directory for common files of all templates and applies cookiecutter on them.
-        They are subsequently moved into the directory of the created template.
+        Stage the common files of all templates into the project. They replace files of the template with the same path.
         """
-        log.debug('Creating common files.')
-        dirpath = tempfile.mkdtemp()
-        copy_tree(f'{self.COMMON_FILES_PATH}', dirpath)
-        cwd_project = Path.cwd()
-        os.chdir(dirpath)
-
-        log.debug(f'Cookiecuttering common files at {dirpath}')
-        cookiecutter(dirpath,
-                     extra_context={'full_name': self.creator_ctx.full_name,
-                                    'email': self.creator_ctx.email,
-                                    'language': self.creator_ctx.language,
-                                    'domain': self.creator_ctx.domain,
-                                    'project_name': self.creator_ctx.project_name,
-                                    'project_slug': self.creator_ctx.project_slug if self.creator_ctx.language != 'python'
-                                    else self.creator_ctx.project_slug_no_hyphen,
-                                    'version': self.creator_ctx.version,
-                                    'license': self.creator_ctx.license,
-                                    'project_short_description': self.creator_ctx.project_short_description,
-                                    'github_username': self.creator_ctx.github_username,
-                                    'creator_github_username': self.creator_ctx.creator_github_username,
-                                    'cookietemple_version': cookietemple.__version__},
-                     no_input=True,
-                     overwrite_if_exists=True)
-
-        # recursively copy the common files directory content to the created project
-        log.debug('Copying common files into the created project')
-        dest_dir = self.creator_ctx.project_slug if self.creator_ctx.language != "python" else self.creator_ctx.project_slug_no_hyphen
-        copy_tree(f'{os.getcwd()}/common_files_util', f'{cwd_project}/{dest_dir}')
-        # delete the tmp cookiecuttered common files directory
-        log.debug('Delete common files directory.')
-        delete_dir_tree(Path(f'{Path.cwd()}/common_files_util'))
-        shutil.rmtree(dirpath)
-        # change to recent cwd so lint etc can run properly
-        os.chdir(str(cwd_project))
-
-    def check_name_available(self, host, dot_cookietemple) -> None:
+        log.debug('Staging common files.')
+        RenderEngine.get().stage_template(self.COMMON_FILES_PATH,
+                                          extra_context={'full_name': self.creator_ctx.full_name,
+                                                         'email': self.creator_ctx.email,
+                                                         'language': self.creator_ctx.language,
+                                                         'domain': self.creator_ctx.domain,
+                                                         'project_name': self.creator_ctx.project_name,
+                                                         'project_slug': self.creator_ctx.project_slug if self.creator_ctx.language != 'python'
+                                                         else self.creator_ctx.project_slug_no_hyphen,
+                                                         'version': self.creator_ctx.version,
+                                                         'license': self.creator_ctx.license,
+                                                         'project_short_description': self.creator_ctx.project_short_description,
+                                                         'github_username': self.creator_ctx.github_username,
+                                                         'creator_github_username': self.creator_ctx.creator_github_username,
+                                                         'cookietemple_version': cookietemple.__version__},
+                                          tree=self.staged_project)
+
+    def check_name_available(self, hosts: List[str], dot_cookietemple: Optional[dict]) -> None:
         """
-        Main function that calls the queries for the project name lookup at PyPi and readthedocs.io
+        Main function that calls the queries for the project name lookup at PyPi and readthedocs.io.
+        All hosts are queried concurrently.
+
+        :param hosts: The hosts to look up the project name at
+        :param dot_cookietemple: Dictionary created from the .cookietemple.yml file. None if no .cookietemple.yml file was used.
         """
+        if dot_cookietemple and not self.check_name_availability:
+            return
         # if project already exists at either PyPi or readthedocs, ask user for confirmation with the option to change the project name
-        while TemplateCreator.query_name_available(host, self.creator_ctx.project_name) and not dot_cookietemple:  # type: ignore
-            print(f'[bold red]A project named {self.creator_ctx.project_name} already exists at {host}!')
+        while True:
+            with ThreadPoolExecutor(max_workers=len(hosts)) as executor:
+                taken = list(executor.map(lambda host: TemplateCreator.query_name_available(host, self.creator_ctx.project_name), hosts))  # type: ignore
+            taken_hosts = [host for host, is_taken in zip(hosts, taken) if is_taken]
+            if not taken_hosts:
+                break
+            for host in taken_hosts:
+                print(f'[bold red]A project named {self.creator_ctx.project_name} already exists at {host}!')
+            # projects created without prompts keep their name
+            if dot_cookietemple:
+                break
             # provide the user an option to change the project's name
             if cookietemple_questionary_or_dot_cookietemple(function='confirm',
                                                             question='Do you want to choose another name for your project?\n'
-                                                                     f'Otherwise you will not be able to host your project at {host}!', default='Yes'):
+                                                                     f'Otherwise you will not be able to host your project at {" and ".join(taken_hosts)}!',
+                                                            default='Yes'):
                 self.creator_ctx.project_name = cookietemple_questionary_or_dot_cookietemple(function='text',
                                                                                              question='Project name',
                                                                                              default='Exploding Springfield')
@@ -313,6 +316,7 @@ class TemplateCreator:
     def query_name_available(host: str, project_name: str) -> bool:
         """
         Make a GET request to the host to check whether a project with this name already exists.
+        The request times out after a few seconds and its answer is cached, so that names are not looked up again when re-prompting.
         :param host The host (either PyPi or readthedocs)
         :param project_name Name of the project the user wants to create
 
@@ -324,34 +328,26 @@ class TemplateCreator:
             # raise a ValueError if the host name is invalid
             raise ValueError(f'check_name_available has been called with the invalid host {host}.\nValid hosts are PyPi and readthedocs.io')
         print(f'[bold blue]Looking up {project_name} at {host}!')
-        # determine url depending on host being either PyPi or readthedocs.io
-        url = 'https://' + (f'pypi.org/project/{project_name.replace(" ", "")}' if host == "PyPi" else f'{project_name.replace(" ", "")}.readthedocs.io')
-        log.debug(f'Looking up {url}')
-        try:
-            request = requests.get(url)
-            if request.status_code == 200:
-                return True
-        # catch exceptions when server may be unavailable or the request timed out
-        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
-            log.debug(f'Unable to contact {host}')
-            log.debug(f'Error was: {e}')
+        taken = is_name_taken(host, project_name)
+        # the server may be unavailable, the request timed out or the server answered with an error (like a rate limit)
+        if taken is None:
             print(f'[bold red]Cannot check whether name already taken on {host} because its unreachable at the moment!')
             return False
 
-        return False
+        return taken
 
     def directory_exists_warning(self) -> None:
         """
         If the directory is already a git directory within the same project, print error message and exit.
-        Otherwise print a warning that a directory already exists and any further action on the directory will overwrite its contents.
+        Otherwise print a warning that a directory already exists and proceeding replaces it, which removes all of its content.
         """
-        if is_git_repo(Path(f'{os.getcwd()}/{self.creator_ctx.project_slug}')):
-            print(f'[bold red]Error: A git project named {self.creator_ctx.project_slug} already exists at [green]{os.getcwd()}\n')
+        if is_git_repo(self.output_root / self.staged_project.name):  # type: ignore
+            print(f'[bold red]Error: A git project named {self.staged_project.name} already exists at [green]{self.output_root}\n')
             print('[bold red]Aborting!')
             sys.exit(1)
         else:
-            print(f'[bold yellow]WARNING: [red]A directory named {self.creator_ctx.project_slug} already exists at [blue]{os.getcwd()}\n')
-            print('Proceeding now will overwrite this directory and its content!')
+            print(f'[bold yellow]WARNING: [red]A directory named {self.staged_project.name} already exists at [blue]{self.output_root}\n')
+            print('Proceeding now will replace this directory. All of its content is removed, including files the template does not create!')
 
     def create_dot_cookietemple(self, template_version: str):
         """
@@ -360,15 +356,14 @@ class TemplateCreator:
 
         :param template_version: Version of the specific template
         """
-        log.debug('Creating .cookietemple.yml file.')
+        log.debug('Staging .cookietemple.yml file.')
         self.creator_ctx.template_version = f'{template_version} # <<COOKIETEMPLE_NO_BUMP>>'
         self.creator_ctx.cookietemple_version = f'{cookietemple.__version__} # <<COOKIETEMPLE_NO_BUMP>>'
-        # Python does not allow for hyphens (module imports etc) -> remove them
-        no_hyphen = self.creator_ctx.project_slug.replace('-', '_')
-        with open(f'{self.creator_ctx.project_slug if self.creator_ctx.language != "python" else no_hyphen}/.cookietemple.yml', 'w') as f:
-            yaml = YAML()
-            struct_to_dict = self.creator_ctx_to_dict()
-            yaml.dump(struct_to_dict, f)
+        dot_cookietemple = StringIO()
+        yaml = YAML()
+        struct_to_dict = self.creator_ctx_to_dict()
+        yaml.dump(struct_to_dict, dot_cookietemple)
+        self.staged_project.add_content('.cookietemple.yml', dot_cookietemple.getvalue())  # type: ignore
 
     def creator_ctx_to_dict(self) -> dict:
         """
@@ -8,9 +8,7 @@ from pathlib import Path
 from configparser import NoSectionError
 
 import cookietemple
-from cookietemple.common.suggest_similar_commands import MAIN_COMMANDS
-from cookietemple.common.levensthein_dist import most_similar_command
-from cookietemple.bump_version.bump_version import VersionBumper
+from cookietemple.common.levensthein_dist import main_commands_index
 
 
 class HelpErrorHandling(click.Group):
@@ -118,7 +116,7 @@ class HelpErrorHandling(click.Group):
         rv = click.Group.get_command(self, ctx, cmd_name)
         if rv is not None:
             return rv
-        sim_commands, action = most_similar_command(cmd_name, MAIN_COMMANDS)
+        sim_commands, action = main_commands_index().most_similar(cmd_name)
 
         matches = [cmd for cmd in self.list_commands(ctx) if cmd in sim_commands]
 
@@ -146,6 +144,11 @@ class HelpErrorHandling(click.Group):
                   '[bold blue]as argument.')
             sys.exit(1)
 
+        elif cmd == 'search':
+            print(f'[bold red]Failed to execute [bold green]{cmd}.\n[bold blue]Please provide at least one keyword like [bold green]python '
+                  '[bold blue]as argument.')
+            sys.exit(1)
+
         elif cmd == 'bump-version':
             print(f'[bold red]Failed to execute [bold green]{cmd}.\n[bold blue]Please provide a new version like [bold green]1.2.3 '
                   '[bold blue]as first argument.')
@@ -250,6 +253,8 @@ def print_project_version(ctx, param, value) -> None:
     # if context uses resilient parsing (no changes of execution flow) or no flag value is provided, do nothing
     if not value or ctx.resilient_parsing:
         return
+    from cookietemple.bump_version.bump_version import VersionBumper
+
     try:
         print(f'[bold blue]Current project version is [bold green]{VersionBumper(Path.cwd(), False).CURRENT_VERSION}!')
         ctx.exit()
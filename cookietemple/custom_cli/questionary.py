@@ -23,6 +23,20 @@ cookietemple_style = Style([
 ])
 
 
+class InvalidAnswerError(ValueError):
+    """
+    Raised, when the answers of a prompt-free project creation are invalid.
+    """
+
+
+class PromptFreeAnswers(dict):
+    """
+    All answers of a prompt-free project creation (like the content of an answers file).
+    Unlike a plain dot_cookietemple dictionary, questions without an answer are never prompted for, but answered with their default.
+    Answers to select questions must be one of the choices.
+    """
+
+
 def cookietemple_questionary_or_dot_cookietemple(function: str,
                                                  question: str,
                                                  choices: Optional[List[str]] = None,
@@ -39,7 +53,10 @@ def cookietemple_questionary_or_dot_cookietemple(function: str,
     :param dot_cookietemple: A dictionary, which contains the whole .cookietemple.yml content
     :param to_get_property: A key, which must be in the dot_cookietemple file, which is used to fetch the read in value from the .cookietemple.yml file
     :return: The chosen answer.
+    :raises InvalidAnswerError: if the answer of prompt-free answers is not one of the choices
     """
+    if isinstance(dot_cookietemple, PromptFreeAnswers):
+        return answer_without_prompt(function, question, choices, default, dot_cookietemple, to_get_property)
     # First check whether a dot_cookietemple was passed and whether it contains the desired property -> return it if so
     try:
         if dot_cookietemple:
@@ -81,3 +98,44 @@ def cookietemple_questionary_or_dot_cookietemple(function: str,
     log.debug(f'User selected {answer}')
 
     return answer  # type: ignore
+
+
+def answer_without_prompt(function: str,
+                          question: str,
+                          choices: Optional[List[str]],
+                          default: Optional[str],
+                          answers: PromptFreeAnswers,
+                          to_get_property: Optional[str]) -> Union[str, bool]:
+    """
+    Answer a question from prompt-free answers. Missing answers are replaced by the default of the question.
+
+    :param function: The function of questionary, which would have been called
+    :param question: The question
+    :param choices: List of all possible choices
+    :param default: The default value of the question
+    :param answers: The prompt-free answers
+    :param to_get_property: Key of the answer
+    :return: The answer
+    :raises InvalidAnswerError: if the answer is not one of the choices or a text question without default is not answered
+    """
+    if to_get_property in answers:
+        answer = answers[to_get_property]
+    elif function == 'confirm':
+        answer = default in {'Yes', 'yes'}
+    elif default is not None:
+        answer = default
+    elif function == 'select':
+        # the first choice is preselected by the prompt
+        answer = choices[0]  # type: ignore
+    else:
+        raise InvalidAnswerError(f'Missing answer {to_get_property} to the question: {question}')
+
+    if function == 'select':
+        # some answers (like the frontend) are stored lowercased in the .cookietemple.yml file
+        matching_choices = [choice for choice in choices if choice.lower() == str(answer).lower()]  # type: ignore
+        if not matching_choices:
+            raise InvalidAnswerError(f'Invalid answer {answer} to the question: {question}. Choose one of {", ".join(choices)}.')  # type: ignore
+        answer = matching_choices[0]
+    log.debug(f'Answered the question: ||{question}|| as: {answer}')
+
+    return answer
@@ -8,10 +8,9 @@ from rich.console import Console
 from rich.table import Table
 from rich.box import HEAVY_HEAD
 from rich import print
-from cookietemple.common.levensthein_dist import most_similar_command
-from cookietemple.common.load_yaml import load_yaml_file
+from cookietemple.common.levensthein_dist import handle_index, most_similar_command
+from cookietemple.common.template_registry import TemplateRegistry
 from cookietemple.util.dict_util import is_nested_dictionary
-from cookietemple.common.suggest_similar_commands import load_available_handles
 
 
 log = logging.getLogger(__name__)
@@ -25,7 +24,6 @@ class TemplateInfo:
     def __init__(self):
         self.WD = os.path.dirname(__file__)
         self.TEMPLATES_PATH = f'{self.WD}/../create/templates'
-        self.available_handles = ''
         self.most_sim = []
         self.action = ''
 
@@ -37,7 +35,7 @@ class TemplateInfo:
         """
         # list of all templates that should be printed according to the passed handle
         templates_to_print: List[str] = []
-        available_templates = load_yaml_file(f'{self.TEMPLATES_PATH}/available_templates.yml')
+        available_templates = TemplateRegistry.load(f'{self.TEMPLATES_PATH}/available_templates.yml').available_templates
         specifiers = handle.split('-')
         domain = specifiers[0]
         template_info: List[str] = []
@@ -145,8 +143,7 @@ class TemplateInfo:
         :param handle: The non existing handle
         :param run_f: Flag that indicates whether to run print to output or not (do not run in case of languages)
         """
-        self.available_handles = load_available_handles()
-        self.most_sim, self.action = most_similar_command(handle, self.available_handles)
+        self.most_sim, self.action = handle_index().most_similar(handle)
         if run_f:
             self.print_console_output(handle)
 
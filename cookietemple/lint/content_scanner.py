@@ -0,0 +1,217 @@
+import io
+import logging
+import os
+import re
+from typing import Callable, Dict, Iterable, List, Optional, Pattern, Union
+
+log = logging.getLogger(__name__)
+
+
+class ContentRule:
+    """
+    A single rule, which is applied to every line of every file that is visited by the ContentScanner.
+    A rule is either declared as a precompiled regex pattern (a finding is created for every matching line) or as a callback, which receives the
+    files name, the line and the regex match (if a pattern was declared) and returns the findings message or None.
+
+    :attribute rule_id: Unique identifier of the rule; findings are grouped by this id
+    :attribute lint_code: The linting code (like general-3) the findings of this rule are reported with
+    :attribute pattern: Precompiled pattern a line has to match (search) to produce a finding
+    :attribute callback: Function building the findings message from the files name, the line and the match; None skips the line
+    :attribute needles: Plain substrings of which at least one must be contained in a file; used to skip files without reading them line by line
+    :attribute honor_ignore: Whether files and directories ignored by the projects .gitignore (and .git) should be skipped for this rule
+    :attribute skip_suffixes: File suffixes which should never be scanned by this rule
+    """
+
+    def __init__(self,
+                 rule_id: str,
+                 lint_code: str,
+                 pattern: Optional[Union[str, Pattern]] = None,
+                 callback: Optional[Callable[[str, str, Optional[re.Match]], Optional[str]]] = None,
+                 needles: Iterable[str] = (),
+                 honor_ignore: bool = False,
+                 skip_suffixes: Iterable[str] = ()):
+        if pattern is None and callback is None:
+            raise ValueError(f'Content rule {rule_id} requires either a pattern or a callback.')
+        self.rule_id = rule_id
+        self.lint_code = lint_code
+        self.pattern = re.compile(pattern) if isinstance(pattern, str) else pattern
+        self.callback = callback
+        self.needles = tuple(needles)
+        self.honor_ignore = honor_ignore
+        self.skip_suffixes = tuple(skip_suffixes)
+
+    def applies_to(self, fname: str) -> bool:
+        """
+        Check whether the rule should be applied to a file at all.
+
+        :param fname: Name of the file
+        :return: True if the file is not excluded by its suffix
+        """
+        return not fname.endswith(self.skip_suffixes) if self.skip_suffixes else True
+
+    def might_match(self, content: str) -> bool:
+        """
+        Cheap prefilter on the whole file content. Rules without needles always need to inspect every line.
+
+        :param content: The complete content of a file
+        :return: Whether any line of the file could produce a finding
+        """
+        return not self.needles or any(needle in content for needle in self.needles)
+
+    def check_line(self, fname: str, line: str) -> Optional[str]:
+        """
+        Apply the rule to a single line.
+
+        :param fname: Name of the file the line belongs to
+        :param line: The line to check
+        :return: The findings message or None if the line does not violate the rule
+        """
+        match = None
+        if self.pattern is not None:
+            match = self.pattern.search(line)
+            if not match:
+                return None
+        if self.callback is not None:
+            return self.callback(fname, line, match)
+
+        return f'Match in {fname}: {line.strip()}'
+
+
+class ContentScanner:
+    """
+    Walks a project tree exactly once, reads every file exactly once and applies all registered content rules to this single pass.
+
+    :attribute path: Path to the project that should be scanned
+    :attribute rules: The content rules to apply
+    :attribute ignore: Basenames of files and directories that rules honoring ignores skip
+    :attribute exclude: Basenames of files and directories that are never scanned
+    :attribute cache: An optional LintCache; files with unchanged content are not scanned again, but their cached findings are replayed
+    """
+
+    def __init__(self, path: str, rules: List[ContentRule], exclude: Iterable[str] = (), cache=None):
+        self.path = path
+        self.rules = rules
+        self.ignore = self.load_ignored_names()
+        self.exclude = set(exclude)
+        self.cache = cache
+
+    def load_ignored_names(self) -> List[str]:
+        """
+        Read the basenames of all entries of the projects .gitignore file. The .git directory is always ignored.
+
+        :return: List of ignored file and directory names
+        """
+        ignore = ['.git']
+        gitignore_path = os.path.join(self.path, '.gitignore')
+        if os.path.isfile(gitignore_path):
+            with io.open(gitignore_path, 'rt', encoding='latin1') as file:
+                for line in file:
+                    ignore.append(os.path.basename(line.strip().rstrip('/')))
+
+        return ignore
+
+    def scan(self) -> Dict[str, List[str]]:
+        """
+        Scan the whole project.
+
+        :return: A dictionary mapping every rule id to the messages of all its findings (in walk order)
+        """
+        findings: Dict[str, List[str]] = {rule.rule_id: [] for rule in self.rules}
+        for file_path, fname, active_rules in self.walk():
+            if self.cache is not None:
+                file_findings = self.scan_file_cached(file_path, fname, active_rules)
+            else:
+                file_findings = self.scan_file(file_path, fname, active_rules)
+            for rule_id, messages in file_findings.items():
+                findings[rule_id].extend(messages)
+
+        return findings
+
+    def scan_file_cached(self, file_path: str, fname: str, rules: List[ContentRule]) -> Dict[str, List[str]]:
+        """
+        Replay the cached findings of a file if its content did not change. Otherwise scan it and cache the findings.
+
+        :param file_path: Path to the file
+        :param fname: Name of the file (used in the findings messages)
+        :param rules: The rules to apply
+        :return: A dictionary mapping the rule ids to the messages of their findings in this file
+        """
+        key = os.path.relpath(file_path, self.path)
+        cached, data = self.cache.lookup('content', key, file_path)
+        if cached is not None and all(rule.rule_id in cached for rule in rules):
+            return {rule.rule_id: cached[rule.rule_id] for rule in rules}
+        findings = self.scan_file(file_path, fname, rules, data)
+        self.cache.store('content', key, file_path, findings)
+
+        return findings
+
+    def walk(self):
+        """
+        Walk the project top down in the same order as os.walk.
+        Directories are only descended into while at least one rule still applies to them.
+
+        :return: Generator of tuples (path to file, file name, rules applying to the file)
+        """
+        unfiltered_rules = [rule for rule in self.rules if not rule.honor_ignore]
+        stack = [(self.path, self.rules)]
+        while stack:
+            root, active_rules = stack.pop()
+            try:
+                entries = list(os.scandir(root))
+            except OSError as e:
+                log.debug(f'Unable to scan directory {root}: {e}')
+                continue
+            dirs, files = [], []
+            for entry in entries:
+                if entry.name in self.exclude:
+                    continue
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                (dirs if is_dir else files).append(entry)
+
+            for entry in files:
+                rules = unfiltered_rules if entry.name in self.ignore else active_rules
+                if rules:
+                    yield entry.path, entry.name, rules
+
+            # push in reverse order, so directories are visited in their listed order
+            for entry in reversed(dirs):
+                if entry.is_symlink():
+                    continue
+                rules = unfiltered_rules if entry.name in self.ignore else active_rules
+                if rules:
+                    stack.append((entry.path, rules))
+
+    @staticmethod
+    def scan_file(file_path: str, fname: str, rules: List[ContentRule], data: Optional[bytes] = None) -> Dict[str, List[str]]:
+        """
+        Read a single file once and apply all rules to it.
+
+        :param file_path: Path to the file
+        :param fname: Name of the file (used in the findings messages)
+        :param rules: The rules to apply
+        :param data: The raw content of the file, if it has already been read
+        :return: A dictionary mapping the rule ids to the messages of their findings in this file
+        """
+        findings: Dict[str, List[str]] = {rule.rule_id: [] for rule in rules}
+        rules = [rule for rule in rules if rule.applies_to(fname)]
+        if not rules:
+            return findings
+        try:
+            with io.TextIOWrapper(io.BytesIO(data), encoding='latin1') if data is not None else io.open(file_path, 'rt', encoding='latin1') as file:
+                content = file.read()
+        except OSError as e:
+            log.debug(f'Unable to read file {file_path}: {e}')
+            return findings
+        rules = [rule for rule in rules if rule.might_match(content)]
+        if not rules:
+            return findings
+        for line in io.StringIO(content):
+            for rule in rules:
+                message = rule.check_line(fname, line)
+                if message is not None:
+                    findings[rule.rule_id].append(message)
+
+        return findings
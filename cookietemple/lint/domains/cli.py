@@ -2,15 +2,17 @@ import os
 from subprocess import Popen
 from typing import List
 
-import requests
-from pkg_resources import parse_version
+from packaging.requirements import Requirement
+from packaging.version import parse as parse_version
 from rich import print
 
+from cookietemple.common.pypi_resolver import (DEFAULT_INDEX_URL, PackageInfo, PyPIResolver, parse_requirements_file,
+                                               parse_setup_cfg_requirements)
+from cookietemple.common.profiling import span
+from cookietemple.config.config import ConfigCommand
 from cookietemple.custom_cli.questionary import cookietemple_questionary_or_dot_cookietemple
 from cookietemple.lint.template_linter import TemplateLinter, files_exist_linting, GetLintingFunctionsMeta
 
-CWD = os.getcwd()
-
 
 class CliPythonLint(TemplateLinter, metaclass=GetLintingFunctionsMeta):
     def __init__(self, path):
@@ -22,66 +24,68 @@ class CliPythonLint(TemplateLinter, metaclass=GetLintingFunctionsMeta):
         # Call autopep8, if needed
         if is_create:
             print('[bold blue]Running autopep8 to fix pep8 issues in place')
-            autopep8 = Popen(['autopep8', self.path, '--recursive', '--in-place', '--pep8-passes', '2000'],
-                             universal_newlines=True, shell=False, close_fds=True)
-            (autopep8_stdout, autopep8_stderr) = autopep8.communicate()
+            with span('lint.autopep8'):
+                autopep8 = Popen(['autopep8', self.path, '--recursive', '--in-place', '--pep8-passes', '2000'],
+                                 universal_newlines=True, shell=False, close_fds=True)
+                (autopep8_stdout, autopep8_stderr) = autopep8.communicate()
         elif skip_external:
             pass
         elif cookietemple_questionary_or_dot_cookietemple(function='confirm',
                                                           question='Do you want to run autopep8 to fix pep8 issues?',
                                                           default='n'):
             print('[bold blue]Running autopep8 to fix pep8 issues in place')
-            autopep8 = Popen(['autopep8', self.path, '--recursive', '--in-place', '--pep8-passes', '2000'],
-                             universal_newlines=True, shell=False, close_fds=True)
-            (autopep8_stdout, autopep8_stderr) = autopep8.communicate()
+            with span('lint.autopep8'):
+                autopep8 = Popen(['autopep8', self.path, '--recursive', '--in-place', '--pep8-passes', '2000'],
+                                 universal_newlines=True, shell=False, close_fds=True)
+                (autopep8_stdout, autopep8_stderr) = autopep8.communicate()
 
     def check_dependencies_not_outdated(self) -> bool:
         """
-        Check that every dependency from project's requirements.txt is the latest version available at PyPi.
+        Check that every dependency from project's requirements.txt and requirements_dev.txt is the latest version available at PyPi.
+        Pinned dependencies must match the latest version, version ranges (like in requirements.in files or the install_requires of the setup.cfg)
+        must include it. All dependencies are resolved at once using the (cached) PyPi JSON API of the configured index.
 
         :return Bool flag that shows code execution went right (used for testing purposes)
         """
 
-        def check_dependencies(filename: str) -> None:
-            """
-            Check for a given file whether no dependencies are outdated.
-            :param filename: Name of the dependency file to parse (either requirements.txt or requirements_dev.txt)
+        def _check_pip_package(requirement: Requirement, package: PackageInfo) -> None:
             """
-            with open(f'{self.path}/{filename}') as req_file:
-                dependencies = [line[:-1].split('==') for line in req_file]
-            for dependency in dependencies:
-                if len(dependency) == 2:
-                    _check_pip_package(dependency[0], dependency[1])
+            Check a single dependency against its resolved PyPi package information.
 
-        def _check_pip_package(pip_dependency_name, pip_dependency_version) -> None:
+            :param requirement: The dependency as specified by the user's project
+            :param package: The resolved information of the dependency
             """
-            Query PyPi package information.
-            Sends a HTTP GET request to the PyPi remote API.
+            if package.status == 'timeout':
+                self.warned.append(('cli-python-2', f'PyPi API timed out: {package.url}'))
+            elif package.status == 'connection_error':
+                self.warned.append(('cli-python-2', f'PyPi API Connection error: {package.url}'))
+            elif package.status != 'ok':
+                self.failed.append(('cli-python-2', f'Could not find pip dependency using the PyPi API: {requirement.name}{requirement.specifier}'))
+            elif not requirement.specifier:
+                pass
+            elif len(requirement.specifier) == 1 and next(iter(requirement.specifier)).operator == '==' and '*' not in str(requirement.specifier):
+                pinned_version = next(iter(requirement.specifier)).version
+                if parse_version(pinned_version) < parse_version(package.latest_version):
+                    self.warned.append(('cli-python-2', f'Version {pinned_version} of {requirement.name} is not the latest available: '
+                                                        f'{package.latest_version}'))
+            elif not requirement.specifier.contains(package.latest_version, prereleases=True):
+                self.warned.append(('cli-python-2', f'Version range {requirement.specifier} of {requirement.name} excludes the latest available '
+                                                    f'version: {package.latest_version}'))
+
+        requirements = []
+        # requirements.txt and requirements_dev.txt are required, requirements.in files and install_requires of the setup.cfg are optional
+        for filename in ['requirements.txt', 'requirements_dev.txt', 'requirements.in', 'requirements_dev.in']:
+            if filename.endswith('.txt') or os.path.isfile(f'{self.path}/{filename}'):
+                requirements += parse_requirements_file(f'{self.path}/{filename}')
+        if os.path.isfile(f'{self.path}/setup.cfg'):
+            requirements += parse_setup_cfg_requirements(f'{self.path}/setup.cfg')
+
+        # resolve all dependencies at once
+        resolver = PyPIResolver(index_url=ConfigCommand.load_setting('pypi_index_url', DEFAULT_INDEX_URL))
+        resolved = resolver.resolve(requirement.name for requirement in requirements)
+        for requirement in requirements:
+            _check_pip_package(requirement, resolved[requirement.name])
 
-            :param pip_dependency_name: The name of the dependency
-            :param pip_dependency_version: Dependency version used by the user's project
-            """
-            pip_api_url = f'https://pypi.python.org/pypi/{pip_dependency_name}/json'
-            try:
-                response = requests.get(pip_api_url, timeout=10)
-            except requests.exceptions.Timeout:
-                self.warned.append(('cli-python-2', f'PyPi API timed out: {pip_api_url}'))
-            except requests.exceptions.ConnectionError:
-                self.warned.append(('cli-python-2', f'PyPi API Connection error: {pip_api_url}'))
-            else:
-                if response.status_code == 200:
-                    pip_dep_json = response.json()
-                    latest_dependency_version = pip_dep_json['info']['version']
-                    if parse_version(pip_dependency_version) < parse_version(latest_dependency_version):
-                        self.warned.append(('cli-python-2', f'Version {pip_dependency_version} of {pip_dependency_name} is not the latest available: '
-                        f'{latest_dependency_version}'))  # noqa: E128
-                else:
-                    self.failed.append(('cli-python-2', f'Could not find pip dependency using the PyPi API: {pip_dependency_name}=={pip_dependency_version}'))
-
-        # check general dependencies
-        check_dependencies('requirements.txt')
-        # check development dependencies
-        check_dependencies('requirements_dev.txt')
         return True
 
     def python_files_exist(self) -> None:
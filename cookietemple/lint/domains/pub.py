@@ -3,8 +3,6 @@ from typing import List
 
 from cookietemple.lint.template_linter import TemplateLinter, files_exist_linting, GetLintingFunctionsMeta
 
-CWD = os.getcwd()
-
 
 class PubLatexLint(TemplateLinter, metaclass=GetLintingFunctionsMeta):
     def __init__(self, path):
@@ -4,11 +4,10 @@ from typing import List
 
 from rich import print
 
+from cookietemple.common.profiling import span
 from cookietemple.custom_cli.questionary import cookietemple_questionary_or_dot_cookietemple
 from cookietemple.lint.template_linter import TemplateLinter, files_exist_linting, GetLintingFunctionsMeta
 
-CWD = os.getcwd()
-
 
 class WebWebsitePythonLint(TemplateLinter, metaclass=GetLintingFunctionsMeta):
     def __init__(self, path):
@@ -20,18 +19,20 @@ class WebWebsitePythonLint(TemplateLinter, metaclass=GetLintingFunctionsMeta):
         # Call autopep8, if needed
         if is_create:
             print('[blue]Running autopep8 to fix pep8 issues in place')
-            autopep8 = Popen(['autopep8', self.path, '--recursive', '--in-place', '--pep8-passes', '2000'],
-                             universal_newlines=True, shell=False, close_fds=True)
-            (autopep8_stdout, autopep8_stderr) = autopep8.communicate()
+            with span('lint.autopep8'):
+                autopep8 = Popen(['autopep8', self.path, '--recursive', '--in-place', '--pep8-passes', '2000'],
+                                 universal_newlines=True, shell=False, close_fds=True)
+                (autopep8_stdout, autopep8_stderr) = autopep8.communicate()
         elif skip_external:
             pass
         elif cookietemple_questionary_or_dot_cookietemple(function='confirm',
                                                           question='Do you want to run autopep8 to fix pep8 issues?',
                                                           default='n'):
             print('[blue]Running autopep8 to fix pep8 issues in place')
-            autopep8 = Popen(['autopep8', self.path, '--recursive', '--in-place', '--pep8-passes', '2000'],
-                             universal_newlines=True, shell=False, close_fds=True)
-            (autopep8_stdout, autopep8_stderr) = autopep8.communicate()
+            with span('lint.autopep8'):
+                autopep8 = Popen(['autopep8', self.path, '--recursive', '--in-place', '--pep8-passes', '2000'],
+                                 universal_newlines=True, shell=False, close_fds=True)
+                (autopep8_stdout, autopep8_stderr) = autopep8.communicate()
 
     def python_files_exist(self) -> None:
         """
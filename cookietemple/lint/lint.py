@@ -7,16 +7,18 @@ from ruamel.yaml import YAML
 from rich import print
 
 from cookietemple.lint.template_linter import TemplateLinter
+from cookietemple.lint.lint_cache import LintCache
 from cookietemple.lint.domains.cli import CliPythonLint, CliJavaLint
 from cookietemple.lint.domains.web import WebWebsitePythonLint
 from cookietemple.lint.domains.gui import GuiJavaLint
 from cookietemple.lint.domains.lib import LibCppLint
 from cookietemple.lint.domains.pub import PubLatexLint
+from cookietemple.common.profiling import span
 
 log = logging.getLogger(__name__)
 
 
-def lint_project(project_dir: str, skip_external: bool, is_create: bool = False) -> Optional[TemplateLinter]:
+def lint_project(project_dir: str, skip_external: bool, is_create: bool = False, jobs: int = 1, use_cache: bool = False) -> Optional[TemplateLinter]:
     """
     Verifies the integrity of a project to best coding and practices.
     Runs a set of general linting functions, which all templates share and afterwards runs template specific linting functions.
@@ -25,6 +27,9 @@ def lint_project(project_dir: str, skip_external: bool, is_create: bool = False)
     :param project_dir: The path to the .cookietemple.yml file.
     :param skip_external: Whether to skip external linters such as autopep8
     :param is_create: Whether linting is called during project creation
+    :param jobs: Number of linting functions to run concurrently
+    :param use_cache: Whether to reuse (and update) the results of files, which did not change since the last linting run
+    :return: The linter holding all results
     """
     # Detect which template the project is based on
     template_handle = get_template_handle(project_dir)
@@ -44,6 +49,9 @@ def lint_project(project_dir: str, skip_external: bool, is_create: bool = False)
     except TypeError:
         print(f'[bold red]Unable to find linter for handle {template_handle}! Aborting...')
         sys.exit(1)
+    lint_obj.jobs = jobs
+    if use_cache:
+        lint_obj.cache = LintCache(project_dir, lint_obj.content_rules)
 
     # Run the linting tests
     try:
@@ -56,7 +64,8 @@ def lint_project(project_dir: str, skip_external: bool, is_create: bool = False)
         # Run non project specific linting
         log.debug('Running general linting.')
         print('[bold blue]Running general linting')
-        lint_obj.lint_project(super(lint_obj.__class__, lint_obj), custom_check_files=disable_check_files, is_subclass_calling=False)
+        with span('lint.general'):
+            lint_obj.lint_project(super(lint_obj.__class__, lint_obj), custom_check_files=disable_check_files, is_subclass_calling=False)
 
         # Run the project specific linting
         log.debug(f'Running linting of {template_handle}')
@@ -65,24 +74,29 @@ def lint_project(project_dir: str, skip_external: bool, is_create: bool = False)
         # for every python project that is created autopep8 will run one time
         # when linting en existing python cookietemple project, autopep8 should be now optional,
         # since (for example) it messes up Jinja syntax (if included in project)
-        if 'python' in template_handle:
-            lint_obj.lint(is_create, skip_external)  # type: ignore
-        else:
-            lint_obj.lint(skip_external)  # type: ignore
+        with span(f'lint.{template_handle}'):
+            if 'python' in template_handle:
+                lint_obj.lint(is_create, skip_external)  # type: ignore
+            else:
+                lint_obj.lint(skip_external)  # type: ignore
     except AssertionError as e:
         print(f'[bold red]Critical error: {e}')
         print('[bold red] Stopping tests...')
         return lint_obj
+    finally:
+        if lint_obj.cache is not None:
+            lint_obj.cache.save()
 
     # Print the results
-    lint_obj.print_results()
+    with span('lint.report'):
+        lint_obj.print_results()
 
     # Exit code
     if len(lint_obj.failed) > 0:
         print(f'[bold red] {len(lint_obj.failed)} tests failed! Exiting with non-zero error code.')
         sys.exit(1)
 
-    return None
+    return lint_obj
 
 
 def get_template_handle(dot_cookietemple_path: str = '.cookietemple.yml') -> str:
@@ -0,0 +1,183 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import cookietemple
+from cookietemple.lint.content_scanner import ContentRule
+
+log = logging.getLogger(__name__)
+
+# name of the directory inside a project, which holds cookietemple's caches
+LINT_CACHE_DIR = '.cookietemple_cache'
+LINT_CACHE_FILE = 'lint.db'
+
+# identifies the version matching rule of check_version_match; change it whenever the rule changes to invalidate all cached results
+VERSION_MATCH_RULE = r'version_match:(?<!\.)\d+(?:\.\d+){2}(?:-SNAPSHOT)?(?!\.):<<COOKIETEMPLE_NO_BUMP>>:<<COOKIETEMPLE_FORCE_BUMP>>'
+
+# files modified less than this many seconds before being cached are always rehashed, since their mtime may not change on a following write
+RACY_MTIME_WINDOW = 2
+
+
+class LintCache:
+    """
+    Persistent cache of per file linting results keyed by the files content digest.
+    All entries are loaded into memory once and written back in a single transaction by save, so the cache may be used by concurrently running
+    linting functions.
+
+    :attribute project_dir: Path to the project the cache belongs to
+    :attribute db_path: Path to the sqlite database of the cache
+    :attribute fingerprint: Hash of the cookietemple version and the rule set; any change invalidates all entries
+    """
+
+    def __init__(self, project_dir: str, content_rules: List[ContentRule]):
+        self.project_dir = project_dir
+        self.db_path = os.path.join(project_dir, LINT_CACHE_DIR, LINT_CACHE_FILE)
+        self.fingerprint = LintCache.rule_set_fingerprint(content_rules)
+        self.entries: Dict[Tuple[str, str], Tuple[int, int, str, str]] = {}
+        self.touched: Dict[Tuple[str, str], Tuple[int, int, str, str]] = {}
+        self.pending: Dict[Tuple[str, str], Tuple[int, int, str]] = {}
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.load()
+
+    @staticmethod
+    def rule_set_fingerprint(content_rules: List[ContentRule]) -> str:
+        """
+        Compute a fingerprint of the cookietemple version and all rules whose results are cached.
+
+        :param content_rules: The content rules of the linter
+        :return: The fingerprint as hex digest
+        """
+        rules: List[Any] = [[rule.rule_id, rule.lint_code, rule.pattern.pattern if rule.pattern is not None else None, list(rule.needles),
+                             rule.honor_ignore, list(rule.skip_suffixes),
+                             f'{rule.callback.__module__}.{rule.callback.__qualname__}' if rule.callback is not None else None]
+                            for rule in content_rules]
+        signature = json.dumps([cookietemple.__version__, VERSION_MATCH_RULE, rules])
+        return hashlib.sha256(signature.encode('utf-8')).hexdigest()
+
+    def load(self) -> None:
+        """
+        Load all entries of the cache database. Entries created by another cookietemple version or rule set are discarded.
+        """
+        if not os.path.isfile(self.db_path):
+            return
+        try:
+            with sqlite3.connect(self.db_path) as connection:
+                row = connection.execute('SELECT value FROM meta WHERE key = ?', ('fingerprint',)).fetchone()
+                if not row or row[0] != self.fingerprint:
+                    log.debug('cookietemple version or linting rules changed. Invalidating lint cache.')
+                    return
+                for scope, key, mtime_ns, size, digest, findings in connection.execute('SELECT scope, key, mtime_ns, size, digest, findings FROM entries'):
+                    self.entries[(scope, key)] = (mtime_ns, size, digest, findings)
+            log.debug(f'Loaded {len(self.entries)} lint cache entries from {self.db_path}.')
+        except sqlite3.DatabaseError as e:
+            log.debug(f'Unable to read lint cache at {self.db_path}: {e}. Ignoring it.')
+            self.entries = {}
+
+    def save(self) -> None:
+        """
+        Write all entries used during this linting run to the cache database. Entries of files that were not linted anymore are dropped.
+        """
+        with self.lock:
+            cache_dir = os.path.dirname(self.db_path)
+            try:
+                os.makedirs(cache_dir, exist_ok=True)
+                # never let the cache show up as untracked files of the project
+                gitignore_path = os.path.join(cache_dir, '.gitignore')
+                if not os.path.exists(gitignore_path):
+                    with open(gitignore_path, 'w') as f:
+                        f.write('# Created by cookietemple lint\n*\n')
+                with sqlite3.connect(self.db_path) as connection:
+                    connection.execute('CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)')
+                    connection.execute('CREATE TABLE IF NOT EXISTS entries (scope TEXT, key TEXT, mtime_ns INTEGER, size INTEGER, digest TEXT, findings TEXT, '
+                                       'PRIMARY KEY (scope, key))')
+                    connection.execute('DELETE FROM entries')
+                    connection.executemany('INSERT INTO entries VALUES (?, ?, ?, ?, ?, ?)',
+                                           [(scope, key, *entry) for (scope, key), entry in self.touched.items()])
+                    connection.execute('INSERT OR REPLACE INTO meta VALUES (?, ?)', ('fingerprint', self.fingerprint))
+                log.debug(f'Saved {len(self.touched)} lint cache entries to {self.db_path} ({self.hits} hits, {self.misses} misses).')
+            except (OSError, sqlite3.DatabaseError) as e:
+                log.debug(f'Unable to write lint cache to {self.db_path}: {e}')
+
+    def lookup(self, scope: str, key: str, file_path: str) -> Tuple[Optional[Any], Optional[bytes]]:
+        """
+        Look up the cached findings of a file. The file is only read, if its mtime or size changed since it was cached.
+
+        :param scope: The scope of the findings (like the linting function they belong to)
+        :param key: The key of the file inside the scope (usually its path relative to the project)
+        :param file_path: Path to the file
+        :return: The cached findings (None on a cache miss) and the files content, if it had to be read to compute its digest
+        """
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None, None
+        with self.lock:
+            entry = self.entries.get((scope, key))
+        if entry is not None and entry[0] == stat.st_mtime_ns and entry[1] == stat.st_size:
+            return self._hit(scope, key, entry), None
+        try:
+            with open(file_path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            return None, None
+        digest = hashlib.blake2b(data, digest_size=20).hexdigest()
+        mtime_ns = LintCache.trusted_mtime(stat.st_mtime_ns)
+        with self.lock:
+            self.pending[(scope, key)] = (mtime_ns, stat.st_size, digest)
+        if entry is not None and entry[2] == digest:
+            return self._hit(scope, key, (mtime_ns, stat.st_size, digest, entry[3])), data
+        with self.lock:
+            self.misses += 1
+
+        return None, data
+
+    def store(self, scope: str, key: str, file_path: str, findings: Any) -> None:
+        """
+        Store the findings of a file, which was looked up before.
+
+        :param scope: The scope of the findings
+        :param key: The key of the file inside the scope
+        :param file_path: Path to the file
+        :param findings: JSON serializable findings
+        """
+        with self.lock:
+            state = self.pending.pop((scope, key), None)
+        if state is None:
+            try:
+                stat = os.stat(file_path)
+                with open(file_path, 'rb') as f:
+                    digest = hashlib.blake2b(f.read(), digest_size=20).hexdigest()
+            except OSError:
+                return
+            state = (LintCache.trusted_mtime(stat.st_mtime_ns), stat.st_size, digest)
+        entry = (*state, json.dumps(findings))
+        with self.lock:
+            self.entries[(scope, key)] = entry
+            self.touched[(scope, key)] = entry
+
+    def _hit(self, scope: str, key: str, entry: Tuple[int, int, str, str]) -> Any:
+        """
+        Record a cache hit and return its findings.
+        """
+        with self.lock:
+            self.hits += 1
+            self.touched[(scope, key)] = entry
+
+        return json.loads(entry[3])
+
+    @staticmethod
+    def trusted_mtime(mtime_ns: int) -> int:
+        """
+        Return the mtime to store for a file. The mtime of recently modified files is not trusted (stored as 0), so they are rehashed on the next run.
+
+        :param mtime_ns: The files mtime in nanoseconds
+        :return: The mtime to store
+        """
+        return 0 if time.time() - mtime_ns / 1e9 < RACY_MTIME_WINDOW else mtime_ns
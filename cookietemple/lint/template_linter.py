@@ -1,10 +1,12 @@
-import io
 import logging
 import os
 import re
 import configparser
+import copy
 import sys
-from typing import Tuple
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Optional, Tuple
 
 import rich.progress
 import rich.markdown
@@ -15,10 +17,46 @@ from packaging import version
 from itertools import groupby
 
 from cookietemple.util.dir_util import pf
+from cookietemple.common.profiling import span
+from cookietemple.lint.content_scanner import ContentRule, ContentScanner
+from cookietemple.lint.lint_cache import LintCache, LINT_CACHE_DIR
 
 log = logging.getLogger(__name__)
 
 
+def _todo_message(fname: str, line: str, match) -> Optional[str]:
+    """
+    Build the general-3 message for a line containing a cookietemple TODO string.
+    """
+    if not any(todostring in line for todostring in ['TODO COOKIETEMPLE:', 'COOKIETEMPLE TODO:']):
+        return None
+    line = line.replace('<!--', '') \
+        .replace('-->', '') \
+        .replace('# TODO COOKIETEMPLE: ', '') \
+        .replace('// TODO COOKIETEMPLE: ', '') \
+        .replace('TODO COOKIETEMPLE: ', '').replace('# COOKIETEMPLE TODO: ', '') \
+        .replace('// COOKIETEMPLE TODO: ', '') \
+        .replace('COOKIETEMPLE TODO: ', '') \
+        .strip()
+    return f'TODO string found in `{fname}`: {line}'
+
+
+def _cookiecutter_string_message(fname: str, line: str, match) -> Optional[str]:
+    """
+    Build the general-4 message for a line containing a raw cookiecutter string.
+    """
+    line = f'{line[:50 - len(fname)]}..'
+    return f'Cookiecutter string found in \'{fname}\': {line}'
+
+
+# Content rules, which are all applied in a single pass over the project's files
+TODO_RULE = ContentRule(rule_id='cookietemple_todos', lint_code='general-3', callback=_todo_message,
+                        needles=['TODO COOKIETEMPLE:', 'COOKIETEMPLE TODO:'], honor_ignore=True)
+# TODO We should also add some of the more advanced cookiecutter if statements, raw statements etc
+COOKIECUTTER_STRING_RULE = ContentRule(rule_id='no_cookiecutter_strings', lint_code='general-4', pattern=r'{\s?.* cookiecutter.*\s?}',  # noqa W605
+                                       callback=_cookiecutter_string_message, needles=['cookiecutter'], skip_suffixes=['.pyc'])
+
+
 class TemplateLinter(object):
     """Object to hold linting information and results.
     Attributes:
@@ -27,14 +65,23 @@ class TemplateLinter(object):
         failed (list): A list of tuples of the form: `(<error no>, <reason>)`
         passed (list): A list of tuples of the form: `(<passed no>, <reason>)`
         warned (list): A list of tuples of the form: `(<warned no>, <reason>)`
+        jobs (int): Number of check functions that are run concurrently
+        cache (LintCache): Optional persistent cache of per file results; files with unchanged content are not linted again
     """
 
+    content_rules: List[ContentRule] = [TODO_RULE, COOKIECUTTER_STRING_RULE]
+
     def __init__(self, path='.'):
         self.path = path
         self.files = []
         self.passed = []
         self.warned = []
         self.failed = []
+        self.jobs = 1
+        self.cache: Optional[LintCache] = None
+        # shared (not copied) by the shadow linters of concurrently running check functions
+        self._content_findings: Dict[str, List[str]] = {}
+        self._content_lock = threading.Lock()
 
     def lint_project(self, calling_class, check_functions: list = None, custom_check_files: bool = False, is_subclass_calling=True) -> None:
         """Main linting function.
@@ -61,6 +108,8 @@ class TemplateLinter(object):
         if custom_check_files:
             check_functions.remove('check_files_exist')
             check_functions.remove('lint_changelog')
+        # always run (and report) the checks in the same order
+        check_functions = sorted(check_functions)
 
         progress = rich.progress.Progress(
             "[bold green]{task.description}",
@@ -71,13 +120,86 @@ class TemplateLinter(object):
             lint_progress = progress.add_task(
                 "Running lint checks", total=len(check_functions), func_name=check_functions
             )
-            for fun_name in check_functions:
-                log.debug(f'Running linting function: {fun_name}')
-                progress.update(lint_progress, advance=1, func_name=fun_name)
-                if fun_name == 'check_files_exist':
-                    getattr(calling_class, fun_name)(is_subclass_calling)
-                else:
-                    getattr(calling_class, fun_name)()
+            if self.jobs > 1 and len(check_functions) > 1:
+                self._run_checks_concurrently(calling_class, check_functions, is_subclass_calling, progress, lint_progress)
+            else:
+                for fun_name in check_functions:
+                    log.debug(f'Running linting function: {fun_name}')
+                    progress.update(lint_progress, advance=1, func_name=fun_name)
+                    TemplateLinter._run_check(calling_class, fun_name, is_subclass_calling)
+
+    def _run_checks_concurrently(self, calling_class, check_functions: list, is_subclass_calling: bool, progress, lint_progress) -> None:
+        """
+        Run the check functions in a thread pool of size jobs.
+        Every check runs on a shadow copy of the linter with its own result lists. The results are merged back in the order of check_functions
+        once all checks finished, so the output does not depend on which check finishes first.
+
+        :param calling_class: The class (or super object) that calls the linting
+        :param check_functions: The names of the check functions to run
+        :param is_subclass_calling: Indicates whether a domain specific linter calls the linting or not
+        :param progress: The rich progress bar
+        :param lint_progress: The task of the progress bar that is advanced for every finished check
+        """
+        linter = calling_class.__self__ if isinstance(calling_class, super) else calling_class
+        shadows = {fun_name: linter._shadow_copy() for fun_name in check_functions}
+        # the attributes of every shadow before its check ran, to merge back only what the check changed
+        snapshots = {fun_name: dict(vars(shadow)) for fun_name, shadow in shadows.items()}
+
+        def run(fun_name: str) -> str:
+            log.debug(f'Running linting function: {fun_name}')
+            shadow = shadows[fun_name]
+            shadow_calling_class = super(calling_class.__thisclass__, shadow) if isinstance(calling_class, super) else shadow
+            TemplateLinter._run_check(shadow_calling_class, fun_name, is_subclass_calling)
+            return fun_name
+
+        with ThreadPoolExecutor(max_workers=min(self.jobs, len(check_functions))) as executor:
+            futures = [executor.submit(run, fun_name) for fun_name in check_functions]
+            for future in as_completed(futures):
+                # re-raises exceptions (like SystemExit or AssertionError) of the check in the main thread
+                progress.update(lint_progress, advance=1, func_name=future.result())
+
+        for fun_name in check_functions:
+            linter._merge_shadow(shadows[fun_name], snapshots[fun_name])
+
+    def _shadow_copy(self) -> 'TemplateLinter':
+        """
+        Create a shallow copy of the linter with empty result lists, which a single check function can safely write its results to.
+
+        :return: The shadow linter
+        """
+        shadow = copy.copy(self)
+        shadow.passed, shadow.warned, shadow.failed = [], [], []
+        return shadow
+
+    def _merge_shadow(self, shadow: 'TemplateLinter', snapshot: dict) -> None:
+        """
+        Merge the results and the attributes set by a check function from its shadow linter back into this linter.
+        Only attributes the check added or reassigned are merged, so that a shadow never reverts an attribute another check set.
+
+        :param shadow: The shadow linter a check function ran on
+        :param snapshot: The attributes of the shadow linter before the check function ran
+        """
+        self.passed.extend(shadow.passed)
+        self.warned.extend(shadow.warned)
+        self.failed.extend(shadow.failed)
+        for attribute, value in vars(shadow).items():
+            if attribute not in ('passed', 'warned', 'failed') and (attribute not in snapshot or snapshot[attribute] is not value):
+                setattr(self, attribute, value)
+
+    @staticmethod
+    def _run_check(calling_class, fun_name: str, is_subclass_calling: bool) -> None:
+        """
+        Run a single check function.
+
+        :param calling_class: The class (or super object) the check function is looked up on
+        :param fun_name: Name of the check function
+        :param is_subclass_calling: Indicates whether a domain specific linter calls the linting or not
+        """
+        with span(f'lint.check.{fun_name}'):
+            if fun_name == 'check_files_exist':
+                getattr(calling_class, fun_name)(is_subclass_calling)
+            else:
+                getattr(calling_class, fun_name)()
 
     def check_files_exist(self, is_subclass_calling=True):
         """Checks a given project directory for required files.
@@ -196,47 +318,13 @@ class TemplateLinter(object):
         """
         Go through all template files looking for the string 'TODO COOKIETEMPLE:' or 'COOKIETEMPLE TODO:'
         """
-        ignore = ['.git']
-        if os.path.isfile(os.path.join(self.path, '.gitignore')):
-            with io.open(os.path.join(self.path, '.gitignore'), 'rt', encoding='latin1') as file:
-                for line in file:
-                    ignore.append(os.path.basename(line.strip().rstrip('/')))
-        for root, dirs, files in os.walk(self.path):
-            # Ignore files
-            for ignore_file in ignore:
-                if ignore_file in dirs:
-                    dirs.remove(ignore_file)
-                if ignore_file in files:
-                    files.remove(ignore_file)
-            for fname in files:
-                with io.open(os.path.join(root, fname), 'rt', encoding='latin1') as file:
-                    for line in file:
-                        if any(todostring in line for todostring in ['TODO COOKIETEMPLE:', 'COOKIETEMPLE TODO:']):
-                            line = line.replace('<!--', '') \
-                                .replace('-->', '') \
-                                .replace('# TODO COOKIETEMPLE: ', '') \
-                                .replace('// TODO COOKIETEMPLE: ', '') \
-                                .replace('TODO COOKIETEMPLE: ', '').replace('# COOKIETEMPLE TODO: ', '') \
-                                .replace('// COOKIETEMPLE TODO: ', '') \
-                                .replace('COOKIETEMPLE TODO: ', '') \
-                                .strip()
-                            self.warned.append(('general-3', f'TODO string found in {self._wrap_quotes(fname)}: {line}'))
+        self._report_content_findings(TODO_RULE)
 
     def check_no_cookiecutter_strings(self) -> None:
         """
         Verifies that no cookiecutter strings are in any of the files
         """
-        for root, dirs, files in os.walk(self.path):
-            for fname in files:
-                with io.open(os.path.join(root, fname), 'rt', encoding='latin1') as file:
-                    if file.name.endswith('.pyc'):
-                        continue
-                    for line in file:
-                        # TODO We should also add some of the more advanced cookiecutter if statements, raw statements etc
-                        regex = re.compile(r'{\s?.* cookiecutter.*\s?}')  # noqa W605
-                        if regex.search(line):
-                            line = f'{line[:50 - len(fname)]}..'
-                            self.warned.append(('general-4', f'Cookiecutter string found in \'{fname}\': {line}'))
+        self._report_content_findings(COOKIECUTTER_STRING_RULE)
 
     def check_version_consistent(self) -> None:
         """
@@ -248,14 +336,11 @@ class TemplateLinter(object):
 
         try:
             current_version = parser.get('bumpversion', 'current_version')
-            cwd = os.getcwd()
-            os.chdir(self.path)
 
             # check if the version matches current version in each listed file (depending on whitelisted or blacklisted)
             for section in sections:
                 for file, path in parser.items(section):
                     self.check_version_match(path, current_version, section)
-            os.chdir(cwd)
             # Pass message if there weren't any inconsistencies within the version numbers
             if not any('general-5' in tup[0] for tup in self.failed):
                 self.passed.append(('general-5', 'Versions were consistent over all files'))
@@ -265,11 +350,19 @@ class TemplateLinter(object):
     def check_version_match(self, path: str, version: str, section: str) -> None:
         """
         Check if the versions in a file are consistent with the current version in the cookietemple.cfg
-        :param path: The current file-path to check
+        :param path: The current file-path to check (relative to the project directory or absolute)
         :param version: The current version of the project specified in the cookietemple.cfg file
         :param section: The current section (blacklisted or whitelisted files)
         """
-        with open(path) as file:
+        file_path = os.path.join(self.path, path)
+        cache_scope = f'version_match:{section}:{version}'
+        if self.cache is not None:
+            cached, _ = self.cache.lookup(cache_scope, path, file_path)
+            if cached is not None:
+                self.failed.extend(tuple(finding) for finding in cached)
+                return
+        findings = []
+        with open(file_path) as file:
             for line in file:
                 # if a tag is found and (depending on wether it is a white or blacklisted file) check if the versions are matching
                 if ('<<COOKIETEMPLE_NO_BUMP>>' not in line and not section == 'bumpversion_files_blacklisted') or '<<COOKIETEMPLE_FORCE_BUMP>>' in line:
@@ -279,7 +372,10 @@ class TemplateLinter(object):
                         # No match between the current version number and version in source code file
                         if line_version != version:
                             corrected_line = re.sub(r'(?<!\.)\d+(?:\.\d+){2}(?:-SNAPSHOT)?(?!\.)', version, line)
-                            self.failed.append(('general-5', f'Version number don´t match in\n {path}: \n {line.strip()} should be {corrected_line.strip()}'))
+                            findings.append(('general-5', f'Version number don´t match in\n {path}: \n {line.strip()} should be {corrected_line.strip()}'))
+        self.failed.extend(findings)
+        if self.cache is not None:
+            self.cache.store(cache_scope, path, file_path, findings)
 
     def print_results(self):
         console = rich.console.Console()
@@ -318,6 +414,30 @@ class TemplateLinter(object):
             console.rule("[bold red][[\u2717]] Test Failures", style="red")
             console.print(rich.panel.Panel(format_result(self.failed), style="red"), no_wrap=True, overflow="ellipsis")
 
+    def _scan_contents(self) -> Dict[str, List[str]]:
+        """
+        Run all content rules of this linter in a single pass over the project's files.
+        The pass is only executed once; all following calls return the collected findings.
+
+        :return: A dictionary mapping the rule ids to the messages of their findings
+        """
+        with self._content_lock:
+            if not self._content_findings:
+                log.debug(f'Scanning the content of all files at {self.path}.')
+                scanner = ContentScanner(self.path, self.content_rules, exclude=[LINT_CACHE_DIR], cache=self.cache)
+                self._content_findings.update(scanner.scan())
+
+        return self._content_findings
+
+    def _report_content_findings(self, rule: ContentRule) -> None:
+        """
+        Append the findings of a single content rule as warnings.
+
+        :param rule: The rule whose findings should be reported
+        """
+        for message in self._scan_contents().get(rule.rule_id, []):
+            self.warned.append((rule.lint_code, message))
+
     def _wrap_quotes(self, files):
         if not isinstance(files, list):
             files = [files]
@@ -8,7 +8,7 @@ from rich.box import HEAVY_HEAD
 from rich import print
 
 from cookietemple.util.dict_util import is_nested_dictionary
-from cookietemple.common.load_yaml import load_yaml_file
+from cookietemple.common.template_registry import TemplateRegistry
 
 log = logging.getLogger(__name__)
 
@@ -28,7 +28,7 @@ class TemplateLister:
         Omits long descriptions.
         """
         log.debug(f'Reading available_templates.yml at {self.TEMPLATES_PATH}/available_templates.yml')
-        available_templates = load_yaml_file(f'{self.TEMPLATES_PATH}/available_templates.yml')
+        available_templates = TemplateRegistry.load(f'{self.TEMPLATES_PATH}/available_templates.yml').available_templates
         print('[bold blue]Run [green]cookietemple info [blue]for long descriptions of your template of interest')
         print()
 
@@ -0,0 +1,229 @@
+import bisect
+import hashlib
+import json
+import logging
+import math
+import os
+import re
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from rich.style import Style
+from rich.console import Console
+from rich.table import Table
+from rich.box import HEAVY_HEAD
+from rich import print
+
+from cookietemple.common import template_registry
+from cookietemple.common.atomic_file import write_json_atomically
+from cookietemple.common.template_registry import AVAILABLE_TEMPLATES_PATH, TemplateRegistry
+
+log = logging.getLogger(__name__)
+
+# increase whenever the layout of the persisted index or the tokenization changes to invalidate all existing indices
+SEARCH_INDEX_FORMAT = 1
+
+# the weight of a token depending on the field of the template it occurs in
+FIELD_WEIGHTS = {'handle': 3.0, 'name': 2.0, 'available libraries': 2.0, 'short description': 1.0, 'long description': 0.5}
+
+# factor applied to the score of a token, which is only matched by a prefix of it (like pyth for python)
+PREFIX_PENALTY = 0.5
+
+# tokens consist of letters and digits; + and # are kept to distinguish languages like c++ and c#
+TOKEN_PATTERN = re.compile(r'[a-z0-9+#]+')
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split a text into lowercase tokens.
+
+    :param text: The text
+    :return: The tokens in order of their occurrence
+    """
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+class SearchIndex:
+    """
+    An inverted index over the name, handle, descriptions and available libraries of all templates of a template registry.
+    The index is persisted next to the snapshot of the registry and rebuilt only, if the registry changed.
+
+    :attribute digest: sha256 hex digest of the available_templates.yml file the index was built from
+    :attribute postings: The weighted number of occurrences of every token by the handles of the templates it occurs in
+    :attribute vocabulary: All tokens in sorted order to look up the tokens starting with a prefix
+    """
+
+    def __init__(self, digest: str, postings: Dict[str, Dict[str, float]]):
+        self.digest = digest
+        self.postings = postings
+        self.vocabulary = sorted(postings)
+        self.documents = len({handle for handles in postings.values() for handle in handles})
+
+    @classmethod
+    def build(cls, registry: TemplateRegistry) -> 'SearchIndex':
+        """
+        Build the index of all templates of a registry.
+
+        :param registry: The template registry
+        :return: The index
+        """
+        log.debug(f'Building search index of {registry.path}.')
+        postings: Dict[str, Dict[str, float]] = {}
+        for handle, template in registry.templates_by_handle.items():
+            for field, weight in FIELD_WEIGHTS.items():
+                tokens = tokenize(str(template.get(field, '')))
+                # the full handle is a token on its own, so that searching for cli-python ranks this very template first
+                if field == 'handle':
+                    tokens.append(handle)
+                for token in tokens:
+                    handles = postings.setdefault(token, {})
+                    handles[handle] = handles.get(handle, 0.0) + weight
+
+        return cls(registry.digest, postings)
+
+    @classmethod
+    def index_path(cls, path: str) -> str:
+        """
+        Path to the persisted search index of an available_templates.yml file.
+
+        :param path: Path to the available_templates.yml file
+        :return: Path to the index
+        """
+        path_digest = hashlib.sha256(path.encode('utf-8')).hexdigest()[:16]
+
+        return os.path.join(template_registry.REGISTRY_CACHE_DIR, f'search-{path_digest}.json')
+
+    @classmethod
+    def load(cls, registry: TemplateRegistry) -> 'SearchIndex':
+        """
+        Load the persisted index of a registry or build (and persist) it, if there is none or it belongs to another version of the registry.
+
+        :param registry: The template registry
+        :return: The index
+        """
+        index_path = cls.index_path(registry.path)
+        try:
+            with open(index_path) as f:
+                persisted = json.load(f)
+            if persisted['format'] == SEARCH_INDEX_FORMAT and persisted['digest'] == registry.digest:
+                log.debug(f'Loading search index of {registry.path}.')
+                return cls(persisted['digest'], persisted['postings'])
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+        index = cls.build(registry)
+        index.store(index_path)
+
+        return index
+
+    def store(self, index_path: str) -> None:
+        """
+        Persist the index.
+
+        :param index_path: Path to the index
+        """
+        try:
+            write_json_atomically({'format': SEARCH_INDEX_FORMAT, 'digest': self.digest, 'postings': self.postings}, index_path)
+        except OSError as e:
+            log.debug(f'Unable to store search index at {index_path}: {e}')
+
+    def matching_tokens(self, term: str) -> List[Tuple[str, float]]:
+        """
+        Find all tokens matching a query term, which are the term itself and all tokens it is a prefix of.
+
+        :param term: A single (tokenized) query term
+        :return: The matching tokens with the factor applied to their score
+        """
+        start = bisect.bisect_left(self.vocabulary, term)
+        tokens = []
+        for token in self.vocabulary[start:]:
+            if not token.startswith(term):
+                break
+            tokens.append((token, 1.0 if token == term else PREFIX_PENALTY))
+
+        return tokens
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[Tuple[str, float]]:
+        """
+        Rank all templates by how well they match a keyword query.
+        Every query term is scored by its best matching token per template, weighted by the inverse document frequency of the token.
+        Templates matching more query terms always rank before those matching fewer terms.
+
+        :param query: The keywords separated by whitespace
+        :param limit: The maximum number of results; all matching templates if None
+        :return: The handles of all matching templates and their scores, best match first
+        """
+        terms = list(dict.fromkeys(token for word in query.split() for token in (tokenize(word) + [word.lower()])))
+        scores: Dict[str, float] = {}
+        matched_terms: Dict[str, int] = {}
+        for term in terms:
+            term_scores: Dict[str, float] = {}
+            for token, factor in self.matching_tokens(term):
+                handles = self.postings[token]
+                idf = math.log(1 + self.documents / len(handles))
+                for handle, weight in handles.items():
+                    term_scores[handle] = max(term_scores.get(handle, 0.0), factor * weight * idf)
+            for handle, score in term_scores.items():
+                scores[handle] = scores.get(handle, 0.0) + score
+                matched_terms[handle] = matched_terms.get(handle, 0) + 1
+        ranking = sorted(scores.items(), key=lambda result: (-matched_terms[result[0]], -result[1], result[0]))
+
+        return ranking[:limit] if limit is not None else ranking
+
+
+@lru_cache(maxsize=4)
+def registry_search_index(registry: TemplateRegistry) -> SearchIndex:
+    """
+    Load the search index of a template registry once per registry.
+
+    :param registry: The template registry
+    :return: The index
+    """
+    return SearchIndex.load(registry)
+
+
+class TemplateSearcher:
+    """
+    Search all available cookietemple templates by keywords and present the results in a nice layout
+    """
+
+    def __init__(self, templates_path: str = AVAILABLE_TEMPLATES_PATH):
+        self.TEMPLATES_PATH = templates_path
+
+    def search_templates(self, query: str) -> List[str]:
+        """
+        Rank all available templates by a keyword query.
+
+        :param query: The keywords separated by whitespace
+        :return: The handles of all matching templates, best match first
+        """
+        registry = TemplateRegistry.load(self.TEMPLATES_PATH)
+
+        return [handle for handle, _ in registry_search_index(registry).search(query)]
+
+    def show_results(self, query: str) -> None:
+        """
+        Displays all templates matching a keyword query, best match first.
+
+        :param query: The keywords separated by whitespace
+        """
+        handles = self.search_templates(query)
+        if not handles:
+            print(f'[bold red]No templates match [green]{query}[red].\n[bold blue]Run [green]cookietemple list [blue]for an overview of all templates.')
+            return
+        registry = TemplateRegistry.load(self.TEMPLATES_PATH)
+
+        table = Table(title=f'[bold]Templates matching {query}', title_style="blue", header_style=Style(color="blue", bold=True), box=HEAVY_HEAD)
+
+        table.add_column("Name", justify="left", style="green", no_wrap=True)
+        table.add_column("Handle", justify="left")
+        table.add_column("Short Description", justify="left")
+        table.add_column("Available Libraries", justify="left")
+        table.add_column("Version", justify="left")
+
+        for handle in handles:
+            template = registry.template(handle)
+            table.add_row(f'[bold]{template["name"]}', handle, f'{template["short description"]}\n', template['available libraries'], template['version'])
+
+        log.debug('Printing search results table.')
+        console = Console()
+        console.print(table)
@@ -0,0 +1,208 @@
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from rich import print
+from rich.box import HEAVY_HEAD
+from rich.console import Console
+from rich.style import Style
+from rich.table import Table
+
+from cookietemple.common.load_yaml import load_yaml_file
+from cookietemple.common.template_registry import TemplateRegistry
+from cookietemple.create.batch import ThreadOutput
+from cookietemple.create.render_engine import RenderEngine
+from cookietemple.custom_cli.questionary import InvalidAnswerError
+from cookietemple.sync.render_cache import RenderCache
+from cookietemple.sync.sync import TemplateSync
+
+log = logging.getLogger(__name__)
+
+# directories, which are never searched for projects
+SKIPPED_DIRECTORIES = {'node_modules', '__pycache__', 'venv'}
+
+
+@dataclass
+class FleetResult:
+    """
+    The outcome of syncing a single project of a fleet.
+    """
+    index: int  # position of the project in the fleet
+    project_dir: Path  # top level directory of the project
+    handle: str = ''  # handle of the project's template (if known)
+    status: str = 'failed'  # either synced, up-to-date, level-blocked or failed
+    project_template_version: str = ''  # template version of the project's last sync
+    template_version: str = ''  # current version of the template
+    seconds: float = 0.0  # time spent on syncing the project
+    error: str = ''  # reason of a failed sync
+    output: str = ''  # everything the sync printed
+
+
+def load_fleet(fleet: str) -> List[Path]:
+    """
+    Load the top level directories of all projects of a fleet.
+    A fleet is either a YAML manifest listing the project directories below projects (relative to the manifest) or a directory,
+    which is searched for projects.
+
+    :param fleet: Path to the manifest or the directory
+    :return: The top level directories of all projects
+    :raises InvalidAnswerError: if the manifest does not contain a list of projects or the directory does not contain any project
+    """
+    if os.path.isdir(fleet):
+        project_dirs = discover_projects(Path(fleet))
+        if not project_dirs:
+            raise InvalidAnswerError(f'The directory {fleet} does not contain any cookietemple project.')
+        return project_dirs
+    manifest = load_yaml_file(fleet)
+    if not isinstance(manifest, dict) or not isinstance(manifest.get('projects'), list) or not manifest['projects']:
+        raise InvalidAnswerError(f'The manifest {fleet} must contain a list of projects.')
+    manifest_dir = Path(fleet).resolve().parent
+    # a project is either its directory or a dictionary with its directory below path
+    project_dirs = [project.get('path', '') if isinstance(project, dict) else project for project in manifest['projects']]
+
+    return [(manifest_dir / str(project_dir)).resolve() for project_dir in project_dirs]
+
+
+def discover_projects(directory: Path) -> List[Path]:
+    """
+    Find all cookietemple projects (directories containing a .cookietemple.yml file) below a directory.
+    Projects are not searched for nested projects; hidden directories are skipped.
+
+    :param directory: The directory to search
+    :return: The top level directories of all projects, sorted by their path
+    """
+    project_dirs = []
+    for root, dirs, files in os.walk(directory.resolve()):
+        if '.cookietemple.yml' in files:
+            project_dirs.append(Path(root))
+            dirs.clear()
+            continue
+        dirs[:] = [name for name in dirs if not name.startswith('.') and name not in SKIPPED_DIRECTORIES]
+
+    return sorted(project_dirs)
+
+
+def sync_fleet(project_dirs: List[Path], gh_username: str, token: str, workers: int = 1) -> List[FleetResult]:
+    """
+    Sync all projects of a fleet by a pool of workers. A failing project does not stop the others.
+    All projects share the Github credentials, a single pooled session for the Github API and a cache of rendered template projects,
+    so that projects of the same template and answers are rendered only once.
+    The output of every project is captured, so that the projects do not garble each other's output.
+
+    :param project_dirs: The top level directories of all projects
+    :param gh_username: Github username
+    :param token: Github personal access token
+    :param workers: Number of projects synced concurrently
+    :return: The results of all projects in the order of the fleet
+    """
+    # load everything shared by all projects up front, instead of by all workers at once
+    TemplateRegistry.load()
+    RenderEngine.get()
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=workers)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    render_cache = RenderCache()
+    output = ThreadOutput(sys.stdout)
+
+    def sync_project(index: int, project_dir: Path) -> FleetResult:
+        result = FleetResult(index=index, project_dir=project_dir)
+        # projects listed twice would be synced concurrently
+        if project_dirs.index(project_dir) != index - 1:
+            result.error = f'Duplicate of project {project_dirs.index(project_dir) + 1}'
+            return result
+        buffer = output.capture()
+        start = time.perf_counter()
+        try:
+            sync_fleet_project(result, gh_username, token, session, render_cache)
+        except (Exception, SystemExit) as e:
+            result.status = 'failed'
+            result.error = f'Aborted with exit code {e.code}' if isinstance(e, SystemExit) else str(e) or e.__class__.__name__
+            log.debug(f'Syncing project {project_dir} of the fleet failed: {e}')
+        finally:
+            result.seconds = time.perf_counter() - start
+            output.release()
+            result.output = buffer.getvalue()
+
+        return result
+
+    sys.stdout = output  # type: ignore
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(sync_project, range(1, len(project_dirs) + 1), project_dirs))
+    finally:
+        sys.stdout = output.stdout
+        session.close()
+        log.debug(f'Rendered {render_cache.misses} template projects for the fleet and reused them {render_cache.hits} times.')
+        render_cache.close()
+
+
+def sync_fleet_project(result: FleetResult, gh_username: str, token: str, session: Optional[requests.Session] = None,
+                       render_cache: Optional[RenderCache] = None) -> None:
+    """
+    Sync a single project of a fleet like cookietemple sync and record the outcome in its result.
+
+    :param result: The result of the project
+    :param gh_username: Github username
+    :param token: Github personal access token
+    :param session: Session of all Github API requests
+    :param render_cache: Cache of rendered template projects
+    """
+    if not os.path.isfile(result.project_dir / '.cookietemple.yml'):
+        raise FileNotFoundError(f'No .cookietemple.yml found at {result.project_dir}. Is this a cookietemple project?')
+    _, result.handle = TemplateSync.sync_load_project_template_version_and_handle(result.project_dir)
+    major_change, minor_change, patch_change, result.project_template_version, result.template_version = \
+        TemplateSync.has_template_version_changed(result.project_dir)
+    if not any((major_change, minor_change, patch_change)):
+        result.status = 'up-to-date'
+        return
+
+    syncer = TemplateSync(project_dir=result.project_dir, new_template_version=result.template_version, gh_username=gh_username, token=token,
+                          major_update=major_change, minor_update=minor_change, patch_update=patch_change)
+    if session is not None:
+        syncer.session = session
+    syncer.render_cache = render_cache
+    if not syncer.check_sync_level():
+        result.status = 'level-blocked'
+        return
+    syncer.sync()
+    result.status = 'synced' if syncer.made_changes else 'up-to-date'
+
+
+def print_fleet_report(results: List[FleetResult], seconds: float) -> None:
+    """
+    Print a table of all projects of a fleet with their sync status, followed by the output of all failed projects.
+
+    :param results: The results of all projects
+    :param seconds: Wall time of the whole fleet sync
+    """
+    table = Table(title='[bold]Fleet sync results', title_style='blue', header_style=Style(color='blue', bold=True), box=HEAVY_HEAD)
+    table.add_column('#', justify='right')
+    table.add_column('Project', justify='left', style='green', no_wrap=True)
+    table.add_column('Handle', justify='left', no_wrap=True)
+    table.add_column('Status', justify='left')
+    table.add_column('Template version', justify='left', no_wrap=True)
+    table.add_column('Time', justify='right')
+    status_colors = {'synced': 'green', 'up-to-date': 'blue', 'level-blocked': 'yellow', 'failed': 'red'}
+    for result in results:
+        versions = f'{result.project_template_version} → {result.template_version}' if result.template_version else ''
+        table.add_row(str(result.index), result.project_dir.name, result.handle, f'[bold {status_colors[result.status]}]{result.status}', versions,
+                      f'{result.seconds:.2f}s')
+    Console().print(table)
+
+    for result in results:
+        if result.status == 'failed':
+            print(f'\n[bold red]Project {result.index} ({result.project_dir}) failed: {result.error}')
+            if result.output.strip():
+                sys.stdout.write(f'{result.output.rstrip()}\n')
+
+    counts = {status: sum(result.status == status for result in results) for status in status_colors}
+    print(f'\n[bold blue]Synced {counts["synced"]} of {len(results)} projects in {seconds:.2f}s. {counts["up-to-date"]} up to date, '
+          f'{counts["level-blocked"]} blocked by their sync level, {counts["failed"]} failed.')
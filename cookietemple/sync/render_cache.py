@@ -0,0 +1,83 @@
+import hashlib
+import json
+import logging
+import shutil
+import tempfile
+import threading
+from pathlib import Path
+from typing import Callable, Dict
+
+log = logging.getLogger(__name__)
+
+# answers of a .cookietemple.yml file, which do not influence the rendered project; the template version is the one of the project's last sync
+IGNORED_CONTEXT_KEYS = {'template_version'}
+
+
+class RenderCache:
+    """
+    Renders every distinct template project only once and shares it between all syncs of a run, like all projects of a fleet.
+    Rendered projects are keyed by their template handle, template version and the remaining answers of their .cookietemple.yml file.
+    Syncs only read the rendered projects, so a single rendering can be used by several threads at once.
+
+    :attribute root: Directory holding all rendered projects; deleted by close
+    :attribute hits: Number of renderings, which were taken from the cache
+    :attribute misses: Number of renderings, which had to be rendered
+    """
+
+    def __init__(self):
+        self.root = tempfile.mkdtemp(prefix='cookietemple-render-')
+        self.hits = 0
+        self.misses = 0
+        self._renders: Dict[str, Path] = {}
+        self._key_locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(dot_cookietemple: dict, template_version: str) -> str:
+        """
+        Build the key of a rendered project.
+
+        :param dot_cookietemple: The answers of the project's .cookietemple.yml file
+        :param template_version: The version of the template the project is rendered with
+        :return: The key
+        """
+        context = json.dumps({key: value for key, value in dot_cookietemple.items() if key not in IGNORED_CONTEXT_KEYS}, sort_keys=True, default=str)
+        key = f'{dot_cookietemple.get("template_handle", "")}\0{template_version}\0{context}'
+
+        return hashlib.sha256(key.encode('utf-8')).hexdigest()[:32]
+
+    def render(self, dot_cookietemple: dict, template_version: str, render: Callable[[Path], None]) -> Path:
+        """
+        Get the directory of a rendered project and render it, if it has not been rendered yet.
+        Concurrent calls for the same project wait for a single rendering.
+
+        :param dot_cookietemple: The answers of the project's .cookietemple.yml file
+        :param template_version: The version of the template the project is rendered with
+        :param render: Function rendering the project into the directory it is passed
+        :return: The directory the project was rendered into
+        """
+        key = RenderCache.key(dot_cookietemple, template_version)
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            if key in self._renders:
+                with self._lock:
+                    self.hits += 1
+                log.debug(f'Using rendered project {key}.')
+                return self._renders[key]
+            path = Path(self.root) / key
+            # remove what a failed rendering of the same project may have left
+            shutil.rmtree(path, ignore_errors=True)
+            render(path)
+            with self._lock:
+                self.misses += 1
+                self._renders[key] = path
+
+        return path
+
+    def close(self) -> None:
+        """
+        Delete all rendered projects.
+        """
+        shutil.rmtree(self.root, ignore_errors=True)
+        self._renders.clear()
@@ -6,15 +6,13 @@ import fnmatch
 import logging
 import sys
 from configparser import ConfigParser, NoSectionError
-from distutils.dir_util import copy_tree
-from subprocess import Popen, PIPE
-from typing import Tuple
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
 
 import git  # type: ignore
 import json
 import os
 import requests
-import shutil
 import tempfile
 from pathlib import Path
 from packaging import version
@@ -22,30 +20,41 @@ from rich import print
 
 from cookietemple.create.github_support import decrypt_pat, load_github_username, create_sync_secret
 from cookietemple.common.load_yaml import load_yaml_file
+from cookietemple.common.git_objects import TreeEntries, commit_tree, hash_work_tree_files, ignored_paths, read_tree, working_tree_files
+from cookietemple.common.profiling import span
 from cookietemple.create.create import choose_domain
-from cookietemple.common.version import load_project_template_version_and_handle, load_ct_template_version
+from cookietemple.common.version import load_branch_template_version_and_handle, load_project_template_version_and_handle, load_ct_template_version
 from cookietemple.config.config import ConfigCommand
+from cookietemple.sync.render_cache import RenderCache
 from cookietemple.custom_cli.questionary import cookietemple_questionary_or_dot_cookietemple
 
 
 log = logging.getLogger(__name__)
 
+GITHUB_API_URL = 'https://api.github.com'
+
 
 class TemplateSync:
     """
     Hold syncing information and results.
 
     project_dir (str): The path to the cookietemple project root directory
-    from_branch (str): Original branch
-    project_dir (str): Path to target project directory
-    from_branch (str): Original branch
-    original_branch (str): Repo branch that was checked out before we started.
+    from_branch (str): Branch of the project, which was checked out when the sync started
+    repo (git.Repo): The repository of the project
+    template_commit (git.Commit): The commit of the TEMPLATE branch the sync is based on
+    template_entries (dict): The tree entries of the new TEMPLATE commit by their paths
+    staged_entries (dict): The tree entries of the files of the freshly created template project by their paths
+    session (requests.Session): Session of all Github API requests; may be shared by several syncs
+    github_api_url (str): Base URL of the Github API
+    render_cache (RenderCache): Cache of rendered template projects shared by several syncs; None to render into a temporary directory
     made_changes (bool): Whether making the new template project introduced any changes
     gh_username (str): GitHub username
     patch_update (bool): Whether a patch update was found for the template or not
     minor_update (bool): Whether a minor update was found for the template or not
     major_update (bool): Whether a major update was found for the template or not
     repo_owner (str): Owner of the repo (either orga name or personal github username)
+    jobs (int): Number of template files rendered concurrently by the dry create run
+    template_diff (dict): The added, modified and deleted paths of the TEMPLATE branch
     """
 
     def __init__(self,
@@ -59,7 +68,9 @@ class TemplateSync:
                  patch_update=False):
         self.project_dir = os.path.abspath(project_dir)
         self.from_branch = from_branch
-        self.original_branch = None
+        self.template_commit = None
+        self.template_entries: TreeEntries = {}
+        self.staged_entries: TreeEntries = {}
         self.made_changes = False
         self.gh_pr_returned_data = {}
         self.major_update = major_update
@@ -70,35 +81,43 @@ class TemplateSync:
         self.dot_cookietemple = {}
         self.repo_owner = self.gh_username
         self.new_template_version = new_template_version
+        self.jobs = 1
+        self.session = requests.Session()
+        self.github_api_url = str(ConfigCommand.load_setting('github_api_url', GITHUB_API_URL)).rstrip('/')
+        self.render_cache: Optional[RenderCache] = None
+        self.template_diff: Dict[str, List[str]] = {}
 
     def sync(self):
         """
         Sync the cookietemple project
         """
-        self.inspect_sync_dir()
-        self.checkout_template_branch()
-        self.delete_template_branch_files()
-        self.make_template_project()
-        self.commit_template_changes()
+        with span('sync.inspect'):
+            self.inspect_sync_dir()
+        with span('sync.resolve_template'):
+            self.resolve_template_branch()
+        with span('sync.make_template'):
+            self.make_template_project()
+        with span('sync.commit'):
+            self.commit_template_changes()
 
         # Push and make a pull request
         if self.made_changes:
             try:
-                self.push_template_branch()
-                self.make_pull_request()
+                with span('sync.push'):
+                    self.push_template_branch()
+                with span('sync.pull_request'):
+                    self.make_pull_request()
             except Exception as e:
-                self.reset_target_dir()
                 print(f'[bold red]{e}')
                 sys.exit(1)
 
-        self.reset_target_dir()
-
         if not self.made_changes:
             print('[bold blue]No changes made to TEMPLATE - sync complete')
 
     def inspect_sync_dir(self):
         """
-        Examines target directory to sync, verifies that it is a git repository and ensures that there are no uncommitted changes.
+        Examines target directory to sync and verifies that it is a git repository.
+        Uncommitted changes do not matter, since the TEMPLATE branch is committed to without checking it out.
         """
         if not os.path.exists(os.path.join(str(self.project_dir), '.cookietemple.yml')):
             print(f'[bold red]{self.project_dir} does not appear to contain a .cookietemple.yml file. Did you delete it?')
@@ -113,109 +132,148 @@ class TemplateSync:
             print(f'[bold red]{self.project_dir} does not appear to be a git repository.')
             sys.exit(1)
 
-        # get current branch so we can switch back later
-        self.original_branch = self.repo.active_branch.name
-        print(f'[bold blue]Original Project repository branch is {self.original_branch}')
-
-        # Check to see if there are uncommitted changes on current branch
-        if self.repo.is_dirty(untracked_files=True):
-            print('[bold red]Uncommitted changes found in Project directory!\nPlease commit these before running cookietemple sync')
-            sys.exit(1)
-
-    def checkout_template_branch(self):
+    def resolve_template_branch(self):
         """
-        Try to check out the origin/TEMPLATE in a new TEMPLATE branch.
-        If this fails, try to check out an existing local TEMPLATE branch.
+        Find the commit the new template commit is based on: origin/TEMPLATE, if there is no local TEMPLATE branch yet, else the local TEMPLATE branch.
+        The branch is never checked out, so that the users checkout (and thereby IDE and build caches) stays untouched.
         """
         try:
             self.from_branch = self.repo.active_branch.name
-        except git.exc.GitCommandError as e:
-            print(f'[bold red]Could not find active repo branch:\n{e}')
-        # Try to check out the `TEMPLATE` branch
+        except TypeError:
+            # detached HEAD
+            self.from_branch = None
+        if self.from_branch == 'TEMPLATE':
+            print('[bold red]The TEMPLATE branch is checked out. Please check out another branch before running cookietemple sync')
+            sys.exit(1)
         try:
-            self.repo.git.checkout('origin/TEMPLATE', b='TEMPLATE')
-        except git.exc.GitCommandError:
-            # Try to check out an existing local branch called TEMPLATE
-            try:
-                self.repo.git.checkout('TEMPLATE')
-            except git.exc.GitCommandError:
-                print('[bold red]Could not check out branch "origin/TEMPLATE" or "TEMPLATE"')
-                sys.exit(1)
+            if 'TEMPLATE' in self.repo.heads:
+                self.template_commit = self.repo.heads.TEMPLATE.commit
+            else:
+                self.template_commit = self.repo.remote('origin').refs.TEMPLATE.commit
+        except (ValueError, IndexError, AttributeError):
+            print('[bold red]Could not find branch "origin/TEMPLATE" or "TEMPLATE"')
+            sys.exit(1)
+        log.debug(f'TEMPLATE branch is at {self.template_commit.hexsha}.')
 
-    def delete_template_branch_files(self):
+    def make_template_project(self):
         """
-        Delete all files in the TEMPLATE branch
+        Create a fresh template project in a staging directory and determine its differences to the TEMPLATE branch.
+        The blobs of its files are written into git's object database (which already holds those of unchanged files); nothing is written to any working tree.
         """
-        # Delete everything
-        print('[bold blue]Deleting all files in TEMPLATE branch')
-        for the_file in os.listdir(self.project_dir):
-            if the_file == '.git':
-                log.debug('Found .git directory. Skipping deleting it.')
-                continue
-            file_path = os.path.join(self.project_dir, the_file)
-            try:
-                if os.path.isfile(file_path):
-                    log.debug(f'Deleting file {file_path}')
-                    os.unlink(file_path)
-                elif os.path.isdir(file_path):
-                    log.debug(f'Deleting directory {file_path}')
-                    shutil.rmtree(file_path)
-            except Exception as e:
-                print(f'[bold red]{e}')
-                sys.exit(1)
+        print('[bold blue]Creating a new template project.')
+        with self.rendered_template_project() as staging_dir:
+            with span('sync.diff'):
+                self.template_diff = self.diff_template_tree(staging_dir)
+        with span('sync.apply'):
+            self.apply_template_diff(self.template_diff)
 
-    def make_template_project(self):
+    @contextmanager
+    def rendered_template_project(self) -> Iterator[str]:
         """
-        Delete all files and make a fresh template.
+        Render the template project by a dry create run from the .cookietemple.yml file, into a temporary directory or taken from the render cache.
+
+        :return: A context manager providing the path to the rendered template project, which must not be modified
         """
-        print('[bold blue]Creating a new template project.')
+        if self.render_cache is not None:
+            yield os.path.join(self.render_cache.render(self.dot_cookietemple, self.new_template_version, self.render_template_project),
+                               self.dot_cookietemple['project_slug'])
+            return
         # dry create run from dot_cookietemple in tmp directory
         with tempfile.TemporaryDirectory() as tmpdirname:
-            old_cwd = str(Path.cwd())
-            log.debug(f'Saving current working directory {old_cwd}.')
-            os.chdir(tmpdirname)
-            log.debug(f'Changed directory to {tmpdirname}.')
-            log.debug(f'Calling choose_domain with {self.dot_cookietemple}.')
-            choose_domain(path=Path.cwd(), domain=None, dot_cookietemple=self.dot_cookietemple)
-            # copy into the cleaned TEMPLATE branch's project directory
-            log.debug(f'Copying created template into {self.project_dir}.')
-            copy_tree(os.path.join(tmpdirname, self.dot_cookietemple['project_slug']), str(self.project_dir))
-            log.debug(f'Changing directory back to {old_cwd}.')
-            os.chdir(old_cwd)
+            self.render_template_project(Path(tmpdirname))
+            yield os.path.join(tmpdirname, self.dot_cookietemple['project_slug'])
+
+    def render_template_project(self, path: Path) -> None:
+        """
+        Create the template project without any prompts from the .cookietemple.yml file.
+        The project is only compared against the TEMPLATE branch and therefore not linted.
+
+        :param path: Directory the project is created in
+        """
+        log.debug(f'Calling choose_domain with {self.dot_cookietemple}.')
+        choose_domain(path=path, domain=None, dot_cookietemple=self.dot_cookietemple, jobs=self.jobs, lint=False)
+
+    def diff_template_tree(self, staging_dir: str) -> Dict[str, List[str]]:
+        """
+        Compare the freshly created template project against the tree of the TEMPLATE branch by the git blob ids of their files.
+        The files are treated like git add -A would treat them: all files are hashed by a single git process, so that they pass the clean filters
+        of the repository (like core.autocrlf and the text and eol attributes), and files ignored by the .gitignore files of the template project,
+        info/exclude or core.excludesFile are skipped, unless the TEMPLATE branch already tracks them.
+
+        :param staging_dir: Path to the freshly created template project
+        :return: The added, modified and deleted paths (relative to the project directory, with forward slashes)
+        """
+        self.template_entries = read_tree(self.repo, self.template_commit)
+        template_diff: Dict[str, List[str]] = {'added': [], 'modified': [], 'deleted': []}
+        staged_paths = working_tree_files(staging_dir)
+        try:
+            ignored = ignored_paths(self.repo, staging_dir, [path for path in staged_paths if path not in self.template_entries])
+            staged_paths = [path for path in staged_paths if path not in ignored]
+            self.staged_entries = hash_work_tree_files(self.repo, staging_dir, staged_paths)
+        except (OSError, git.exc.GitCommandError) as e:
+            print(f'[bold red]Could not hash the files of the template project:\n{e}')
+            sys.exit(1)
+        for path, entry in self.staged_entries.items():
+            if path not in self.template_entries:
+                template_diff['added'].append(path)
+            elif entry != self.template_entries[path]:
+                template_diff['modified'].append(path)
+        template_diff['deleted'] = sorted(set(self.template_entries) - set(staged_paths))
+        log.debug(f'Template diff: {len(template_diff["added"])} added, {len(template_diff["modified"])} modified, '
+                  f'{len(template_diff["deleted"])} deleted and {len(ignored)} ignored files.')
+
+        return template_diff
+
+    def apply_template_diff(self, template_diff: Dict[str, List[str]]) -> None:
+        """
+        Apply the differences of the freshly created template project to the tree entries of the TEMPLATE branch.
+
+        :param template_diff: The added, modified and deleted paths as determined by diff_template_tree
+        """
+        print(f'[bold blue]Applying template changes to TEMPLATE branch: {len(template_diff["added"])} added, {len(template_diff["modified"])} '
+              f'modified and {len(template_diff["deleted"])} deleted files')
+        self.template_entries = dict(self.template_entries)
+        for path in template_diff['deleted']:
+            del self.template_entries[path]
+        for path in template_diff['added'] + template_diff['modified']:
+            self.template_entries[path] = self.staged_entries[path]
 
     def commit_template_changes(self):
         """
-        If we have any changes with the new template files, make a git commit
+        If we have any changes with the new template files, commit them to the TEMPLATE branch.
+        The commit is written directly into git's object database, without touching the working tree or the index.
         """
+        changed_files = [path for paths in self.template_diff.values() for path in paths]
         # Check that we have something to commit
-        if not self.repo.is_dirty(untracked_files=True):
+        if not changed_files:
             print('[bold blue]Template contains no changes - no new commit created')
             return False
         # Commit changes
         try:
-            # git add only non-blacklisted files
-            print('[bold blue]Staging template.')
-            self.repo.git.add(A=True)
-            changed_files = [item.a_path for item in self.repo.index.diff('HEAD')]
             globs = self.get_blacklisted_sync_globs()
             blacklisted_changed_files = []
             for pattern in globs:
-                # keep track of all staged files matching a glob from the cookietemple.cfg file
+                # keep track of all changed files matching a glob from the cookietemple.cfg file
                 # those files will be excluded from syncing but will still be available in every new created projects
                 blacklisted_changed_files += fnmatch.filter(changed_files, pattern)
             nl = '\n'
             log.debug(f'Blacklisted (unsynced) files are:{nl}{nl.join(file for file in blacklisted_changed_files)}' if blacklisted_changed_files else
                       'No blacklisted files for syncing found.')
+            # blacklisted files keep their state of the TEMPLATE branch
+            template_entries = read_tree(self.repo, self.template_commit)
+            for path in blacklisted_changed_files:
+                if path in template_entries:
+                    self.template_entries[path] = template_entries[path]
+                else:
+                    self.template_entries.pop(path, None)
             print('[bold blue]Committing changes of non blacklisted files.')
-            files_to_commit = [file for file in changed_files if file not in blacklisted_changed_files]
-            log.debug(f'Files to commit are:{nl}{nl.join(file for file in files_to_commit)}' if files_to_commit else
-                      'No files to commit found.')
-            Popen(['git', 'commit', '-m', 'Cookietemple sync', *files_to_commit], stdout=PIPE, stderr=PIPE, universal_newlines=True)
-            print('[bold blue]Stashing and saving TEMPLATE branch changes!')
-            Popen(['git', 'stash'], stdout=PIPE, stderr=PIPE, universal_newlines=True)
+            commit = commit_tree(self.repo, self.template_entries, 'Cookietemple sync', self.template_commit, 'TEMPLATE')
+            if commit is None:
+                print('[bold blue]Template contains no changes of non blacklisted files - no new commit created')
+                return False
             self.made_changes = True
-            print('[bold blue]Committed changes to TEMPLATE branch')
-        except Exception as e:
+            print(f'[bold blue]Committed changes to TEMPLATE branch: {commit.hexsha}')
+        except (OSError, ValueError) as e:
             print(f'[bold red]Could not commit changes to TEMPLATE:\n{e}')
             sys.exit(1)
         return True
@@ -227,12 +285,10 @@ class TemplateSync:
         """
         print(f'[bold blue]Pushing TEMPLATE branch to remote: {os.path.basename(self.project_dir)}')
         try:
-            log.debug('Getting origin as remote.')
-            origin = self.repo.remote('origin')
-            log.debug('Setting TEMPLATE branch as upstream tracking branch.')
-            self.repo.head.ref.set_tracking_branch(origin.refs.TEMPLATE)
             log.debug('Pushing to upstream branch TEMPLATE.')
-            self.repo.git.push(force=True)
+            self.repo.git.push('origin', 'TEMPLATE:TEMPLATE', force=True)
+            log.debug('Setting TEMPLATE branch as upstream tracking branch.')
+            self.repo.heads.TEMPLATE.set_tracking_branch(self.repo.remote('origin').refs.TEMPLATE)
         except git.exc.GitCommandError as e:
             print(f'Could not push TEMPLATE branch:\n{e}')
             sys.exit(1)
@@ -270,9 +326,9 @@ class TemplateSync:
             'head': 'TEMPLATE',
             'base': 'development',
         }
-        log.debug(f'Trying to submit a sync PR to https://api.github.com/repos/{self.repo_owner}/{self.dot_cookietemple["project_slug"]}/pulls')
-        r = requests.post(
-            url=f'https://api.github.com/repos/{self.repo_owner}/{self.dot_cookietemple["project_slug"]}/pulls',
+        log.debug(f'Trying to submit a sync PR to {self.github_api_url}/repos/{self.repo_owner}/{self.dot_cookietemple["project_slug"]}/pulls')
+        r = self.session.post(
+            url=f'{self.github_api_url}/repos/{self.repo_owner}/{self.dot_cookietemple["project_slug"]}/pulls',
             data=json.dumps(pr_content),
             auth=requests.auth.HTTPBasicAuth(self.gh_username, self.token),
         )
@@ -298,11 +354,11 @@ class TemplateSync:
 
         :return Whether a cookietemple sync PR is already open or not
         """
-        query_url = f'https://api.github.com/repos/{self.repo_owner}/{self.dot_cookietemple["project_slug"]}/pulls?state=open'
+        query_url = f'{self.github_api_url}/repos/{self.repo_owner}/{self.dot_cookietemple["project_slug"]}/pulls?state=open'
         headers = {'Authorization': f'token {self.token}'}
         # query all open PRs
         log.debug('Querying open PRs to check if a sync PR already exists.')
-        r = requests.get(query_url, headers=headers)
+        r = self.session.get(query_url, headers=headers)
         query_data = r.json()
         log.debug(f'Query returned: {query_data}')
         # iterate over the open PRs of the repo to check if a cookietemple sync PR is open
@@ -369,17 +425,6 @@ class TemplateSync:
                   'sync_files_blacklisted section!')
             sys.exit(1)
 
-    def reset_target_dir(self):
-        """
-        Reset the target project directory. Check out the original branch.
-        """
-        print(f'[bold blue]Checking out original branch: {self.original_branch}')
-        try:
-            self.repo.git.checkout(self.original_branch)
-        except git.exc.GitCommandError as e:
-            print(f'[bold red]Could not reset to original branch {self.from_branch}:\n{e}')
-            sys.exit(1)
-
     @staticmethod
     def update_sync_token(project_name: str, gh_username='') -> None:
         """
@@ -409,19 +454,20 @@ class TemplateSync:
         """
         # Try to compare against the development branch, since it is the most up to date (usually).
         # If a development branch does not exist compare against master.
-        repo = git.Repo(project_dir)
+        # The .cookietemple.yml file is read from the branch directly, so that the users checkout stays untouched.
+        log.debug('Loading the project\'s template version and the cookietemple template version.')
         try:
-            repo.git.checkout('development')
+            template_version_last_sync, template_handle = load_branch_template_version_and_handle(project_dir, 'development')
+        except (git.exc.InvalidGitRepositoryError, git.exc.NoSuchPathError):
+            print(f'[bold red]{project_dir} does not appear to be a git repository.')
+            sys.exit(1)
         except git.exc.GitCommandError:
-            print('[bold red]Could not checkout development branch. Trying to checkout master...')
+            print('[bold red]Could not read .cookietemple.yml of development branch. Trying master...')
             try:
-                repo.git.checkout('master')
+                template_version_last_sync, template_handle = load_branch_template_version_and_handle(project_dir, 'master')
             except git.exc.GitCommandError as e:
-                print(f'[bold red]Could not checkout master branch.\n{e}')
+                print(f'[bold red]Could not read .cookietemple.yml of master branch.\n{e}')
                 sys.exit(1)
-
-        log.debug('Loading the project\'s template version and the cookietemple template version.')
-        template_version_last_sync, template_handle = TemplateSync.sync_load_project_template_version_and_handle(project_dir)
         template_version_last_sync = version.parse(template_version_last_sync)  # type: ignore
         current_ct_template_version = version.parse(TemplateSync.sync_load_template_version(template_handle))
         log.debug(f'Projects template version is {template_version_last_sync} and cookietemple template version is {current_ct_template_version}')
@@ -1,15 +1,20 @@
+import atexit
 import json
 import logging
-import urllib
+import os
+import time
+import urllib.request
 import sys
+from typing import Optional
 
-from pkg_resources import parse_version
+import appdirs  # type: ignore
+from packaging.version import parse as parse_version
 
 import cookietemple
 
 from urllib.error import HTTPError, URLError
-from subprocess import Popen, PIPE, check_call
-from cookietemple.custom_cli.questionary import cookietemple_questionary_or_dot_cookietemple
+from subprocess import Popen, PIPE, DEVNULL, check_call
+from cookietemple.config.config import ConfigCommand
 from rich import print
 
 log = logging.getLogger(__name__)
@@ -19,12 +24,20 @@ class UpgradeCommand:
     """
     Responsible for checking for newer versions cookietemple and upgrading it if required.
     """
+    # path where the result of the last check for a newer cookietemple release is stored
+    UPGRADE_CHECK_FILE_PATH = f'{appdirs.user_config_dir(appname="cookietemple")}/.upgrade_check.json'
+    # seconds until PyPI is asked again for the latest cookietemple release
+    UPGRADE_CHECK_TTL = 24 * 60 * 60
+    DEFAULT_INDEX_URL = 'https://pypi.org/pypi'
+
     @staticmethod
     def check_upgrade_cookietemple() -> None:
         """
         Checks whether the locally installed version of cookietemple is the latest.
         If not it prompts whether to upgrade and runs the upgrade command if desired.
         """
+        from cookietemple.custom_cli.questionary import cookietemple_questionary_or_dot_cookietemple
+
         if not UpgradeCommand.check_cookietemple_latest():
             if cookietemple_questionary_or_dot_cookietemple(function='confirm',
                                                             question='Do you want to upgrade?',
@@ -38,24 +51,24 @@ class UpgradeCommand:
 
         :return: True if locally version is the latest or PyPI is inaccessible, false otherwise
         """
-        latest_local_version = cookietemple.__version__
-        log.debug(f'Latest local cookietemple version is: {latest_local_version}.')
-        log.debug('Checking whether a new cookietemple version exists on PyPI.')
-        try:
-            # Retrieve info on latest version
-            # Adding nosec (bandit) here, since we have a hardcoded https request
-            # It is impossible to access file:// or ftp://
-            # See: https://stackoverflow.com/questions/48779202/audit-url-open-for-permitted-schemes-allowing-use-of-file-or-custom-schemes
-            req = urllib.request.Request('https://pypi.org/pypi/cookietemple/json')  # nosec
-            with urllib.request.urlopen(req, timeout=1) as response:  # nosec
-                contents = response.read()
-                data = json.loads(contents)
-                latest_pypi_version = data['info']['version']
-        except (HTTPError, TimeoutError, URLError):
+        latest_pypi_version = cls.refresh_upgrade_check()
+        if latest_pypi_version is None:
             print('[bold red]Unable to contact PyPI to check for the latest cookietemple version. Do you have an internet connection?')
             # Returning true by default, since this is not a serious issue
             return True
 
+        return cls.print_upgrade_notice(latest_pypi_version)
+
+    @classmethod
+    def print_upgrade_notice(cls, latest_pypi_version: str) -> bool:
+        """
+        Compare the locally installed version of cookietemple with the latest release and notify the user, if they differ.
+
+        :param latest_pypi_version: The latest version of cookietemple released on PyPI
+        :return: True if the local version is the latest, false otherwise
+        """
+        latest_local_version = cookietemple.__version__
+        log.debug(f'Latest local cookietemple version is: {latest_local_version}.')
         if parse_version(latest_local_version) > parse_version(latest_pypi_version):
             print(f'[bold yellow]Installed version {latest_local_version} of cookietemple is newer than the latest release {latest_pypi_version}!'
                   f' You are running a nightly version and features may break!')
@@ -67,6 +80,100 @@ class UpgradeCommand:
 
         return False
 
+    @classmethod
+    def start_upgrade_check(cls) -> None:
+        """
+        Checks for a newer cookietemple release without delaying the invoked command.
+        A recent verdict is read from the upgrade check file. Otherwise, PyPI is queried by a detached child process, which stores its verdict for
+        the next invocations. The upgrade notice is printed when cookietemple exits, but only if the verdict is ready by then.
+        The check is disabled by setting upgrade_check to False in the cookietemple config file.
+        """
+        if not ConfigCommand.load_setting('upgrade_check', True):
+            log.debug('Checking for a newer cookietemple version is disabled.')
+            return
+        latest_pypi_version = cls.load_upgrade_check()
+        if latest_pypi_version is None:
+            log.debug('Starting background check for a newer cookietemple version.')
+            try:
+                # the child process outlives short running commands, so its verdict is always stored
+                Popen([sys.executable, '-c', 'from cookietemple.upgrade.upgrade import UpgradeCommand; UpgradeCommand.refresh_upgrade_check()'],
+                      stdin=DEVNULL, stdout=DEVNULL, stderr=DEVNULL, close_fds=True, start_new_session=True)
+            except OSError as e:
+                log.debug(f'Unable to start the background upgrade check: {e}')
+        atexit.register(cls.print_pending_upgrade_notice, latest_pypi_version)
+
+    @classmethod
+    def print_pending_upgrade_notice(cls, latest_pypi_version: Optional[str]) -> None:
+        """
+        Print the upgrade notice at exit, if a verdict is available by then and a newer version has been released.
+
+        :param latest_pypi_version: The latest version read at startup or None, if the background check had to be started
+        """
+        if latest_pypi_version is None:
+            latest_pypi_version = cls.load_upgrade_check()
+        if latest_pypi_version and not cls.print_upgrade_notice(latest_pypi_version):
+            print('[bold blue]Run [green]cookietemple upgrade [blue]to get the latest version.')
+
+    @classmethod
+    def load_upgrade_check(cls) -> Optional[str]:
+        """
+        Load the latest cookietemple version found by a previous check, if the check is recent and used the same index.
+
+        :return: The latest version, an empty string if PyPI could not be contacted, or None if PyPI needs to be checked again
+        """
+        try:
+            with open(cls.UPGRADE_CHECK_FILE_PATH) as f:
+                upgrade_check = json.load(f)
+            if (time.time() - upgrade_check['checked_at'] < cls.UPGRADE_CHECK_TTL
+                    and upgrade_check['index_url'] == cls.upgrade_check_index_url()):
+                return upgrade_check['latest_version'] or ''
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+
+        return None
+
+    @classmethod
+    def refresh_upgrade_check(cls) -> Optional[str]:
+        """
+        Query the configured index for the latest cookietemple version and store the result in the upgrade check file.
+        Failed checks are stored as well, so that cookietemple does not wait for an unreachable index on every invocation.
+
+        :return: The latest version or None, if the index could not be contacted
+        """
+        index_url = cls.upgrade_check_index_url()
+        log.debug('Checking whether a new cookietemple version exists on PyPI.')
+        latest_pypi_version = None
+        try:
+            # Retrieve info on latest version
+            # Adding nosec (bandit) here, since the URL either is the hardcoded https PyPI URL or explicitly configured by the user
+            req = urllib.request.Request(f'{index_url}/cookietemple/json')  # nosec
+            with urllib.request.urlopen(req, timeout=1) as response:  # nosec
+                contents = response.read()
+                data = json.loads(contents)
+                latest_pypi_version = data['info']['version']
+        except (HTTPError, TimeoutError, URLError, ValueError, KeyError, OSError) as e:
+            log.debug(f'Unable to check for the latest cookietemple version: {e}')
+
+        try:
+            ConfigCommand.check_ct_config_dir_exists()
+            tmp_path = f'{cls.UPGRADE_CHECK_FILE_PATH}.{os.getpid()}.tmp'
+            with open(tmp_path, 'w') as f:
+                json.dump({'checked_at': time.time(), 'index_url': index_url, 'latest_version': latest_pypi_version}, f)
+            os.replace(tmp_path, cls.UPGRADE_CHECK_FILE_PATH)
+        except OSError as e:
+            log.debug(f'Unable to store the result of the upgrade check: {e}')
+
+        return latest_pypi_version
+
+    @staticmethod
+    def upgrade_check_index_url() -> str:
+        """
+        The base URL of the PyPI style JSON API used to check for new releases. Configured by pypi_index_url of the cookietemple config file.
+
+        :return: The base URL of the JSON API
+        """
+        return str(ConfigCommand.load_setting('pypi_index_url', UpgradeCommand.DEFAULT_INDEX_URL)).rstrip('/')
+
     @classmethod
     def upgrade_cookietemple(cls) -> None:
         """
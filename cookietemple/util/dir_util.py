@@ -1,5 +1,16 @@
+import errno
 import os
+import shutil
+import threading
 from pathlib import Path
+from typing import Set
+
+# ioctl request cloning a whole file on Linux filesystems supporting reflinks like Btrfs or XFS (see ioctl_ficlone(2))
+FICLONE = 0x40049409
+
+# devices, which do not support reflinks; cloning is not tried again for files on them
+_no_reflink_devices: Set[int] = set()
+_no_reflink_devices_lock = threading.Lock()
 
 
 def delete_dir_tree(directory: Path) -> None:
@@ -20,6 +31,110 @@ def delete_dir_tree(directory: Path) -> None:
     dir.rmdir()
 
 
+def copy_file(src: str, dst: str, link: bool = False) -> None:
+    """
+    Copy a file and its permission bits as fast as the platform and filesystem allow. An already existing destination file is replaced.
+    The file is reflinked (the copy shares the data of the source until one of them is modified), if the filesystem supports it.
+    Otherwise the kernel copies the data (copy_file_range or sendfile), so that it is never passed through Python.
+
+    :param src: Path to the source file
+    :param dst: Path to the destination file
+    :param link: Hardlink the file if possible. Only use this, if the source is a temporary file that is deleted afterwards,
+                 since modifying one of the hardlinked files modifies the other as well
+    """
+    # replace instead of overwrite the destination, so that the content of another (hard)linked file is never modified
+    if os.path.lexists(dst):
+        os.unlink(dst)
+    if link:
+        try:
+            os.link(src, dst)
+            return
+        except OSError:
+            # different filesystems or hardlinks not supported -> copy
+            pass
+
+    with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+        if not _reflink(fsrc.fileno(), fdst.fileno()) and not _kernel_copy(fsrc.fileno(), fdst.fileno()):
+            # rewind what a failed kernel copy may have written; copyfileobj uses sendfile on Linux as well
+            fsrc.seek(0)
+            fdst.seek(0)
+            fdst.truncate()
+            shutil.copyfileobj(fsrc, fdst)
+    shutil.copymode(src, dst)
+
+
+def copy_dir_tree(src: str, dst: str, link: bool = False, symlinks: bool = False) -> None:
+    """
+    Recursively copy the content of a directory into another (possibly already existing) directory using copy_file.
+    Already existing files are replaced, all other files of the destination directory are kept.
+
+    :param src: The directory to copy
+    :param dst: The directory to copy the content into
+    :param link: Hardlink the files if possible (only if the source directory is deleted afterwards, see copy_file)
+    :param symlinks: Copy symlinks (to files and directories) as symlinks instead of copying their targets
+    """
+    for root, dirs, files in os.walk(src, followlinks=not symlinks):
+        dst_root = os.path.normpath(os.path.join(dst, os.path.relpath(root, src)))
+        os.makedirs(dst_root, exist_ok=True)
+        # symlinked directories are not entered, if symlinks are kept
+        linked_dirs = [d for d in dirs if os.path.islink(os.path.join(root, d))] if symlinks else []
+        for f in files + linked_dirs:
+            src_file, dst_file = os.path.join(root, f), os.path.join(dst_root, f)
+            if symlinks and os.path.islink(src_file):
+                if os.path.lexists(dst_file):
+                    os.unlink(dst_file)
+                os.symlink(os.readlink(src_file), dst_file)
+            else:
+                copy_file(src_file, dst_file, link)
+
+
+def _reflink(src_fd: int, dst_fd: int) -> bool:
+    """
+    Try to reflink the source file into the destination file.
+
+    :return: Whether the file was reflinked
+    """
+    try:
+        import fcntl
+    except ImportError:
+        # not available on Windows
+        return False
+    device = os.fstat(src_fd).st_dev
+    if device in _no_reflink_devices:
+        return False
+    try:
+        fcntl.ioctl(dst_fd, FICLONE, src_fd)
+        return True
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            with _no_reflink_devices_lock:
+                _no_reflink_devices.add(device)
+        return False
+
+
+def _kernel_copy(src_fd: int, dst_fd: int) -> bool:
+    """
+    Try to copy the data of the source file into the destination file using copy_file_range (Linux only).
+
+    :return: Whether the file was copied
+    """
+    if not hasattr(os, 'copy_file_range'):
+        return False
+    size = os.fstat(src_fd).st_size
+    copied = 0
+    try:
+        while copied < size:
+            sent = os.copy_file_range(src_fd, dst_fd, size - copied)
+            if sent == 0:
+                break
+            copied += sent
+    except OSError:
+        # different filesystems on older kernels or not supported by the filesystem
+        return False
+
+    return True
+
+
 def pf(calling_class, file_path: str) -> str:
     """
 
@@ -16,12 +16,24 @@ def fix_short_title_underline(path_to_rst_file: str) -> None:
     print('[bold blue]Fixing too short underlines of *.rst file (usually index.rst)')
     try:
         with open(path_to_rst_file) as f:
-            content = f.readlines()
-            # Fix the underlined title by replacing the short underline with the correct length
-            len_header = len(content[0])
-            content[1] = len_header * '='
+            content = f.read()
             # Write everything back
             with open(path_to_rst_file, 'w') as file:
-                file.writelines(content)
+                file.write(fix_short_title_underline_of_content(content))
     except FileNotFoundError:
         print(f'[bold yellow]Unable to find rst file: {path_to_rst_file}')
+
+
+def fix_short_title_underline_of_content(content: str) -> str:
+    """
+    Fixes the too short underline of the title of the content of a *.rst file (see fix_short_title_underline).
+
+    :param content: Content of the *.rst file
+    :return: The content with the fixed underline
+    """
+    lines = content.splitlines(keepends=True)
+    # Fix the underlined title by replacing the short underline with the correct length
+    len_header = len(lines[0])
+    lines[1] = len_header * '='
+
+    return ''.join(lines)
@@ -51,7 +51,7 @@ clean-test: ## remove test and coverage artifacts
 	if exist .pytest_cache rd /s /q .pytest_cache
 
 lint: ## check style with flake8
-	flake8 cookietemple tests
+	flake8 cookietemple tests benchmarks
 
 test: ## run tests quickly with the default Python
 	pytest -s tests
@@ -59,6 +59,12 @@ test: ## run tests quickly with the default Python
 test-all: ## run tests on every Python version with tox
 	tox
 
+benchmark: ## run the benchmarks and save their results for later comparisons
+	pytest benchmarks --benchmark-autosave
+
+benchmark-compare: ## run the benchmarks and fail if any got more than 10% slower than the last saved results
+	pytest benchmarks --benchmark-compare --benchmark-compare-fail=mean:10%
+
 coverage: ## check code coverage quickly with the default Python
 	coverage run --source cookietemple -m pytest
 	coverage report -m
@@ -0,0 +1,121 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import requests
+
+from cookietemple.common.load_yaml import load_yaml_file
+from cookietemple.create.batch import create_batch, load_manifest
+from cookietemple.create.create import choose_domain, create_from_answers, validate_answers
+from cookietemple.create.template_creator import TemplateCreator
+from cookietemple.custom_cli.questionary import InvalidAnswerError
+
+"""
+This test class is for testing the creation of projects without any prompts, like it is done by sync or with an answers file.
+"""
+
+
+def test_concurrent_creates(mocker, tmp_path, cli_python_dot_cookietemple) -> None:
+    """
+    Ensure that several threads can create projects at the same time, each into its own directory, without changing the working directory.
+    """
+    mocker.patch.object(TemplateCreator, 'query_name_available', return_value=False)
+    mocker.patch('cookietemple.lint.domains.cli.Popen', **{'return_value.communicate.return_value': ('', '')})
+    mocker.patch('requests.Session.get', side_effect=requests.exceptions.ConnectionError)
+    cwd = os.getcwd()
+    project_names = [f'springfield_{i}' for i in range(4)]
+
+    def create(project_name: str) -> None:
+        choose_domain(path=tmp_path / project_name, domain=None, dot_cookietemple=dict(cli_python_dot_cookietemple, project_name=project_name),
+                      jobs=2)
+
+    with ThreadPoolExecutor(max_workers=len(project_names)) as executor:
+        list(executor.map(create, project_names))
+
+    assert os.getcwd() == cwd
+    for project_name in project_names:
+        assert os.listdir(tmp_path / project_name) == [project_name]
+        assert load_yaml_file(str(tmp_path / project_name / project_name / '.cookietemple.yml'))['project_name'] == project_name
+        assert os.path.isfile(tmp_path / project_name / project_name / project_name / 'cli.py')
+
+
+@pytest.fixture
+def no_prompts(mocker):
+    """
+    Fail on any prompt and any lookup of the project name.
+    """
+    for function in ('select', 'text', 'confirm', 'password'):
+        mocker.patch(f'questionary.{function}', side_effect=AssertionError(f'Prompted with questionary.{function}'))
+    mocker.patch('cookietemple.lint.domains.cli.Popen', **{'return_value.communicate.return_value': ('', '')})
+    mocker.patch('requests.Session.get', side_effect=requests.exceptions.ConnectionError)
+
+    return mocker.patch.object(TemplateCreator, 'query_name_available', return_value=False)
+
+
+def test_create_from_answers(no_prompts, tmp_path, capsys) -> None:
+    """
+    Ensure that a project is created from a minimal set of answers without prompts or name lookups and missing answers default to their prompts defaults.
+    Overwriting a project replaces its directory, which is announced beforehand.
+    """
+    answers = {'domain': 'cli', 'project_name': 'exploding-springfield', 'full_name': 'Homer Simpson', 'email': 'homer.simpson@posteo.net',
+               'github_username': 'homer', 'testing_library': 'unittest'}
+
+    project_path = create_from_answers(answers, tmp_path)
+    dot_cookietemple = load_yaml_file(str(project_path / '.cookietemple.yml'))
+
+    assert project_path == tmp_path / 'exploding_springfield'
+    assert not no_prompts.called
+    assert dot_cookietemple['language'] == 'python' and dot_cookietemple['command_line_interface'] == 'Click'
+    assert dot_cookietemple['testing_library'] == 'unittest' and dot_cookietemple['version'] == '0.1.0'
+    with pytest.raises(FileExistsError):
+        create_from_answers(answers, tmp_path)
+    (project_path / 'notes.txt').write_text('Not created by the template')
+    capsys.readouterr()
+    assert create_from_answers(answers, tmp_path, overwrite=True, check_names=True) == project_path
+    assert not (project_path / 'notes.txt').exists()
+    assert 'including files the template does not create' in ' '.join(capsys.readouterr().out.split())
+    assert no_prompts.call_count == 2
+
+
+def test_invalid_answers() -> None:
+    """
+    Ensure that all problems of invalid answers are reported at once.
+    """
+    with pytest.raises(InvalidAnswerError) as e:
+        validate_answers({'domain': 'web', 'language': 'java', 'project_name': 'Exploding Springfield', 'full_name': 'Homer Simpson',
+                          'github_username': 'homer', 'version': '1.0', 'is_github_repo': 'yes', 'main_class': 'Homer'})
+
+    assert str(e.value).splitlines() == ['Missing answer email.',
+                                         'The answer is_github_repo must be either true or false.',
+                                         'Unknown answer main_class for web projects.',
+                                         'The version 1.0 does not match semantic versioning.',
+                                         'There is no template web-java.']
+    with pytest.raises(InvalidAnswerError, match='Choose one of Click, Argparse'):
+        create_from_answers({'domain': 'cli', 'project_name': 'Exploding Springfield', 'full_name': 'Homer Simpson', 'email': 'homer.simpson@posteo.net',
+                             'github_username': 'homer', 'command_line_interface': 'docopt'}, '.')
+
+
+def test_batch_create(no_prompts, tmp_path, capsys) -> None:
+    """
+    Ensure that a batch creates all valid projects of a manifest concurrently, continues past failures and captures the output of every project.
+    """
+    manifest = tmp_path / 'manifest.yml'
+    manifest.write_text('defaults:\n  full_name: Homer Simpson\n  email: homer.simpson@posteo.net\n  github_username: homer\n'
+                        'projects:\n'
+                        '  - {handle: cli-python, project_name: springfield}\n'
+                        '  - {handle: cli-cobol, project_name: shelbyville}\n'
+                        '  - {handle: lib-cpp, project_name: capital_city}\n'
+                        '  - {handle: cli-java, project_name: springfield}\n'
+                        '  - {handle: lib-cpp, project_name: Capital City}\n')
+
+    results = create_batch(load_manifest(str(manifest)), tmp_path / 'projects', workers=3)
+    out, err = capsys.readouterr()
+
+    assert [result.created for result in results] == [True, False, True, False, False]
+    assert [result.handle for result in results] == ['cli-python', 'cli-cobol', 'lib-cpp', 'cli-java', 'lib-cpp']
+    assert results[1].error == 'There is no template cli-cobol.' and results[3].error == 'Duplicate of project 1'
+    # Capital City is created in Capital_City, which is the same directory as capital_city on case-insensitive file systems
+    assert results[4].error == 'Duplicate of project 3'
+    assert all(result.lint_status in {'passed', 'warnings'} for result in results if result.created)
+    assert sorted(os.listdir(tmp_path / 'projects')) == ['capital_city', 'springfield']
+    assert 'LINT RESULTS' in results[0].output and 'LINT RESULTS' not in out
@@ -0,0 +1,104 @@
+import socket
+import threading
+
+import pytest
+
+from cookietemple.config.config import ConfigCommand
+from cookietemple.create import name_lookup
+from cookietemple.create.domains.cli_creator import CliCreator
+from cookietemple.create.name_lookup import is_name_taken
+
+"""
+This test class is for testing the lookup of project names at PyPI and readthedocs.io against local stubs.
+"""
+
+
+@pytest.fixture
+def lookup_urls(mocker, tmp_path, stub_server):
+    """
+    Serve PyPI and readthedocs.io from a local stub, at which only the name springfield is taken and which is rate limited for the name ogdenville,
+    and use an empty lookup cache.
+
+    :return: The stub server, which records all requests
+    """
+    def handler(request):
+        if request.path.endswith('/springfield'):
+            return 200, None, {}
+        if request.path.endswith('/ogdenville'):
+            return 429, None, {}
+        return 404, None, {}
+
+    stub = stub_server(handler)
+    settings = {'pypi_lookup_url': f'{stub.url}/pypi/{{name}}', 'readthedocs_lookup_url': f'{stub.url}/rtd/{{name}}'}
+    mocker.patch.object(ConfigCommand, 'load_setting', lambda name, default=None: settings.get(name, default))
+    mocker.patch.object(name_lookup, 'NAME_LOOKUP_CACHE_DIR', str(tmp_path / 'names'))
+
+    return stub
+
+
+def test_name_lookups_are_cached(lookup_urls) -> None:
+    """
+    Ensure that taken names are found at the configured URLs and every URL is only requested once within the TTL.
+    """
+    assert is_name_taken('PyPi', 'springfield') is True
+    assert is_name_taken('readthedocs.io', 'shelbyville') is False
+    assert is_name_taken('PyPi', 'springfield') is True
+    assert is_name_taken('readthedocs.io', 'shelbyville') is False
+
+    assert [request.path for request in lookup_urls.requests] == ['/pypi/springfield', '/rtd/shelbyville']
+
+
+def test_failed_name_lookups_are_not_cached(lookup_urls) -> None:
+    """
+    Ensure that answers other than 200 or 404 (like a rate limit) neither tell whether a name is taken nor are cached.
+    """
+    assert is_name_taken('PyPi', 'ogdenville') is None
+    assert is_name_taken('PyPi', 'ogdenville') is None
+
+    assert [request.path for request in lookup_urls.requests] == ['/pypi/ogdenville', '/pypi/ogdenville']
+
+
+def test_name_lookups_are_concurrent(mocker, tmp_path, stub_server, capfd) -> None:
+    """
+    Ensure that all hosts are looked up concurrently by a stub, which only answers once all hosts have been asked.
+    """
+    all_hosts_asked = threading.Barrier(2)
+
+    def handler(request):
+        all_hosts_asked.wait(timeout=10)
+        return 200, None, {}
+
+    stub = stub_server(handler)
+    settings = {'pypi_lookup_url': f'{stub.url}/pypi/{{name}}', 'readthedocs_lookup_url': f'{stub.url}/rtd/{{name}}'}
+    mocker.patch.object(ConfigCommand, 'load_setting', lambda name, default=None: settings.get(name, default))
+    mocker.patch.object(name_lookup, 'NAME_LOOKUP_CACHE_DIR', str(tmp_path / 'names'))
+    creator = CliCreator()
+    creator.check_name_availability = True
+    creator.creator_ctx.project_name = 'springfield'
+
+    creator.check_name_available(['PyPi', 'readthedocs.io'], {'project_name': 'springfield'})
+    out = ' '.join(capfd.readouterr().out.split())
+
+    assert 'named springfield already exists at PyPi' in out and 'named springfield already exists at readthedocs.io' in out
+
+
+def test_name_lookups_are_bounded(mocker, tmp_path, capfd) -> None:
+    """
+    Ensure that a host, which accepts connections but never answers, does not block the creation.
+    """
+    blackhole = socket.socket()
+    blackhole.bind(('127.0.0.1', 0))
+    blackhole.listen()
+    url = f'http://127.0.0.1:{blackhole.getsockname()[1]}/{{name}}'
+    mocker.patch.object(ConfigCommand, 'load_setting', lambda name, default=None: url if name.endswith('_lookup_url') else default)
+    mocker.patch.object(name_lookup, 'NAME_LOOKUP_CACHE_DIR', str(tmp_path / 'names'))
+    mocker.patch.object(name_lookup, 'NAME_LOOKUP_TIMEOUT', 0.5)
+    creator = CliCreator()
+    creator.check_name_availability = True
+    creator.creator_ctx.project_name = 'springfield'
+
+    creator.check_name_available(['PyPi', 'readthedocs.io'], {'project_name': 'springfield'})
+    blackhole.close()
+    out = ' '.join(capfd.readouterr().out.split())
+
+    assert 'already taken on PyPi because its unreachable' in out and 'already taken on readthedocs.io because its unreachable' in out
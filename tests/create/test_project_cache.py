@@ -0,0 +1,109 @@
+import filecmp
+import os
+
+import arrow
+import pytest
+
+from cookietemple.config.config import ConfigCommand
+from cookietemple.create.create import create_from_answers
+from cookietemple.create.project_cache import ProjectCache
+from cookietemple.create.render_engine import RenderEngine
+
+from tests.create.test_render_engine import assert_identical_trees
+
+"""
+This test class is for testing the persistent cache of rendered projects.
+"""
+
+CLI_PYTHON_ANSWERS = {'domain': 'cli', 'project_name': 'exploding-springfield', 'full_name': 'Homer Simpson', 'email': 'homer.simpson@posteo.net',
+                      'github_username': 'homer'}
+
+
+@pytest.fixture
+def settings(mocker):
+    """
+    Serve all settings from a dictionary.
+
+    :return: The settings
+    """
+    settings: dict = {}
+    mocker.patch.object(ConfigCommand, 'load_setting', lambda name, default=None: settings.get(name, default))
+
+    return settings
+
+
+def cached_keys(cache_dir: str) -> set:
+    """
+    The keys of all complete entries of a project cache.
+    """
+    return {name[:-len('.json')] for name in os.listdir(cache_dir) if name.endswith('.json')}
+
+
+def test_rendered_projects_are_reused(settings, project_cache_dir, mocker, tmp_path) -> None:
+    """
+    Ensure that a project is rendered once, copied from the cache afterwards and rendered again, once any answer differs.
+    """
+    materialize = mocker.spy(RenderEngine, 'materialize')
+
+    first_project = create_from_answers(CLI_PYTHON_ANSWERS, tmp_path / 'first', lint=False)
+    second_project = create_from_answers(CLI_PYTHON_ANSWERS, tmp_path / 'second', lint=False)
+
+    assert materialize.call_count == 1
+    assert_identical_trees(filecmp.dircmp(first_project, second_project))
+    assert len(cached_keys(str(project_cache_dir))) == 1
+
+    create_from_answers(dict(CLI_PYTHON_ANSWERS, testing_library='unittest'), tmp_path / 'third', lint=False)
+    assert materialize.call_count == 2
+    assert len(cached_keys(str(project_cache_dir))) == 2
+
+
+def test_cache_can_be_disabled(settings, project_cache_dir, mocker, tmp_path) -> None:
+    """
+    Ensure that every project is rendered and nothing is cached, if the size of the cache is set to 0.
+    """
+    settings['project_cache_size'] = 0
+    materialize = mocker.spy(RenderEngine, 'materialize')
+
+    create_from_answers(CLI_PYTHON_ANSWERS, tmp_path / 'first', lint=False)
+    create_from_answers(CLI_PYTHON_ANSWERS, tmp_path / 'second', lint=False)
+
+    assert materialize.call_count == 2
+    assert not os.listdir(project_cache_dir)
+
+
+def test_least_recently_used_projects_are_evicted(tmp_path) -> None:
+    """
+    Ensure that the least recently used projects are evicted, once the cache exceeds its size limit, and recently loaded ones are kept.
+    """
+    cache = ProjectCache(str(tmp_path / 'projects'), max_size=2500)
+    for name in ('springfield', 'shelbyville', 'capital_city'):
+        (tmp_path / name).mkdir()
+        (tmp_path / name / 'README.rst').write_text(name * 100)
+    cache.store('springfield', str(tmp_path / 'springfield'))
+    cache.store('shelbyville', str(tmp_path / 'shelbyville'))
+    # mark springfield as used after shelbyville
+    os.utime(tmp_path / 'projects' / 'shelbyville.json', (1, 1))
+    assert cache.load('springfield', 'springfield', str(tmp_path / 'output')) == str(tmp_path / 'output' / 'springfield')
+
+    cache.store('capital_city', str(tmp_path / 'capital_city'))
+
+    assert cached_keys(str(tmp_path / 'projects')) == {'springfield', 'capital_city'}
+    assert not os.path.exists(tmp_path / 'projects' / 'shelbyville')
+    assert cache.load('shelbyville', 'shelbyville', str(tmp_path / 'output')) is None
+
+
+def test_cached_projects_are_rendered_again_on_another_day(settings, mocker, tmp_path) -> None:
+    """
+    Ensure that a project created on another day is rendered again with the current date instead of the date of the cached project.
+    """
+    materialize = mocker.spy(RenderEngine, 'materialize')
+    today = arrow.now('local')
+    first_project = create_from_answers(CLI_PYTHON_ANSWERS, tmp_path / 'first', lint=False)
+
+    mocker.patch('arrow.now', lambda *args, **kwargs: today.shift(years=3))
+    second_project = create_from_answers(CLI_PYTHON_ANSWERS, tmp_path / 'second', lint=False)
+
+    assert materialize.call_count == 2
+    assert f'0.1.0 ({today.strftime("%Y-%m-%d")})' in (first_project / 'CHANGELOG.rst').read_text()
+    assert f'0.1.0 ({today.shift(years=3).strftime("%Y-%m-%d")})' in (second_project / 'CHANGELOG.rst').read_text()
+    assert f'Copyright (c) {today.year + 3}' in (second_project / 'LICENSE').read_text()
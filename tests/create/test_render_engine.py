@@ -0,0 +1,133 @@
+import filecmp
+import os
+
+import pytest
+from cookiecutter.main import cookiecutter  # type: ignore
+
+from cookietemple.create.domains.web_creator import FLASK_RENDER_PLAN
+from cookietemple.create.render_engine import RenderEngine
+
+CLI_PYTHON_TEMPLATE_PATH = os.path.normpath(f'{os.path.dirname(__file__)}/../../cookietemple/create/templates/cli/cli_python')
+
+FLASK_TEMPLATE_PATH = os.path.normpath(f'{os.path.dirname(__file__)}/../../cookietemple/create/templates/web/website_python/flask')
+
+CLI_PYTHON_CONTEXT = {'full_name': 'Homer Simpson', 'email': 'homer.simpson@posteo.net', 'project_name': 'Exploding Springfield',
+                      'project_slug': 'exploding-springfield', 'project_slug_no_hyphen': 'exploding_springfield', 'github_username': 'homer',
+                      'version': '0.1.0', 'project_short_description': 'Blow it up', 'command_line_interface': 'Click', 'testing_library': 'pytest',
+                      'license': 'MIT', 'is_github_repo': 'Y', 'is_github_orga': 'N', 'github_orga': '', 'creator_github_username': 'homer'}
+
+
+def assert_identical_trees(dcmp: filecmp.dircmp) -> None:
+    """
+    Recursively assert that two directory trees contain the same files with the same content and permissions.
+    """
+    assert not dcmp.left_only and not dcmp.right_only and not dcmp.funny_files
+    _, mismatches, errors = filecmp.cmpfiles(dcmp.left, dcmp.right, dcmp.common_files, shallow=False)
+    assert not mismatches and not errors
+    for common_file in dcmp.common_files:
+        assert os.stat(os.path.join(dcmp.left, common_file)).st_mode == os.stat(os.path.join(dcmp.right, common_file)).st_mode
+    for sub_dcmp in dcmp.subdirs.values():
+        assert_identical_trees(sub_dcmp)
+
+
+def test_render_engine_matches_cookiecutter(tmp_path) -> None:
+    """
+    Ensure that the render engine creates exactly the same project as cookiecutter and stores the bytecode of the compiled templates.
+    """
+    bytecode_cache_dir = tmp_path / 'jinja'
+    cookiecutter_project = cookiecutter(CLI_PYTHON_TEMPLATE_PATH, no_input=True, overwrite_if_exists=True, output_dir=str(tmp_path / 'cookiecutter'),
+                                        extra_context=CLI_PYTHON_CONTEXT)
+    engine_project = RenderEngine(bytecode_cache_dir=str(bytecode_cache_dir)).render_template(CLI_PYTHON_TEMPLATE_PATH, output_dir=str(tmp_path / 'engine'),
+                                                                                              extra_context=CLI_PYTHON_CONTEXT)
+
+    assert os.path.basename(engine_project) == 'exploding_springfield'
+    assert_identical_trees(filecmp.dircmp(cookiecutter_project, engine_project))
+    assert os.listdir(bytecode_cache_dir)
+
+
+def test_render_engine_reuses_bytecode_cache(mocker, tmp_path) -> None:
+    """
+    Ensure that a new render engine (like one of a later cookietemple process) loads compiled templates from the bytecode cache.
+    """
+    bytecode_cache_dir = str(tmp_path / 'jinja')
+    RenderEngine(bytecode_cache_dir=bytecode_cache_dir).render_template(CLI_PYTHON_TEMPLATE_PATH, output_dir=str(tmp_path / 'first'),
+                                                                        extra_context=CLI_PYTHON_CONTEXT)
+    engine = RenderEngine(bytecode_cache_dir=bytecode_cache_dir)
+    compile_templates = mocker.spy(engine.env, 'compile')
+    engine.render_template(CLI_PYTHON_TEMPLATE_PATH, output_dir=str(tmp_path / 'second'), extra_context=CLI_PYTHON_CONTEXT)
+
+    # only the templated file and directory names are compiled again
+    assert all('{{' in call_args[0][0] and '\n' not in call_args[0][0] for call_args in compile_templates.call_args_list)
+
+
+def test_parallel_rendering_is_deterministic(tmp_path) -> None:
+    """
+    Ensure that rendering the files concurrently creates exactly the same project as rendering them one after another.
+    """
+    engine = RenderEngine(bytecode_cache_dir=None)
+    sequential_project = engine.render_template(CLI_PYTHON_TEMPLATE_PATH, output_dir=str(tmp_path / 'sequential'), extra_context=CLI_PYTHON_CONTEXT)
+    parallel_project = engine.render_template(CLI_PYTHON_TEMPLATE_PATH, output_dir=str(tmp_path / 'parallel'), extra_context=CLI_PYTHON_CONTEXT, jobs=4)
+
+    assert_identical_trees(filecmp.dircmp(sequential_project, parallel_project))
+
+
+def test_render_plan_skips_excluded_files(mocker, tmp_path) -> None:
+    """
+    Ensure that the render plan of the Flask template moves the chosen frontend template into the website and never renders excluded files.
+    """
+    engine = RenderEngine(bytecode_cache_dir=None)
+    write_file = mocker.spy(engine, 'write_file')
+    project_dir = engine.render_template(FLASK_TEMPLATE_PATH, output_dir=str(tmp_path), plan=FLASK_RENDER_PLAN,
+                                         extra_context=dict(CLI_PYTHON_CONTEXT, setup_type='basic', frontend='solidstate'))
+    package_dir = os.path.join(project_dir, 'exploding_springfield')
+
+    assert not os.path.exists(os.path.join(project_dir, 'frontend_templates'))
+    assert not os.path.exists(os.path.join(package_dir, 'auth')) and not os.path.exists(os.path.join(package_dir, 'templates', 'index.html'))
+    assert os.path.isfile(os.path.join(package_dir, 'templates', 'basic_index_f.html'))
+    assert os.listdir(os.path.join(package_dir, 'static', 'assets', 'webfonts'))
+    rendered_files = [call_args[0][0].relative_file for call_args in write_file.call_args_list]
+    assert not [rendered_file for rendered_file in rendered_files if '/auth/' in rendered_file or rendered_file.startswith('frontend_templates/')
+                and '/assets/' not in rendered_file]
+
+
+def test_staged_templates_are_merged(tmp_path) -> None:
+    """
+    Ensure that several templates and in-memory contents are merged into a single project, which is written at once.
+    """
+    engine = RenderEngine(bytecode_cache_dir=None)
+    tree = engine.stage_template(CLI_PYTHON_TEMPLATE_PATH, extra_context=CLI_PYTHON_CONTEXT)
+    tree.add_content('.cookietemple.yml', 'domain: cli\n')
+    tree.add_content('docs/notes/todo.rst', 'TODO\n')
+    assert tree.transform('README.rst', str.upper) and not tree.transform('missing.rst', str.upper)
+    project_dir = engine.materialize(tree, str(tmp_path))
+
+    assert sorted(os.listdir(tmp_path)) == ['exploding_springfield']
+    with open(os.path.join(project_dir, '.cookietemple.yml')) as f:
+        assert f.read() == 'domain: cli\n'
+    with open(os.path.join(project_dir, 'README.rst')) as f:
+        content = f.read()
+        assert content == content.upper() and 'EXPLODING SPRINGFIELD' in content
+    assert os.path.isfile(os.path.join(project_dir, 'docs', 'notes', 'todo.rst'))
+
+
+def test_failed_materialization_leaves_nothing_behind(tmp_path) -> None:
+    """
+    Ensure that a failing create neither leaves a partially written project behind nor modifies an already existing one.
+    """
+    def fail(content: str) -> str:
+        raise ValueError('Failed to render')
+
+    os.makedirs(tmp_path / 'exploding_springfield')
+    (tmp_path / 'exploding_springfield' / 'setup.py').write_text('old')
+    engine = RenderEngine(bytecode_cache_dir=None)
+    tree = engine.stage_template(CLI_PYTHON_TEMPLATE_PATH, extra_context=CLI_PYTHON_CONTEXT)
+    tree.transform('setup.py', fail)
+
+    with pytest.raises(ValueError):
+        engine.materialize(tree, str(tmp_path), jobs=4)
+    assert os.listdir(tmp_path) == ['exploding_springfield'] and os.listdir(tmp_path / 'exploding_springfield') == ['setup.py']
+
+    # without the failing file the existing project is replaced as a whole
+    del tree.files['setup.py']
+    engine.materialize(tree, str(tmp_path))
+    assert os.listdir(tmp_path) == ['exploding_springfield'] and not os.path.exists(tmp_path / 'exploding_springfield' / 'setup.py')
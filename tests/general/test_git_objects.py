@@ -0,0 +1,77 @@
+import os
+
+import git  # type: ignore
+
+from cookietemple.common.git_objects import commit_paths, commit_tree, hash_work_tree_files, ignored_paths, read_tree, working_tree_files
+
+
+def init_repo(path) -> git.Repo:
+    """
+    Initialize a repository with a configured author.
+    """
+    repo = git.Repo.init(path)
+    with repo.config_writer() as config:
+        config.set_value('user', 'name', 'Homer Simpson')
+        config.set_value('user', 'email', 'homer.simpson@posteo.net')
+
+    return repo
+
+
+def test_trees_equal_trees_written_by_git(tmp_path) -> None:
+    """
+    Ensure that blobs and trees written by sync are identical to those written by git add and git write-tree.
+    """
+    (tmp_path / 'src' / 'springfield').mkdir(parents=True)
+    (tmp_path / 'src' / 'springfield' / 'plant.py').write_text('reactors = 3\n')
+    (tmp_path / 'src' / 'springfield.cfg').write_text('[plant]\n')
+    (tmp_path / 'run.sh').write_text('echo "D\'oh"\n')
+    os.chmod(tmp_path / 'run.sh', 0o755)
+    os.symlink('run.sh', tmp_path / 'start.sh')
+    repo = init_repo(tmp_path)
+    files = working_tree_files(str(tmp_path))
+    entries = hash_work_tree_files(repo, str(tmp_path), files)
+    repo.git.add(A=True)
+
+    assert files == ['run.sh', 'src/springfield.cfg', 'src/springfield/plant.py', 'start.sh']
+    commit = commit_tree(repo, entries, 'Create springfield', None, 'TEMPLATE')
+    assert commit.tree.hexsha == repo.git.write_tree()
+    assert read_tree(repo, commit) == entries
+    assert repo.heads.TEMPLATE.commit == commit
+    assert commit_tree(repo, entries, 'Nothing changed', commit, 'TEMPLATE') is None
+
+
+def test_files_of_other_directories_are_treated_like_by_git_add(tmp_path) -> None:
+    """
+    Ensure that files of another directory pass the clean filters of the repository and the ignore rules of the directory and the repository.
+    """
+    repo = init_repo(tmp_path / 'project')
+    with repo.config_writer() as config:
+        config.set_value('core', 'autocrlf', 'input')
+    (tmp_path / 'project' / '.git' / 'info' / 'exclude').write_text('secrets.txt\n')
+    staging_dir = tmp_path / 'staging'
+    staging_dir.mkdir()
+    (staging_dir / '.gitattributes').write_text('*.bat eol=crlf\n')
+    (staging_dir / '.gitignore').write_text('*.log\n')
+    (staging_dir / 'README.rst').write_bytes(b'Springfield\r\n')
+    (staging_dir / 'run.bat').write_bytes(b'echo Springfield\r\n')
+    (staging_dir / 'secrets.txt').write_text('Mr. Burns\n')
+    (staging_dir / 'plant.log').write_text('Meltdown\n')
+    files = working_tree_files(str(staging_dir))
+
+    assert ignored_paths(repo, str(staging_dir), files) == {'secrets.txt', 'plant.log'}
+    entries = hash_work_tree_files(repo, str(staging_dir), ['README.rst', 'run.bat'])
+    assert repo.odb.stream(entries['README.rst'][1]).read() == b'Springfield\n'
+    assert repo.odb.stream(entries['run.bat'][1]).read() == b'echo Springfield\n'
+
+
+def test_commit_paths(tmp_path) -> None:
+    """
+    Ensure that files of the working tree are committed to the current branch and the index matches the commit.
+    """
+    repo = init_repo(tmp_path)
+    (tmp_path / 'README.rst').write_text('Springfield\n')
+    (tmp_path / 'CHANGELOG.rst').write_text('1.0.0\n')
+    commit = commit_paths(repo, [str(tmp_path / 'README.rst'), 'CHANGELOG.rst'], 'Create springfield')
+
+    assert repo.head.commit == commit and commit.message == 'Create springfield'
+    assert not repo.is_dirty(untracked_files=True)
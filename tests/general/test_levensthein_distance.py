@@ -1,4 +1,7 @@
-from cookietemple.common.levensthein_dist import levensthein_dist
+import itertools
+import random
+
+from cookietemple.common.levensthein_dist import FuzzyIndex, bounded_levensthein_dist, handle_index, levensthein_dist, main_commands_index, most_similar_command
 
 
 def test_levensthein_dist() -> None:
@@ -11,3 +14,74 @@ def test_levensthein_dist() -> None:
             levensthein_dist('cookietemple', 'cookiejar') == levensthein_dist('cookiejar', 'cookietemple') == 6 and
             levensthein_dist('cli', 'cliiiiiiiiiii') == 10 and levensthein_dist('wep', 'web') == 1 and
             levensthein_dist('mycommand', 'mycommand') == 0)
+
+
+def dp_levensthein_dist(input_command: str, candidate: str) -> int:
+    """
+    Reference implementation of the levensthein distance using the full DP table.
+    """
+    previous_row = list(range(len(input_command) + 1))
+    for i, candidate_char in enumerate(candidate, start=1):
+        row = [i]
+        for j, input_char in enumerate(input_command, start=1):
+            row.append(min(row[j - 1] + 1, previous_row[j] + 1, previous_row[j - 1] + (input_char != candidate_char)))
+        previous_row = row
+
+    return previous_row[-1]
+
+
+def random_words(count: int, seed: int) -> list:
+    rng = random.Random(seed)
+    return [''.join(rng.choice('abcde-') for _ in range(rng.randint(0, 12))) for _ in range(count)]
+
+
+def test_bounded_levensthein_dist() -> None:
+    """
+    Ensure that the bit-parallel distance matches the DP table and is cut off right above the bound.
+    """
+    words = random_words(60, seed=42) + ['a' * 70, 'b' + 'a' * 69]
+    for input_command, candidate in itertools.product(words, repeat=2):
+        dist = dp_levensthein_dist(input_command, candidate)
+        assert levensthein_dist(input_command, candidate) == dist
+        for max_dist in range(4):
+            assert bounded_levensthein_dist(input_command, candidate, max_dist) == min(dist, max_dist + 1)
+
+
+def test_fuzzy_index_search() -> None:
+    """
+    Ensure that the BK-tree finds exactly the words a linear scan finds.
+    """
+    words = random_words(300, seed=7)
+    index = FuzzyIndex(words)
+
+    assert index.size == len(set(words))
+    for query in random_words(40, seed=8):
+        for max_dist in range(4):
+            expected = sorted((dp_levensthein_dist(query, word), word) for word in set(words) if dp_levensthein_dist(query, word) <= max_dist)
+            assert index.search(query, max_dist) == expected
+
+
+def test_most_similar_command() -> None:
+    """
+    Ensure that similar commands are used or suggested depending on their distance.
+    """
+    assert main_commands_index().most_similar('lnt') == (['lint'], 'use')
+    assert main_commands_index().most_similar('crate') == (['create'], 'use')
+    assert main_commands_index().most_similar('confi') == (['config'], 'use')
+    assert main_commands_index().most_similar('sinco') == (['info', 'sync'], 'suggest')
+    assert main_commands_index().most_similar('xyz') == ([], '')
+    assert most_similar_command('wep', {'cli', 'web', 'pub'}) == (['web'], 'use')
+    assert handle_index().most_similar('cli-pyton') == (['cli-python'], 'use')
+
+
+def test_most_similar_command_matches_linear_scan() -> None:
+    """
+    Ensure that the index finds the same similar commands as comparing the input to every command.
+    """
+    commands = set(random_words(200, seed=3))
+    for command in random_words(100, seed=4):
+        dists = sorted((dp_levensthein_dist(command, candidate), candidate) for candidate in commands)
+        close = [(dist, candidate) for dist, candidate in dists if dist <= int(len(command) * 2 / 3)]
+        expected = ([candidate for dist, candidate in close if dist == close[0][0]], 'use' if close[0][0] <= int(len(command) / 3) else 'suggest') \
+            if close else ([], '')
+        assert most_similar_command(command, commands) == expected
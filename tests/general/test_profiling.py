@@ -0,0 +1,119 @@
+import json
+import threading
+import time
+
+import pytest
+
+from cookietemple.common import profiling
+from cookietemple.common.profiling import Profiler
+from cookietemple.create.create import create_from_answers
+
+
+@pytest.fixture
+def profiler() -> Profiler:
+    """
+    An enabled profiler, which profiles the phase outer with cProfile and traces the memory usage of the phase inner.
+    """
+    profiler = Profiler()
+    profiler.enable(cprofile_phases={'outer'}, memory_phases={'inner'})
+
+    return profiler
+
+
+def test_disabled_spans_record_nothing() -> None:
+    """
+    Ensure that spans of a disabled profiler do not record anything.
+    """
+    profiler = Profiler()
+    with profiler.span('outer'):
+        pass
+
+    assert profiler.spans == [] and profiler.summary() == []
+
+
+def test_nested_spans_summary(profiler) -> None:
+    """
+    Ensure that nested spans are aggregated per phase and the time of a nested phase is not counted as self time of its enclosing phase.
+    """
+    with profiler.span('outer'):
+        for _ in range(2):
+            with profiler.span('inner'):
+                data = [0] * 100_000  # noqa: F841
+                time.sleep(0.02)
+    rows = {row['name']: row for row in profiler.summary()}
+
+    assert list(rows) == ['outer', 'inner']
+    assert rows['outer']['calls'] == 1 and rows['outer']['depth'] == 0
+    assert rows['inner']['calls'] == 2 and rows['inner']['depth'] == 1
+    assert rows['inner']['total'] >= 0.04
+    assert rows['outer']['self'] == pytest.approx(rows['outer']['total'] - rows['inner']['total'])
+    assert rows['inner']['peak_memory_kb'] >= 700 and rows['outer']['peak_memory_kb'] is None
+    assert 'outer' in profiler.profiles
+
+
+def test_chrome_trace_of_threads(profiler, tmp_path) -> None:
+    """
+    Ensure that spans of several threads are written as complete events of their own thread, together with the cProfile statistics.
+    """
+    def work() -> None:
+        with profiler.span('worker', project='springfield'):
+            time.sleep(0.01)
+
+    with profiler.span('outer'):
+        threads = [threading.Thread(target=work) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    trace_path = tmp_path / 'trace.json'
+    profiler.write_trace(str(trace_path))
+    events = json.loads(trace_path.read_text())['traceEvents']
+    workers = [event for event in events if event['name'] == 'worker']
+
+    assert all(event['ph'] == 'X' for event in events)
+    assert len(workers) == 3 and len({event['tid'] for event in workers}) == 3
+    assert all(event['dur'] >= 10_000 and event['args'] == {'project': 'springfield'} for event in workers)
+    # spans of other threads are not nested in the span of the main thread
+    assert next(row for row in profiler.summary() if row['name'] == 'worker')['depth'] == 0
+    assert (tmp_path / 'trace.outer.prof').exists()
+
+
+def test_concurrent_memory_traced_phases(profiler) -> None:
+    """
+    Ensure that only one of several concurrently running phases is traced by tracemalloc, which traces the whole process, and tracing stops with it.
+    """
+    import tracemalloc
+
+    barrier = threading.Barrier(4)
+
+    def work() -> None:
+        barrier.wait()
+        with profiler.span('inner'):
+            data = [0] * 100_000  # noqa: F841
+            time.sleep(0.02)
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    traced = [span for span in profiler.spans if 'peak_memory_kb' in span.args]
+
+    assert len(profiler.spans) == 4 and len(traced) == 1
+    assert traced[0].args['peak_memory_kb'] >= 700
+    assert not tracemalloc.is_tracing()
+
+
+def test_prompts_are_traced_apart_from_creation(mocker, tmp_path, cli_python_dot_cookietemple) -> None:
+    """
+    Ensure that the prompts of a creation are a phase of their own, which ends before the project is created.
+    """
+    profiler = Profiler()
+    profiler.enable()
+    mocker.patch.object(profiling, 'PROFILER', profiler)
+
+    create_from_answers(dict(cli_python_dot_cookietemple, project_name='springfield'), tmp_path, lint=False)
+    spans = {span.name: span for span in profiler.spans}
+
+    assert spans['create.prompt'].depth == 1
+    assert spans['create.prompt'].start + spans['create.prompt'].duration <= spans['create.materialize'].start
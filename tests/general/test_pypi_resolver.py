@@ -0,0 +1,74 @@
+import pytest
+
+from cookietemple.common.pypi_resolver import PyPIResolver, parse_requirements, parse_setup_cfg_requirements
+
+STUB_PACKAGES = {'click': '8.0.1', 'rich': '10.2.2'}
+
+
+def stub_index_handler(request) -> tuple:
+    """
+    Answer a request of a minimal PyPI style JSON API, which knows all STUB_PACKAGES.
+    """
+    name = request.path.strip('/').split('/')[0]
+    if name not in STUB_PACKAGES:
+        return 404, None, {}
+    etag = f'"{name}-{STUB_PACKAGES[name]}"'
+    if request.headers.get('If-None-Match') == etag:
+        return 304, None, {}
+
+    return 200, {'info': {'version': STUB_PACKAGES[name]}}, {'ETag': etag}
+
+
+@pytest.fixture
+def stub_index(stub_server):
+    """
+    Serve a minimal PyPI style JSON API from a local stub.
+
+    :return: The stub server, which records all requests
+    """
+    return stub_server(stub_index_handler)
+
+
+def requested(stub) -> list:
+    """
+    The packages requested from a stub index with their If-None-Match headers.
+    """
+    return [(request.path.strip('/').split('/')[0], request.headers.get('If-None-Match')) for request in stub.requests]
+
+
+def test_resolver_resolves_packages_once(stub_index, tmp_path) -> None:
+    """
+    Ensure that every distinct package is requested only once and unknown packages are reported as not found.
+    """
+    resolver = PyPIResolver(index_url=stub_index.url, cache_dir=str(tmp_path))
+    resolved = resolver.resolve(['click', 'rich', 'click', 'doesnotexist'])
+
+    assert resolved['click'].status == 'ok' and resolved['click'].latest_version == '8.0.1'
+    assert resolved['rich'].latest_version == '10.2.2'
+    assert resolved['doesnotexist'].status == 'not_found'
+    assert sorted(name for name, _ in requested(stub_index)) == ['click', 'doesnotexist', 'rich']
+
+
+def test_resolver_cache_ttl_and_etag_revalidation(stub_index, tmp_path) -> None:
+    """
+    Ensure that fresh cached responses are used without a request and stale ones are revalidated with their ETag.
+    """
+    PyPIResolver(index_url=stub_index.url, cache_dir=str(tmp_path)).resolve(['click'])
+    PyPIResolver(index_url=stub_index.url, cache_dir=str(tmp_path)).resolve(['click'])
+    assert requested(stub_index) == [('click', None)]
+
+    resolved = PyPIResolver(index_url=stub_index.url, cache_dir=str(tmp_path), ttl=0).resolve(['click'])
+    assert requested(stub_index)[-1] == ('click', '"click-8.0.1"')
+    assert resolved['click'].latest_version == '8.0.1'
+
+
+def test_parse_requirement_ranges_and_setup_cfg(tmp_path) -> None:
+    """
+    Ensure that pinned requirements, ranges and install_requires of a setup.cfg are parsed, while comments and pip options are skipped.
+    """
+    requirements = parse_requirements(['# a comment', '-r requirements.txt', 'click>=7.0,<8  # cli', 'rich==9.1.0', ''])
+    assert [(requirement.name, str(requirement.specifier)) for requirement in requirements] == [('click', '<8,>=7.0'), ('rich', '==9.1.0')]
+
+    setup_cfg = tmp_path / 'setup.cfg'
+    setup_cfg.write_text('[options]\ninstall_requires =\n    click>=7.0\n    rich\n')
+    assert [requirement.name for requirement in parse_setup_cfg_requirements(str(setup_cfg))] == ['click', 'rich']
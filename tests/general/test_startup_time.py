@@ -0,0 +1,49 @@
+import subprocess
+import sys
+from typing import Dict
+
+# modules only the commands using them may import; they must never be loaded by the startup of cookietemple itself
+HEAVY_MODULES = ['git', 'github', 'nacl', 'cryptography', 'cookiecutter', 'jinja2', 'requests', 'questionary']
+
+# budget of the cumulative import time (in microseconds) of the cli and the list command
+STARTUP_IMPORT_BUDGET_US = 250000
+
+# the import of cookietemple list is measured as often and the fastest run is used, which makes the benchmark robust against a busy machine
+STARTUP_BENCHMARK_RUNS = 3
+
+
+def import_times(statement: str) -> Dict[str, int]:
+    """
+    Run a statement with python -X importtime in a fresh interpreter.
+
+    :param statement: The Python statement to run
+    :return: A dictionary mapping the names of all top level imports to their cumulative import time in microseconds
+    """
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', statement], stderr=subprocess.PIPE, universal_newlines=True, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        # nested imports are indented by two spaces per level
+        if not name.startswith('  '):
+            times[name.strip()] = int(cumulative)
+
+    return times
+
+
+def test_list_startup_import_time() -> None:
+    """
+    Ensure that cookietemple list does not import the dependencies of other commands and that its import time does not regress past the budget.
+    """
+    statement = 'import cookietemple.cookietemple_cli; import cookietemple.list.list'
+    fastest_run = None
+    for _ in range(STARTUP_BENCHMARK_RUNS):
+        times = import_times(statement)
+        import_time = sum(time for name, time in times.items() if name.startswith('cookietemple'))
+        fastest_run = import_time if fastest_run is None else min(fastest_run, import_time)
+
+    loaded_modules = subprocess.run([sys.executable, '-c', f'import sys; {statement}; print(",".join(sys.modules))'], stdout=subprocess.PIPE,
+                                    universal_newlines=True, check=True).stdout.strip().split(',')
+    assert not [module for module in loaded_modules if module.split('.')[0] in HEAVY_MODULES]
+    assert fastest_run <= STARTUP_IMPORT_BUDGET_US, f'Importing cookietemple list took {fastest_run} us, the budget is {STARTUP_IMPORT_BUDGET_US} us'
@@ -0,0 +1,65 @@
+import os
+import re
+import shutil
+
+import pytest
+
+from cookietemple.common.template_registry import AVAILABLE_TEMPLATES_PATH, TemplateRegistry
+
+
+@pytest.fixture
+def available_templates(mocker, tmp_path) -> str:
+    """
+    A copy of cookietemple's available_templates.yml with its own, empty snapshot directory.
+    """
+    mocker.patch('cookietemple.common.template_registry.REGISTRY_CACHE_DIR', str(tmp_path / 'registry'))
+    path = str(tmp_path / 'available_templates.yml')
+    shutil.copy(AVAILABLE_TEMPLATES_PATH, path)
+
+    return path
+
+
+def test_registry_lookups(available_templates) -> None:
+    """
+    Ensure that templates can be looked up by their handle, domain and language.
+    """
+    registry = TemplateRegistry.load(available_templates)
+
+    assert registry.version('cli-python') == registry.available_templates['cli']['python']['version']
+    assert registry.template('pub-thesis-latex')['name'] == 'Latex Thesis'
+    assert {template['handle'] for template in registry.templates_of_domain('cli')} == {'cli-java', 'cli-python'}
+    assert {template['handle'] for template in registry.templates_of_language('python')} == {'cli-python', 'web-website-python'}
+    assert {'web', 'web-website', 'web-website-python'} <= registry.all_handles
+    with pytest.raises(KeyError):
+        registry.template('cli-cobol')
+
+
+def test_registry_is_memoized_and_snapshotted(mocker, available_templates) -> None:
+    """
+    Ensure that the registry is loaded once per process and later processes load it from the snapshot without parsing YAML.
+    """
+    registry = TemplateRegistry.load(available_templates)
+    assert TemplateRegistry.load(available_templates) is registry
+
+    # simulate a new process
+    mocker.patch.object(TemplateRegistry, '_registries', {})
+    load_yaml_file = mocker.patch('cookietemple.common.load_yaml.load_yaml_file')
+    snapshot_registry = TemplateRegistry.load(available_templates)
+
+    assert not load_yaml_file.called
+    assert snapshot_registry is not registry and snapshot_registry.available_templates == registry.available_templates
+
+
+def test_registry_recompiled_on_change(available_templates) -> None:
+    """
+    Ensure that a modified available_templates.yml invalidates both, the memoized registry and its snapshot.
+    """
+    assert TemplateRegistry.load(available_templates).version('cli-python') != '9.9.9'
+    with open(available_templates) as f:
+        content = f.read()
+    with open(available_templates, 'w') as f:
+        f.write(re.sub(r'(handle: cli-python\s+version:) \S+', r'\1 9.9.9', content))
+    stat = os.stat(available_templates)
+    os.utime(available_templates, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+
+    assert TemplateRegistry.load(available_templates).version('cli-python') == '9.9.9'
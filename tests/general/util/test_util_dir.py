@@ -1,7 +1,7 @@
 import os
 from pathlib import Path
 
-from cookietemple.util.dir_util import delete_dir_tree
+from cookietemple.util.dir_util import copy_dir_tree, copy_file, delete_dir_tree
 
 
 def test_delete_dir_tree(tmp_path):
@@ -11,3 +11,55 @@ def test_delete_dir_tree(tmp_path):
     os.makedirs(f'{tmp_path}/testdir/my/deep/nested/directory')
     delete_dir_tree(Path(f'{tmp_path}/testdir'))
     assert len(list(tmp_path.iterdir())) == 0
+
+
+def test_copy_file_replaces_hardlinked_destination(tmp_path):
+    """
+    Ensure that a copied file keeps its permissions and that copying onto a hardlink never modifies the other linked file.
+    """
+    src, dst = tmp_path / 'run.sh', tmp_path / 'copy.sh'
+    src.write_bytes(b'#!/bin/sh\n' + bytes(range(256)) * 1024)
+    os.chmod(src, 0o755)
+    copy_file(str(src), str(dst), link=True)
+    assert os.path.samefile(src, dst)
+
+    src_v2 = tmp_path / 'run_v2.sh'
+    src_v2.write_bytes(b'#!/bin/sh\necho v2\n')
+    copy_file(str(src_v2), str(dst))
+
+    assert dst.read_bytes() == src_v2.read_bytes()
+    assert src.read_bytes().startswith(b'#!/bin/sh\n\x00') and os.stat(dst).st_mode & 0o777 == os.stat(src_v2).st_mode & 0o777
+
+
+def test_copy_dir_tree_merges_into_existing_directory(tmp_path):
+    """
+    Ensure that the content of a directory is copied into an existing directory without removing its other files.
+    """
+    os.makedirs(f'{tmp_path}/src/assets/fonts')
+    Path(f'{tmp_path}/src/assets/fonts/font.woff').write_bytes(b'\x00\x01font')
+    Path(f'{tmp_path}/src/README.rst').write_text('new')
+    os.makedirs(f'{tmp_path}/dst')
+    Path(f'{tmp_path}/dst/README.rst').write_text('old')
+    Path(f'{tmp_path}/dst/setup.py').write_text('keep')
+
+    copy_dir_tree(f'{tmp_path}/src', f'{tmp_path}/dst')
+
+    assert Path(f'{tmp_path}/dst/assets/fonts/font.woff').read_bytes() == b'\x00\x01font'
+    assert Path(f'{tmp_path}/dst/README.rst').read_text() == 'new'
+    assert Path(f'{tmp_path}/dst/setup.py').read_text() == 'keep'
+
+
+def test_copy_dir_tree_keeps_symlinks(tmp_path):
+    """
+    Ensure that symlinks to files and directories are copied as symlinks, if requested.
+    """
+    os.makedirs(f'{tmp_path}/src/docs')
+    Path(f'{tmp_path}/src/docs/index.rst').write_text('Springfield')
+    os.symlink('docs/index.rst', f'{tmp_path}/src/README.rst')
+    os.symlink('docs', f'{tmp_path}/src/documentation')
+
+    copy_dir_tree(f'{tmp_path}/src', f'{tmp_path}/dst', symlinks=True)
+
+    assert os.readlink(f'{tmp_path}/dst/README.rst') == 'docs/index.rst'
+    assert os.readlink(f'{tmp_path}/dst/documentation') == 'docs'
+    assert Path(f'{tmp_path}/dst/docs/index.rst').read_text() == 'Springfield'
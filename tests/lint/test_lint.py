@@ -1,7 +1,11 @@
 import pytest
 import os
+import shutil
+from pathlib import Path
 
-from cookietemple.lint.template_linter import TemplateLinter
+from cookietemple.lint.template_linter import TemplateLinter, TODO_RULE, COOKIECUTTER_STRING_RULE
+from cookietemple.lint.content_scanner import ContentScanner
+from cookietemple.lint.lint_cache import LintCache
 from cookietemple.lint.domains.cli import CliPythonLint
 from cookietemple.lint.domains.web import WebWebsitePythonLint
 from cookietemple.lint.domains.pub import PubLatexLint
@@ -50,3 +54,111 @@ def test_lint_bad_example(capfd, get_template_linter) -> None:
         test_linter.print_results()
 
         assert len(test_linter.warned) == 1 and len(test_linter.failed) == 1
+
+
+def test_content_rules_share_single_scan(mocker) -> None:
+    """
+    Test that the TODO and cookiecutter string checks share a single pass over the project's files.
+    """
+    test_linter = TemplateLinter(str(os.path.abspath(os.path.dirname(__file__))) + '/lint_test_files')
+    scan_spy = mocker.spy(ContentScanner, 'scan')
+
+    test_linter.check_cookietemple_todos()
+    test_linter.check_no_cookiecutter_strings()
+
+    assert scan_spy.call_count == 1
+    assert [code for code, _ in test_linter.warned] == ['general-4']
+
+
+def test_content_scanner_honors_gitignore(tmp_path) -> None:
+    """
+    Test that rules honoring ignores skip ignored directories while all other rules still scan them.
+    """
+    (tmp_path / '.gitignore').write_text('build/\n')
+    (tmp_path / 'build').mkdir()
+    (tmp_path / 'build' / 'generated.txt').write_text('TODO COOKIETEMPLE: ignored\n{{ cookiecutter.project_name }}\n')
+    (tmp_path / 'README.rst').write_text('TODO COOKIETEMPLE: found\n')
+
+    findings = ContentScanner(str(tmp_path), [TODO_RULE, COOKIECUTTER_STRING_RULE]).scan()
+
+    assert findings[TODO_RULE.rule_id] == ['TODO string found in `README.rst`: found']
+    assert len(findings[COOKIECUTTER_STRING_RULE.rule_id]) == 1
+
+
+def test_concurrent_linting_matches_serial_linting() -> None:
+    """
+    Test that running the general linting functions concurrently collects exactly the same results in the same order as running them one by one.
+    """
+    project_dir = str(Path(os.path.abspath(os.path.dirname(__file__))).parent.parent)
+    results = []
+    for jobs in (1, 4):
+        test_linter = CliPythonLint(project_dir)
+        test_linter.jobs = jobs
+        test_linter.lint_project(super(CliPythonLint, test_linter), is_subclass_calling=False)
+        results.append((test_linter.passed, test_linter.warned, test_linter.failed))
+
+    assert results[0] == results[1]
+
+
+def test_concurrent_checks_keep_attributes_set_by_other_checks(tmp_path) -> None:
+    """
+    Test that an attribute set by one concurrently running check is not reverted by the shadow linter of a later check.
+    """
+    class AttributeLint(TemplateLinter):
+        def a_set_files(self):
+            self.files = ['Dockerfile']
+
+        def b_read_files(self):
+            self.passed.append(('attribute-1', 'Read the files'))
+
+    test_linter = AttributeLint(str(tmp_path))
+    test_linter.jobs = 2
+    test_linter.lint_project(test_linter, check_functions=['a_set_files', 'b_read_files'], custom_check_files=False)
+
+    assert test_linter.files == ['Dockerfile']
+    assert test_linter.passed == [('attribute-1', 'Read the files')]
+
+
+def test_lint_cache_replays_unchanged_files(tmp_path, mocker) -> None:
+    """
+    Test that the lint cache replays the findings of unchanged files without scanning them again and rescans modified files.
+    """
+    shutil.copytree(str(os.path.abspath(os.path.dirname(__file__))) + '/lint_test_files', f'{tmp_path}/project')
+    project_dir = f'{tmp_path}/project'
+
+    def lint_with_cache() -> TemplateLinter:
+        test_linter = TemplateLinter(project_dir)
+        test_linter.cache = LintCache(project_dir, test_linter.content_rules)
+        test_linter.check_cookietemple_todos()
+        test_linter.check_no_cookiecutter_strings()
+        test_linter.check_version_match('lint_bad_test_file', '1.0.0', 'bumpversion_files_whitelisted')
+        test_linter.cache.save()
+        return test_linter
+
+    first_linter = lint_with_cache()
+    scan_file_spy = mocker.spy(ContentScanner, 'scan_file')
+    second_linter = lint_with_cache()
+
+    assert scan_file_spy.call_count == 0 and second_linter.cache.misses == 0
+    assert (first_linter.warned, first_linter.failed) == (second_linter.warned, second_linter.failed)
+
+    with open(f'{project_dir}/lint_bad_test_file', 'a') as f:
+        f.write('TODO COOKIETEMPLE: new todo\n')
+    third_linter = lint_with_cache()
+
+    assert scan_file_spy.call_count == 1
+    assert ('general-3', 'TODO string found in `lint_bad_test_file`: new todo') in third_linter.warned
+
+
+def test_lint_cache_invalidated_by_version_change(tmp_path, mocker) -> None:
+    """
+    Test that all cached results are discarded when the cookietemple version changes.
+    """
+    (tmp_path / 'README.rst').write_text('TODO COOKIETEMPLE: cached\n')
+    cache = LintCache(str(tmp_path), [TODO_RULE])
+    cache.store('content', 'README.rst', str(tmp_path / 'README.rst'), {TODO_RULE.rule_id: []})
+    cache.save()
+
+    assert LintCache(str(tmp_path), [TODO_RULE]).entries
+    mocker.patch('cookietemple.__version__', '999.0.0')
+    assert not LintCache(str(tmp_path), [TODO_RULE]).entries
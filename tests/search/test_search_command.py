@@ -0,0 +1,87 @@
+import shutil
+
+import pytest
+
+from click.testing import CliRunner
+
+from cookietemple.common.template_registry import AVAILABLE_TEMPLATES_PATH, TemplateRegistry
+from cookietemple.cookietemple_cli import search
+from cookietemple.search.search import SearchIndex, TemplateSearcher, tokenize
+
+"""
+This test class is for testing the search subcommand:
+
+Syntax: cookietemple search [terms]
+
+Templates are ranked by the number of matched terms first and by their score second. An empty query should result in an Error.
+"""
+
+
+@pytest.fixture
+def available_templates(mocker, tmp_path) -> str:
+    """
+    A copy of cookietemple's available_templates.yml with its own, empty directory for the registry snapshot and the search index.
+    """
+    mocker.patch('cookietemple.common.template_registry.REGISTRY_CACHE_DIR', str(tmp_path / 'registry'))
+    path = str(tmp_path / 'available_templates.yml')
+    shutil.copy(AVAILABLE_TEMPLATES_PATH, path)
+
+    return path
+
+
+def test_tokenize() -> None:
+    """
+    Ensure that texts are split into lowercase tokens, which keep the characters of languages like C++ and C#.
+    """
+    assert tokenize('Click, argparse and C++/C#!') == ['click', 'argparse', 'and', 'c++', 'c#']
+
+
+@pytest.mark.parametrize('query, best_match', [('click', 'cli-python'), ('picocli', 'cli-java'), ('latex thesis', 'pub-thesis-latex'),
+                                               ('cli-python', 'cli-python'), ('flask', 'web-website-python'), ('PYTH CLI', 'cli-python')])
+def test_best_match(available_templates, query, best_match) -> None:
+    """
+    Ensure that the best matching template of a query, which may consist of prefixes and handles, is ranked first.
+    """
+    assert TemplateSearcher(available_templates).search_templates(query)[0] == best_match
+
+
+def test_all_terms_before_some_terms(available_templates) -> None:
+    """
+    Ensure that templates matching all terms always rank before those matching only some of them.
+    """
+    handles = TemplateSearcher(available_templates).search_templates('python website')
+
+    assert handles[0] == 'web-website-python' and 'cli-python' in handles[1:]
+
+
+def test_no_match(available_templates) -> None:
+    """
+    Ensure that a query without any matching template has no results.
+    """
+    assert TemplateSearcher(available_templates).search_templates('cobol') == []
+
+
+def test_index_is_persisted(mocker, available_templates) -> None:
+    """
+    Ensure that the index is built once and later loaded from disk, unless the registry changed.
+    """
+    registry = TemplateRegistry.load(available_templates)
+    index = SearchIndex.load(registry)
+    build = mocker.spy(SearchIndex, 'build')
+
+    assert SearchIndex.load(registry).postings == index.postings
+    assert not build.called
+
+    registry.digest = 'changed'
+    assert SearchIndex.load(registry).digest == 'changed'
+    assert build.call_count == 1
+
+
+def test_search_without_terms() -> None:
+    """
+    Ensure that the search command fails without any terms.
+    """
+    runner = CliRunner()
+    result = runner.invoke(search, [])
+
+    assert result.exit_code == 1
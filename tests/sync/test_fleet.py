@@ -0,0 +1,144 @@
+import threading
+from pathlib import Path
+
+import git  # type: ignore
+import pytest
+
+from cookietemple.config.config import ConfigCommand
+from cookietemple.create.create import choose_domain
+from cookietemple.create.template_creator import TemplateCreator
+from cookietemple.sync.fleet import discover_projects, load_fleet, sync_fleet
+from cookietemple.sync.render_cache import RenderCache
+
+"""
+This test class is for testing the sync of a fleet of projects:
+
+Syntax: cookietemple sync --fleet [manifest/directory]
+
+All projects are synced against local bare remotes and a stub Github API server.
+"""
+
+
+@pytest.fixture
+def github_api(mocker, stub_server):
+    """
+    Serve the pull request endpoints of the Github API from a local stub, which knows no open pull requests.
+
+    :return: The stub server, which records all requests
+    """
+    def respond(request) -> tuple:
+        if request.method == 'POST':
+            return 201, {'number': sum(request.method == 'POST' for request in stub.requests)}, {}
+        return 200, [], {}
+
+    stub = stub_server(respond)
+    settings = {'github_api_url': stub.url}
+    mocker.patch.object(ConfigCommand, 'load_setting', lambda name, default=None: settings.get(name, default))
+
+    return stub
+
+
+@pytest.fixture
+def fleet(mocker, tmp_path, github_api, cli_python_dot_cookietemple) -> Path:
+    """
+    A directory of cli-python projects, each with a bare git remote, whose template has been updated from 1.0.0 to 1.1.0 (a minor update).
+    springfield and shelbyville have outdated TEMPLATE branches; shelbyville only syncs major updates. capital_city is already at 1.1.0.
+    ogdenville is no git repository.
+
+    :return: The directory of all projects
+    """
+    mocker.patch.object(TemplateCreator, 'query_name_available', return_value=False)
+    mocker.patch('cookietemple.lint.domains.cli.Popen', **{'return_value.communicate.return_value': ('', '')})
+    mocker.patch('cookietemple.sync.sync.TemplateSync.sync_load_template_version', return_value='1.1.0')
+    fleet_dir = tmp_path / 'fleet'
+    for project_name, sync_level, template_version in (('springfield', 'minor', '1.0.0'), ('shelbyville', 'major', '1.0.0'),
+                                                       ('capital_city', 'minor', '1.1.0'), ('ogdenville', 'minor', '1.0.0')):
+        choose_domain(path=fleet_dir, domain=None, dot_cookietemple=dict(cli_python_dot_cookietemple, project_name=project_name))
+        project_dir = fleet_dir / project_name
+        dot_cookietemple = (project_dir / '.cookietemple.yml').read_text()
+        (project_dir / '.cookietemple.yml').write_text(dot_cookietemple.replace("template_version: '1.0.0", f"template_version: '{template_version}"))
+        cookietemple_cfg = (project_dir / 'cookietemple.cfg').read_text()
+        (project_dir / 'cookietemple.cfg').write_text(cookietemple_cfg.replace('ct_sync_level = minor', f'ct_sync_level = {sync_level}'))
+        with open(project_dir / 'README.rst', 'a') as readme:
+            readme.write('\nOutdated by an earlier template version.\n')
+        if project_name == 'ogdenville':
+            continue
+        remote = git.Repo.init(tmp_path / 'remotes' / f'{project_name}.git', bare=True)
+        repo = git.Repo.init(project_dir)
+        with repo.config_writer() as config:
+            config.set_value('user', 'name', 'Homer Simpson')
+            config.set_value('user', 'email', 'homer.simpson@posteo.net')
+        repo.git.add(A=True)
+        repo.git.commit(m=f'Create {project_name}')
+        repo.git.branch('-M', 'development')
+        repo.create_remote('origin', remote.working_dir)
+        repo.git.push('origin', 'development', 'development:TEMPLATE')
+        repo.git.fetch('origin')
+
+    return fleet_dir
+
+
+def test_load_fleet(tmp_path) -> None:
+    """
+    Ensure that project directories of a manifest are relative to the manifest and projects are discovered, but not searched for nested projects.
+    """
+    for project_dir in ('springfield', 'nested/shelbyville', 'nested/shelbyville/docs/ogdenville', '.hidden/capital_city'):
+        (tmp_path / project_dir).mkdir(parents=True)
+        (tmp_path / project_dir / '.cookietemple.yml').write_text('template_handle: cli-python\n')
+    manifest = tmp_path / 'nested' / 'projects.yml'
+    manifest.write_text('projects:\n  - shelbyville\n  - path: ../springfield\n')
+
+    assert discover_projects(tmp_path) == [tmp_path / 'nested' / 'shelbyville', tmp_path / 'springfield']
+    assert load_fleet(str(manifest)) == [tmp_path / 'nested' / 'shelbyville', tmp_path / 'springfield']
+    assert load_fleet(str(tmp_path)) == discover_projects(tmp_path)
+
+
+def test_sync_fleet(fleet, github_api, mocker) -> None:
+    """
+    Ensure that all projects of a fleet are synced concurrently, a failing project does not stop the others and the users checkouts stay untouched.
+    The template projects rendered for the sync are not linted.
+    """
+    lint_project = mocker.patch('cookietemple.create.template_creator.lint_project')
+    results = {result.project_dir.name: result for result in sync_fleet(load_fleet(str(fleet)), gh_username='homer', token='test', workers=4)}
+
+    statuses = {name: result.status for name, result in results.items()}
+
+    assert statuses == {'capital_city': 'up-to-date', 'ogdenville': 'failed', 'shelbyville': 'level-blocked', 'springfield': 'synced'}
+    assert results['springfield'].project_template_version == '1.0.0' and results['springfield'].template_version == '1.1.0'
+    assert results['springfield'].handle == 'cli-python' and 'Committed changes to TEMPLATE branch' in results['springfield'].output
+    assert results['ogdenville'].error == 'Aborted with exit code 1' and 'git repository' in results['ogdenville'].output
+    assert not lint_project.called
+
+    springfield = git.Repo(fleet / 'springfield')
+    remote_template = git.Repo(springfield.remote('origin').url).heads.TEMPLATE.commit
+    assert remote_template.message == 'Cookietemple sync' and remote_template == springfield.heads.TEMPLATE.commit
+    assert springfield.active_branch.name == 'development' and not springfield.is_dirty(untracked_files=True)
+    assert [(request.method, request.path) for request in github_api.requests] == [('GET', '/repos/homer/springfield/pulls?state=open'),
+                                                                                   ('POST', '/repos/homer/springfield/pulls')]
+
+
+def test_render_cache_renders_once(tmp_path, cli_python_dot_cookietemple) -> None:
+    """
+    Ensure that concurrent renderings of the same project are rendered only once, while other template versions or answers are rendered again.
+    """
+    renders = []
+
+    def render(path: Path) -> None:
+        renders.append(path)
+        (path / 'springfield').mkdir(parents=True)
+
+    cache = RenderCache()
+    dot_cookietemple = dict(cli_python_dot_cookietemple, template_handle='cli-python', template_version='1.0.0')
+    threads = [threading.Thread(target=cache.render, args=(dict(dot_cookietemple), '1.1.0', render)) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    # the template version of the project's last sync does not matter
+    path = cache.render(dict(dot_cookietemple, template_version='0.9.0'), '1.1.0', render)
+
+    assert len(renders) == 1 and path == renders[0] and cache.hits == 4
+    assert cache.render(dot_cookietemple, '1.2.0', render) != path
+    assert cache.render(dict(dot_cookietemple, project_name='shelbyville'), '1.1.0', render) != path
+    cache.close()
+    assert not path.exists()
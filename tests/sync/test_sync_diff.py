@@ -0,0 +1,112 @@
+import os
+
+import git  # type: ignore
+import pytest
+
+from cookietemple.common.git_objects import read_tree
+from cookietemple.sync.sync import TemplateSync
+
+"""
+This test class is for testing how sync applies a freshly created template project to the TEMPLATE branch.
+Only added, modified and deleted files may be written and the commit is created without touching the working tree.
+"""
+
+
+@pytest.fixture
+def template_branch(tmp_path):
+    """
+    A repository with an outdated TEMPLATE branch, whose development branch is checked out.
+
+    :return: A syncer of the repository and the path to a staging directory holding the new version of the template project
+    """
+    project_dir = tmp_path / 'project'
+    (project_dir / 'docs').mkdir(parents=True)
+    (project_dir / 'README.rst').write_text('Springfield\n')
+    (project_dir / 'setup.py').write_text('version = 1.0.0\n')
+    (project_dir / 'run.sh').write_text('echo "Hello"\n')
+    (project_dir / 'docs' / 'index.rst').write_text('Outdated docs\n')
+    repo = git.Repo.init(project_dir)
+    with repo.config_writer() as config:
+        config.set_value('user', 'name', 'Homer Simpson')
+        config.set_value('user', 'email', 'homer.simpson@posteo.net')
+    repo.git.add(A=True)
+    repo.git.commit(m='Create springfield')
+    repo.git.branch('-M', 'development')
+    repo.git.branch('TEMPLATE')
+
+    staging_dir = tmp_path / 'staging'
+    (staging_dir / '.github').mkdir(parents=True)
+    (staging_dir / 'README.rst').write_text('Springfield\n')
+    (staging_dir / 'setup.py').write_text('version = 1.1.0\n')
+    (staging_dir / 'run.sh').write_text('echo "Hello"\n')
+    os.chmod(staging_dir / 'run.sh', 0o755)
+    (staging_dir / '.github' / 'workflow.yml').write_text('name: build\n')
+    syncer = TemplateSync(project_dir=str(project_dir), new_template_version='1.1.0', gh_username='homer', token='test')
+    syncer.repo = repo
+    syncer.resolve_template_branch()
+
+    return syncer, str(staging_dir)
+
+
+def test_diff_template_tree(template_branch) -> None:
+    """
+    Ensure that files are compared by content and mode and deleted files are found in the tree of the TEMPLATE branch.
+    """
+    syncer, staging_dir = template_branch
+
+    assert syncer.diff_template_tree(staging_dir) == {'added': ['.github/workflow.yml'], 'modified': ['run.sh', 'setup.py'],
+                                                      'deleted': ['docs/index.rst']}
+
+
+def test_commit_template_changes(mocker, template_branch) -> None:
+    """
+    Ensure that the changes of all non blacklisted files are committed to the TEMPLATE branch, while the working tree,
+    the index and the checked out branch stay untouched.
+    """
+    syncer, staging_dir = template_branch
+    mocker.patch.object(TemplateSync, 'get_blacklisted_sync_globs', return_value=['setup.*'])
+    readme_mtime = os.stat(os.path.join(syncer.project_dir, 'README.rst')).st_mtime_ns
+    outdated_commit = syncer.template_commit
+    syncer.template_diff = syncer.diff_template_tree(staging_dir)
+    syncer.apply_template_diff(syncer.template_diff)
+
+    assert syncer.commit_template_changes() and syncer.made_changes
+    template_commit = syncer.repo.heads.TEMPLATE.commit
+    assert template_commit.parents == (outdated_commit,) and template_commit.message == 'Cookietemple sync'
+    assert template_commit.tree['.github/workflow.yml'].data_stream.read() == b'name: build\n'
+    assert template_commit.tree['run.sh'].mode == 0o100755
+    assert template_commit.tree['setup.py'].binsha == outdated_commit.tree['setup.py'].binsha
+    assert 'docs/index.rst' not in read_tree(syncer.repo, template_commit)
+
+    assert syncer.repo.active_branch.name == 'development' and not syncer.repo.is_dirty(untracked_files=True)
+    assert os.stat(os.path.join(syncer.project_dir, 'README.rst')).st_mtime_ns == readme_mtime
+    assert os.path.exists(os.path.join(syncer.project_dir, 'docs', 'index.rst'))
+
+
+def test_no_changes(template_branch) -> None:
+    """
+    Ensure that no commit is created, if the template project equals the TEMPLATE branch.
+    """
+    syncer, _ = template_branch
+    syncer.template_diff = syncer.diff_template_tree(syncer.project_dir)
+
+    assert syncer.template_diff == {'added': [], 'modified': [], 'deleted': []}
+    assert not syncer.commit_template_changes() and not syncer.made_changes
+
+
+def test_template_files_are_treated_like_by_git_add(template_branch) -> None:
+    """
+    Ensure that the line endings of the template project are normalized like by git add and ignored files are never added to the TEMPLATE branch.
+    """
+    syncer, staging_dir = template_branch
+    with syncer.repo.config_writer() as config:
+        config.set_value('core', 'autocrlf', 'true')
+    with open(os.path.join(syncer.repo.git_dir, 'info', 'exclude'), 'a') as exclude:
+        exclude.write('secrets.txt\n')
+    with open(os.path.join(staging_dir, 'README.rst'), 'wb') as readme:
+        readme.write(b'Springfield\r\n')
+    with open(os.path.join(staging_dir, 'secrets.txt'), 'w') as secrets:
+        secrets.write('Mr. Burns\n')
+
+    assert syncer.diff_template_tree(staging_dir) == {'added': ['.github/workflow.yml'], 'modified': ['run.sh', 'setup.py'],
+                                                      'deleted': ['docs/index.rst']}
@@ -0,0 +1,87 @@
+import git  # type: ignore
+import pytest
+
+from cookietemple.common.version import load_branch_template_version_and_handle
+from cookietemple.sync.sync import TemplateSync
+
+"""
+This test class is for testing that sync never modifies the users checkout.
+The TEMPLATE branch is never checked out and the template version is read from the branches directly.
+"""
+
+
+@pytest.fixture
+def project(tmp_path):
+    """
+    A repository with a development branch, a TEMPLATE branch and an uncommitted change of the users checkout.
+
+    :return: The repository of the project
+    """
+    project_dir = tmp_path / 'project'
+    project_dir.mkdir()
+    (project_dir / '.cookietemple.yml').write_text('template_version: 0.1.0 # <<COOKIETEMPLE_NO_BUMP>>\ntemplate_handle: cli-python\n')
+    repo = git.Repo.init(project_dir)
+    with repo.config_writer() as config:
+        config.set_value('user', 'name', 'Homer Simpson')
+        config.set_value('user', 'email', 'homer.simpson@posteo.net')
+    repo.git.add(A=True)
+    repo.git.commit(m='Create springfield')
+    repo.git.branch('-M', 'development')
+    repo.git.branch('TEMPLATE')
+    # the .cookietemple.yml file of the checkout differs from the one of the development branch
+    repo.git.checkout(b='feature')
+    (project_dir / '.cookietemple.yml').write_text('template_version: 0.2.0\ntemplate_handle: cli-python\n')
+
+    return repo
+
+
+def test_template_version_of_branch(project) -> None:
+    """
+    Ensure that the template version is read from the development branch without checking it out.
+    """
+    assert load_branch_template_version_and_handle(project.working_dir, 'development') == ('0.1.0', 'cli-python')
+    assert project.active_branch.name == 'feature'
+    with pytest.raises(git.exc.GitCommandError):
+        load_branch_template_version_and_handle(project.working_dir, 'master')
+
+
+def test_template_branch_is_not_checked_out(project) -> None:
+    """
+    Ensure that the commit of the TEMPLATE branch is found without checking it out, while the users checkout stays untouched.
+    """
+    syncer = TemplateSync(project_dir=project.working_dir, new_template_version='0.2.0', gh_username='homer', token='test')
+    syncer.inspect_sync_dir()
+    syncer.resolve_template_branch()
+
+    assert syncer.template_commit == project.heads.TEMPLATE.commit and syncer.from_branch == 'feature'
+    assert project.active_branch.name == 'feature' and project.is_dirty()
+
+
+def test_checked_out_template_branch(project) -> None:
+    """
+    Ensure that sync refuses to move the TEMPLATE branch, while it is checked out.
+    """
+    project.git.stash()
+    project.git.checkout('TEMPLATE')
+    syncer = TemplateSync(project_dir=project.working_dir, new_template_version='0.2.0', gh_username='homer', token='test')
+    syncer.inspect_sync_dir()
+
+    with pytest.raises(SystemExit):
+        syncer.resolve_template_branch()
+
+
+def test_template_version_of_fresh_clone(project, tmp_path, mocker) -> None:
+    """
+    Ensure that the template version is read from the development branch of origin, if a fresh clone only has its default branch locally.
+    """
+    project.git.stash()
+    project.git.checkout('development')
+    project.git.checkout(b='master')
+    (tmp_path / 'project' / '.cookietemple.yml').write_text('template_version: 0.0.1 # <<COOKIETEMPLE_NO_BUMP>>\ntemplate_handle: cli-python\n')
+    project.git.commit(a=True, m='Go back in time on master')
+    clone = git.Repo.clone_from(project.working_dir, tmp_path / 'clone', branch='master')
+    mocker.patch.object(TemplateSync, 'sync_load_template_version', return_value='0.2.0')
+
+    assert [head.name for head in clone.heads] == ['master']
+    assert load_branch_template_version_and_handle(clone.working_dir, 'development') == ('0.1.0', 'cli-python')
+    assert TemplateSync.has_template_version_changed(tmp_path / 'clone') == (False, True, False, '0.1.0', '0.2.0')
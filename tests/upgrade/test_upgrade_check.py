@@ -0,0 +1,55 @@
+import json
+import time
+
+from cookietemple.config.config import ConfigCommand
+from cookietemple.upgrade.upgrade import UpgradeCommand
+
+"""
+This test class is for testing the check for newer cookietemple releases, which runs on every invocation of cookietemple.
+"""
+
+
+def test_failed_upgrade_check_is_cached(mocker, tmp_path):
+    """
+    Ensure that an unreachable index is only contacted once per TTL.
+    """
+    mocker.patch.object(UpgradeCommand, 'UPGRADE_CHECK_FILE_PATH', str(tmp_path / 'upgrade_check.json'))
+    # nothing listens on the discard port, so the connection is refused
+    mocker.patch.object(ConfigCommand, 'load_setting', lambda name, default=None: 'http://127.0.0.1:9' if name == 'pypi_index_url' else default)
+    mocker.patch.object(ConfigCommand, 'check_ct_config_dir_exists')
+
+    assert UpgradeCommand.load_upgrade_check() is None
+    assert UpgradeCommand.refresh_upgrade_check() is None
+    assert UpgradeCommand.load_upgrade_check() == ''
+
+
+def test_cached_upgrade_check_notifies_at_exit(mocker, tmp_path, capfd):
+    """
+    Ensure that a recent verdict is used without contacting PyPI and printed at exit.
+    """
+    upgrade_check_path = tmp_path / 'upgrade_check.json'
+    upgrade_check_path.write_text(json.dumps({'checked_at': time.time(), 'index_url': UpgradeCommand.DEFAULT_INDEX_URL, 'latest_version': '999.0.0'}))
+    mocker.patch.object(UpgradeCommand, 'UPGRADE_CHECK_FILE_PATH', str(upgrade_check_path))
+    mocker.patch.object(ConfigCommand, 'load_setting', lambda name, default=None: default)
+    popen = mocker.patch('cookietemple.upgrade.upgrade.Popen')
+    register = mocker.patch('atexit.register')
+
+    UpgradeCommand.start_upgrade_check()
+    exit_handler, latest_pypi_version = register.call_args[0]
+    exit_handler(latest_pypi_version)
+    out, err = capfd.readouterr()
+
+    assert not popen.called
+    assert 'Newest version is 999.0.0' in out
+
+
+def test_disabled_upgrade_check(mocker):
+    """
+    Ensure that no check is started, if it is disabled in the cookietemple config file.
+    """
+    mocker.patch.object(ConfigCommand, 'load_setting', lambda name, default=None: False if name == 'upgrade_check' else default)
+    register = mocker.patch('atexit.register')
+
+    UpgradeCommand.start_upgrade_check()
+
+    assert not register.called